@@ -0,0 +1,53 @@
+"""
+Benchmarks the overhead of the Prefect context per task run.
+
+The engine enters `prefect.context(...)` several times for every task it runs: when
+submitting the task, in the `TaskRunner` and when running the task under a timeout.
+Each benchmark fills the context as a flow run would, with `n` parameters and `n`
+cached states, and then times those three nested entries (and a few reads of the
+context inside them) per task.
+
+Usage:
+    python benchmarks/context.py [n ...]
+
+If no sizes are provided, contexts with 10, 100 and 1k parameters are benchmarked.
+"""
+import sys
+import time
+from typing import List
+
+import prefect
+
+DEFAULT_SIZES = [10, 100, 1000]
+TASKS = 20000
+
+
+def per_task_overhead(n: int) -> float:
+    flow_context = dict(
+        flow_name="benchmark",
+        parameters={"p{}".format(i): i for i in range(n)},
+        caches={"task-{}".format(i): [] for i in range(n)},
+        flow_run_id="flow-run-id",
+    )
+    # as in the FlowRunner, which runs with the context captured when it was created
+    with prefect.context(prefect.context.to_dict(), **flow_context):
+        task_context = dict(prefect.context, task_name="task", task_slug="task-1")
+        start = time.perf_counter()
+        for i in range(TASKS):
+            with prefect.context(task_full_name="task", task_tags=set()):
+                with prefect.context(task_context, map_index=i):
+                    with prefect.context(task_context):
+                        prefect.context.get("task_full_name")
+                        prefect.context.parameters
+                        prefect.context.map_index
+        return (time.perf_counter() - start) / TASKS
+
+
+def main(sizes: List[int]) -> None:
+    print("{:>16}{:>24}".format("parameters", "overhead / task (us)"))
+    for n in sizes:
+        print("{:>16}{:>24.1f}".format(n, 1e6 * per_task_overhead(n)))
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or DEFAULT_SIZES)
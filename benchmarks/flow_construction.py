@@ -0,0 +1,59 @@
+"""
+Benchmarks for building and sorting large Flows.
+
+Each benchmark adds `n` tasks to a Flow, connects every task to (up to) two randomly
+chosen earlier tasks, and then computes a topological sort of the Flow. The time spent
+in each phase is reported separately, along with the time per task for adding tasks;
+the latter should stay roughly constant as `n` grows.
+
+Usage:
+    python benchmarks/flow_construction.py [n ...]
+
+If no sizes are provided, flows of 1k, 10k and 100k tasks are benchmarked.
+"""
+import random
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from prefect import Flow, Task
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def timed(fn: Callable) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def add_tasks(flow: Flow, tasks: List[Task]) -> None:
+    for task in tasks:
+        flow.add_task(task)
+
+
+def add_edges(flow: Flow, tasks: List[Task], seed: int = 42) -> None:
+    rng = random.Random(seed)
+    for i, task in enumerate(tasks):
+        for j in {rng.randrange(i) for _ in range(2)} if i else []:
+            flow.add_edge(tasks[j], task, validate=False)
+
+
+def main(sizes: List[int]) -> None:
+    columns = ["tasks", "edges", "add tasks (s)", "per task (us)", "add edges (s)"]
+    print(("{:>14}" * 6).format(*columns, "sort (s)"))
+    for n in sizes:
+        tasks = [Task(name=str(i)) for i in range(n)]
+        flow = Flow("benchmark")
+        task_time, _ = timed(lambda: add_tasks(flow, tasks))
+        edge_time, _ = timed(lambda: add_edges(flow, tasks))
+        sort_time, _ = timed(flow.sorted_tasks)
+        print(
+            ("{:>14}" * 2 + "{:>14.3f}" * 4).format(
+                n, len(flow.edges), task_time, 1e6 * task_time / n, edge_time, sort_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,79 @@
+"""
+Benchmarks the memory used by the graph of large Flows.
+
+Each benchmark creates `n` tasks, adds them to a `Flow` and to a `CompactFlow`, and
+connects every task to (up to) three randomly chosen earlier tasks, a third of them
+with a key and every tenth of them mapped. The memory allocated while building each
+flow is measured with `tracemalloc`; the tasks themselves are created beforehand and
+are not counted.
+
+Usage:
+    python benchmarks/flow_memory.py [n ...]
+
+If no sizes are provided, flows of 1k, 10k and 100k tasks are benchmarked.
+"""
+import gc
+import random
+import sys
+import tracemalloc
+from typing import List, Tuple, Type
+
+from prefect import Flow, Task
+from prefect.core.compact import CompactFlow
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+class Add(Task):
+    def run(self, x=None, y=None, z=None):  # type: ignore
+        pass
+
+
+def build(flow_class: Type[Flow], tasks: List[Task], seed: int = 42) -> Flow:
+    rng = random.Random(seed)
+    flow = flow_class("benchmark")
+    for task in tasks:
+        flow.add_task(task)
+    for i, task in enumerate(tasks):
+        for key, j in zip("xyz", {rng.randrange(i) for _ in range(3)} if i else []):
+            flow.add_edge(
+                tasks[j],
+                task,
+                key=key if j % 3 == 0 else None,
+                mapped=j % 10 == 0,
+                validate=False,
+            )
+    flow.sorted_tasks()
+    return flow
+
+
+def measure(flow_class: Type[Flow], tasks: List[Task]) -> Tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    flow = build(flow_class, tasks)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, len(flow.edges)
+
+
+def main(sizes: List[int]) -> None:
+    columns = ["tasks", "edges", "Flow (MB)", "Compact (MB)", "per edge (B)"]
+    print(("{:>14}" * 6).format(*columns, "compact (B)"))
+    for n in sizes:
+        tasks = [Add(name=str(i)) for i in range(n)]
+        flow_size, edges = measure(Flow, tasks)
+        compact_size, _ = measure(CompactFlow, tasks)
+        print(
+            ("{:>14}" * 2 + "{:>14.1f}" * 2 + "{:>14.0f}" * 2).format(
+                n,
+                edges,
+                flow_size / 2 ** 20,
+                compact_size / 2 ** 20,
+                flow_size / max(edges, 1),
+                compact_size / max(edges, 1),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or DEFAULT_SIZES)
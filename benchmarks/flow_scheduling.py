@@ -0,0 +1,94 @@
+"""
+Benchmarks the FlowRunner's scheduling modes on wide flows.
+
+Each benchmark runs a flow in which a single root task fans out to `n` independent
+tasks, each of which sleeps briefly, that then fan back in to a single task. The flow
+is run on a local `DaskExecutor` with "eager" scheduling (every task is submitted up
+front) and with "ready" scheduling (tasks are submitted as their upstream tasks finish,
+with at most `MAX_IN_FLIGHT` tasks in flight). The end-to-end run time is reported,
+along with the largest number of tasks held by the Dask scheduler at any time, which is
+sampled in a background thread.
+
+Usage:
+    python benchmarks/flow_scheduling.py [n ...]
+
+If no sizes are provided, flows of 100, 1k and 5k tasks are benchmarked.
+"""
+import sys
+import threading
+import time
+from typing import List, Tuple
+
+from prefect import Flow, Task
+from prefect.engine.executors import DaskExecutor
+from prefect.engine.flow_runner import FlowRunner
+from prefect.utilities.configuration import set_temporary_config
+
+DEFAULT_SIZES = [100, 1000, 5000]
+MAX_IN_FLIGHT = 64
+
+
+class Sleep(Task):
+    def run(self, x=None):  # type: ignore
+        time.sleep(0.001)
+
+
+class Gather(Task):
+    def run(self, **kwargs):  # type: ignore
+        pass
+
+
+def wide_flow(n: int) -> Flow:
+    flow = Flow("benchmark")
+    root, gather = Sleep(), Gather()
+    for i in range(n):
+        task = Sleep()
+        flow.add_edge(root, task, key="x")
+        flow.add_edge(task, gather, key="x{}".format(i))
+    return flow
+
+
+def run(flow: Flow, scheduling: str) -> Tuple[float, int]:
+    executor = DaskExecutor(n_workers=4, threads_per_worker=1)
+    peak = [0]
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.wait(0.05):
+            client = getattr(executor, "client", None)
+            if client is not None:
+                n_tasks = client.run_on_scheduler(lambda dask_scheduler: len(dask_scheduler.tasks))  # type: ignore
+                peak[0] = max(peak[0], n_tasks)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    config = {
+        "engine.flow_runner.scheduling": scheduling,
+        "engine.flow_runner.max_in_flight": MAX_IN_FLIGHT,
+    }
+    start = time.perf_counter()
+    with set_temporary_config(config):
+        state = FlowRunner(flow=flow).run(executor=executor)
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    assert state.is_successful(), state
+    return elapsed, peak[0]
+
+
+def main(sizes: List[int]) -> None:
+    columns = ["tasks", "eager (s)", "ready (s)", "eager peak"]
+    print(("{:>14}" * 5).format(*columns, "ready peak"))
+    for n in sizes:
+        flow = wide_flow(n)
+        eager_time, eager_peak = run(flow, "eager")
+        ready_time, ready_peak = run(flow, "ready")
+        print(
+            ("{:>14}" + "{:>14.3f}" * 2 + "{:>14}" * 2).format(
+                len(flow.tasks), eager_time, ready_time, eager_peak, ready_peak
+            )
+        )
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,44 @@
+"""
+Benchmarks building Flows with the functional API.
+
+Each benchmark calls a task `n` times inside a Flow context, binding the result of a
+randomly chosen earlier call (or a constant) to each of its arguments. Every call copies
+the task and binds its arguments, so this measures the per-call overhead of
+`Task.__call__`, `Task.bind` and `Flow.add_edge`.
+
+Usage:
+    python benchmarks/functional_api.py [n ...]
+
+If no sizes are provided, flows of 1k, 10k and 100k calls are benchmarked.
+"""
+import random
+import sys
+import time
+from typing import List
+
+from prefect import Flow, Task
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+class Add(Task):
+    def run(self, x, y):  # type: ignore
+        return x + y
+
+
+def main(sizes: List[int]) -> None:
+    print(("{:>14}" * 3).format("calls", "build (s)", "per call (us)"))
+    rng = random.Random(42)
+    add = Add()
+    for n in sizes:
+        start = time.perf_counter()
+        with Flow("benchmark"):
+            results = [add(1, 2)]  # type: List[object]
+            for _ in range(n - 1):
+                results.append(add(rng.choice(results), rng.choice([1] + results)))
+        build_time = time.perf_counter() - start
+        print(("{:>14}" + "{:>14.3f}" * 2).format(n, build_time, 1e6 * build_time / n))
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,59 @@
+"""
+Benchmarks creating and inspecting states, the work the engine does on every task state
+transition.
+
+Each transition creates a `Running` state and then a `Success` state holding a
+`Result`, checks both with a few `is_*` predicates (as the runners do when handling a
+state change) and compares the new state with a reference state. The number of
+transitions per second is reported, along with the memory held per `Success` state
+(including its `Result`) when many of them are kept alive, as they are for the children
+of mapped tasks.
+
+Usage:
+    python benchmarks/states.py [n]
+
+If `n` isn't provided, 1M transitions are benchmarked.
+"""
+import sys
+import time
+import tracemalloc
+
+from prefect.engine.result import Result
+from prefect.engine.state import Running, Success
+
+DEFAULT_N = 1000000
+
+
+def transitions(n: int) -> float:
+    reference = Success(result=Result(0))
+    start = time.perf_counter()
+    for i in range(n):
+        state = Running(message="Starting task run.")
+        assert state.is_running() and not state.is_finished()
+        state = Success(message="Task run succeeded.", result=Result(i))
+        assert state.is_finished() and state.is_successful()
+        assert not state.is_mapped() and not state.is_failed()
+        state == reference
+    return n / (time.perf_counter() - start)
+
+
+def memory(n: int) -> float:
+    tracemalloc.start()
+    states = [
+        Success(message="Task run succeeded.", result=Result(i)) for i in range(n)
+    ]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(states) == n
+    return size / n
+
+
+def main(n: int) -> None:
+    print(
+        "{:>16}{:>24}{:>24}".format("transitions", "transitions / s", "bytes / state")
+    )
+    print("{:>16}{:>24,.0f}{:>24.1f}".format(n, transitions(n), memory(n)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_N)
@@ -758,6 +758,27 @@ class Client:
         }
         self.graphql(mutation, raise_on_error=False)
 
+    def update_task_run_heartbeats(self, task_run_ids: List[str]) -> None:
+        """
+        Convenience method for heartbeating several task runs with a single request.
+
+        Does NOT raise an error if the update fails.
+
+        Args:
+            - task_run_ids (List[str]): the task run IDs to heartbeat
+
+        """
+        mutation = {
+            "mutation": {
+                with_args(
+                    "task_run_{}: updateTaskRunHeartbeat".format(i),
+                    {"input": {"taskRunId": task_run_id}},
+                ): {"success"}
+                for i, task_run_id in enumerate(task_run_ids)
+            }
+        }
+        self.graphql(mutation, raise_on_error=False)
+
     def set_flow_run_state(
         self, flow_run_id: str, version: int, state: "prefect.engine.state.State"
     ) -> None:
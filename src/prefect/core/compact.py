@@ -0,0 +1,402 @@
+"""
+A memory-efficient Flow for very large graphs.
+
+A `Flow` stores every edge as an `Edge` object, held in a set and in two adjacency
+indices. For flows with hundreds of thousands of edges, these objects dominate the
+memory used by the flow. `CompactFlow` stores the same graph in flat integer arrays
+and exposes it through the usual `Flow` API.
+"""
+import array
+import copy
+import heapq
+from collections.abc import Mapping, Set as AbstractSet
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+from prefect.core.edge import Edge
+from prefect.core.flow import Flow, cache
+from prefect.core.task import Task
+
+CSR = Tuple[array.array, array.array]
+T = TypeVar("T")
+
+
+def _build_csr(sources: array.array, n: int) -> CSR:
+    """
+    Builds a compressed sparse row index of edges, grouped by one of their endpoints.
+
+    Args:
+        - sources (array): the endpoint of each edge to group by
+        - n (int): the number of tasks
+
+    Returns:
+        - Tuple[array, array]: an array of offsets and an array of edge ids; the ids of
+            the edges of task `i` are `edge_ids[offsets[i]:offsets[i + 1]]`
+    """
+    offsets = array.array("i", [0]) * (n + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+
+    position = offsets[:-1]
+    edge_ids = array.array("i", [0]) * len(sources)
+    for edge_id, source in enumerate(sources):
+        edge_ids[position[source]] = edge_id
+        position[source] += 1
+    return offsets, edge_ids
+
+
+class _EdgeView(AbstractSet):
+    """
+    A read-only, set-like view of the edges of a `CompactFlow`. `Edge` objects are
+    created as they are iterated over.
+    """
+
+    __slots__ = ("_flow",)
+
+    def __init__(self, flow: "CompactFlow"):
+        self._flow = flow
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[T]) -> Set[T]:
+        return set(it)
+
+    def __len__(self) -> int:
+        return len(self._flow._edge_upstream)
+
+    def __iter__(self) -> Iterator[Edge]:
+        return map(self._flow._get_edge, range(len(self)))
+
+    def __contains__(self, edge: object) -> bool:
+        if not isinstance(edge, Edge):
+            return False
+        return self._flow._pack_edge(edge) in self._flow._edge_index
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, set(self))
+
+    def copy(self) -> Set[Edge]:
+        return set(self)
+
+
+class _AdjacencyView(Mapping):
+    """
+    A read-only view relating each task of a `CompactFlow` to the set of its upstream
+    (or downstream) edges.
+    """
+
+    __slots__ = ("_flow", "_downstream")
+
+    def __init__(self, flow: "CompactFlow", downstream: bool):
+        self._flow = flow
+        self._downstream = downstream
+
+    def __getitem__(self, task: Task) -> Set[Edge]:
+        flow = self._flow
+        offsets, edge_ids = flow._csr()[self._downstream]
+        i = flow._task_ids[task]
+        return {flow._get_edge(e) for e in edge_ids[offsets[i] : offsets[i + 1]]}
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._flow._task_list)
+
+    def __len__(self) -> int:
+        return len(self._flow._task_list)
+
+
+class CompactFlow(Flow):
+    """
+    A `Flow` that stores its graph in compact, array-backed form, intended for flows with
+    many thousands of tasks and edges. It accepts the same arguments as `Flow` and
+    supports the same API.
+
+    Each task is assigned an integer id in the order it was added to the flow. Edges are
+    stored as arrays of upstream ids, downstream ids and key ids (keys are interned), with
+    a bitset of mapped flags; adjacency is indexed in compressed sparse row form, which is
+    rebuilt the first time it is needed after edges are added. As a result, adding an edge
+    is cheap but looking up a task's edges right afterwards is not, so flows that are
+    validated eagerly should be built within `Flow.batch()`. Removing a task (as
+    `replace` does) renumbers the tasks after it and rewrites the edge arrays, in time
+    linear in the size of the flow.
+
+    `flow.tasks` and `flow.edges` are read-only, set-like views; `Edge` objects are
+    created as they are requested, so they compare equal to, but are not identical to,
+    the edges returned by `add_edge`. Tasks and edges must be added with `add_task`
+    and `add_edge` rather than by modifying these collections.
+
+    Example:
+        ```python
+        from prefect.core.compact import CompactFlow
+
+        with CompactFlow("big flow") as flow:
+            ...
+        ```
+    """
+
+    def _init_graph(self) -> None:
+        self._task_list = []  # type: List[Task]
+        self._task_ids = {}  # type: Dict[Task, int]
+
+        self._edge_upstream = array.array("i")
+        self._edge_downstream = array.array("i")
+        self._edge_keys = array.array("i")  # -1 for edges without a key
+        self._edge_mapped = bytearray()  # one bit per edge
+
+        # packed (upstream, downstream, key, mapped) of every edge, for membership tests
+        self._edge_index = set()  # type: Set[int]
+
+        # interned edge keys
+        self._keys = []  # type: List[str]
+        self._key_ids = {}  # type: Dict[str, int]
+
+        # upstream and downstream CSR indices; `None` when edges have been added since
+        # they were last built
+        self._csr_index = None  # type: Optional[Tuple[CSR, CSR]]
+
+    @property
+    def tasks(self) -> AbstractSet:  # type: ignore
+        return self._task_ids.keys()
+
+    @property
+    def edges(self) -> AbstractSet:  # type: ignore
+        return _EdgeView(self)
+
+    @property
+    def _upstream_edges(self) -> Mapping:  # type: ignore
+        return _AdjacencyView(self, downstream=False)
+
+    @property
+    def _downstream_edges(self) -> Mapping:  # type: ignore
+        return _AdjacencyView(self, downstream=True)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the CSR indices can be rebuilt from the edge arrays
+        state = self.__dict__.copy()
+        state["_csr_index"] = None
+        return state
+
+    def copy(self) -> "CompactFlow":
+        """
+        Create and returns a copy of the current Flow.
+        """
+        new = copy.copy(self)
+        new._cache = dict()
+        new._task_list = self._task_list.copy()
+        new._task_ids = self._task_ids.copy()
+        new._edge_upstream = self._edge_upstream[:]
+        new._edge_downstream = self._edge_downstream[:]
+        new._edge_keys = self._edge_keys[:]
+        new._edge_mapped = self._edge_mapped[:]
+        new._edge_index = self._edge_index.copy()
+        new._keys = self._keys.copy()
+        new._key_ids = self._key_ids.copy()
+        new._slugs = self._slugs.copy()
+        new._deferred_edges = None
+        new.set_reference_tasks(self._reference_tasks)
+        return new
+
+    # Storage ------------------------------------------------------------------
+
+    def _store_task(self, task: Task) -> None:
+        self._graph_version += 1
+        self._task_ids[task] = len(self._task_list)
+        self._task_list.append(task)
+        self._csr_index = None
+
+    def _store_edge(self, edge: Edge) -> None:
+        packed = self._pack_edge(edge, intern=True)
+        assert packed is not None  # mypy assert; both tasks are in the flow
+        if packed in self._edge_index:
+            return
+
+        self._graph_version += 1
+        edge_id = len(self._edge_upstream)
+        self._edge_upstream.append(self._task_ids[edge.upstream_task])
+        self._edge_downstream.append(self._task_ids[edge.downstream_task])
+        self._edge_keys.append(self._key_ids[edge.key] if edge.key else -1)
+        if edge_id % 8 == 0:
+            self._edge_mapped.append(0)
+        if edge.mapped:
+            self._edge_mapped[edge_id // 8] |= 1 << (edge_id % 8)
+        self._edge_index.add(packed)
+        self._csr_index = None
+
+    def _remove_task(self, task: Task) -> Set[Edge]:
+        # ids are positions in the task list, so removing a task renumbers the tasks
+        # after it; the edge arrays are rewritten with the new ids, without creating
+        # `Edge` objects for the edges that are kept
+        removed = self._task_ids[task]
+        upstream = array.array("i")
+        downstream = array.array("i")
+        keys = array.array("i")
+        mapped = bytearray()
+        index = set()  # type: Set[int]
+
+        affected_edges = set()
+        for edge_id, (u, d) in enumerate(
+            zip(self._edge_upstream, self._edge_downstream)
+        ):
+            if u == removed or d == removed:
+                affected_edges.add(self._get_edge(edge_id))
+                continue
+            u -= u > removed
+            d -= d > removed
+            key_id = self._edge_keys[edge_id]
+            is_mapped = bool(self._edge_mapped[edge_id // 8] & (1 << (edge_id % 8)))
+            new_id = len(upstream)
+            upstream.append(u)
+            downstream.append(d)
+            keys.append(key_id)
+            if new_id % 8 == 0:
+                mapped.append(0)
+            if is_mapped:
+                mapped[new_id // 8] |= 1 << (new_id % 8)
+            index.add(self._pack(u, d, key_id, is_mapped))
+
+        del self._task_list[removed]
+        self._task_ids = {t: i for i, t in enumerate(self._task_list)}
+        self._edge_upstream = upstream
+        self._edge_downstream = downstream
+        self._edge_keys = keys
+        self._edge_mapped = mapped
+        self._edge_index = index
+        self._csr_index = None
+        self._graph_version += 1
+        return affected_edges
+
+    @staticmethod
+    def _pack(upstream_id: int, downstream_id: int, key_id: int, mapped: bool) -> int:
+        packed = (upstream_id << 32 | downstream_id) << 32 | (key_id + 1)
+        return packed << 1 | mapped
+
+    def _pack_edge(self, edge: Edge, intern: bool = False) -> Optional[int]:
+        """
+        Packs an edge into a single integer that identifies it among the flow's edges.
+
+        Args:
+            - edge (Edge): the edge to pack
+            - intern (bool, optional): whether to intern the edge's key if it has not been
+                seen before; otherwise, `None` is returned for unknown keys
+
+        Returns:
+            - int: the packed edge, or `None` if its tasks or key are not in the flow
+        """
+        upstream_id = self._task_ids.get(edge.upstream_task)
+        downstream_id = self._task_ids.get(edge.downstream_task)
+        if upstream_id is None or downstream_id is None:
+            return None
+
+        key_id = -1
+        if edge.key:
+            if intern and edge.key not in self._key_ids:
+                self._key_ids[edge.key] = len(self._keys)
+                self._keys.append(edge.key)
+            if edge.key not in self._key_ids:
+                return None
+            key_id = self._key_ids[edge.key]
+
+        return self._pack(upstream_id, downstream_id, key_id, bool(edge.mapped))
+
+    def _get_edge(self, edge_id: int) -> Edge:
+        """
+        Creates the `Edge` object for the edge with the given id.
+        """
+        key_id = self._edge_keys[edge_id]
+        return Edge(
+            upstream_task=self._task_list[self._edge_upstream[edge_id]],
+            downstream_task=self._task_list[self._edge_downstream[edge_id]],
+            key=self._keys[key_id] if key_id >= 0 else None,
+            mapped=bool(self._edge_mapped[edge_id // 8] & (1 << (edge_id % 8))),
+        )
+
+    def _csr(self) -> Tuple[CSR, CSR]:
+        """
+        Returns the CSR indices of the edges grouped by downstream task (the upstream
+        edges of each task) and by upstream task (the downstream edges of each task),
+        building them if necessary.
+        """
+        if self._csr_index is None:
+            n = len(self._task_list)
+            self._csr_index = (
+                _build_csr(self._edge_downstream, n),
+                _build_csr(self._edge_upstream, n),
+            )
+        return self._csr_index
+
+    # Introspection ------------------------------------------------------------
+
+    @cache
+    def root_tasks(self) -> Set[Task]:
+        offsets, _ = self._csr()[0]
+        return {
+            t for i, t in enumerate(self._task_list) if offsets[i] == offsets[i + 1]
+        }
+
+    @cache
+    def terminal_tasks(self) -> Set[Task]:
+        offsets, _ = self._csr()[1]
+        return {
+            t for i, t in enumerate(self._task_list) if offsets[i] == offsets[i + 1]
+        }
+
+    @cache
+    def _sorted_tasks(self, root_tasks: Tuple[Task, ...] = None) -> Tuple[Task, ...]:
+        """
+        Computes the same topological sort as `Flow._sorted_tasks`, working directly on
+        task ids. Since ids are assigned in the order tasks were added, ties are broken
+        by id.
+        """
+        n = len(self._task_list)
+        upstream, downstream = self._edge_upstream, self._edge_downstream
+        offsets, edge_ids = self._csr()[1]
+
+        # mark the tasks under consideration (root tasks and all downstream tasks)
+        if root_tasks:
+            for t in root_tasks:
+                if t not in self._task_ids:
+                    raise ValueError(
+                        "Task {t} was not found in Flow {f}".format(t=t, f=self)
+                    )
+            considered = bytearray(n)
+            to_visit = [self._task_ids[t] for t in root_tasks]
+            for i in to_visit:
+                considered[i] = 1
+            while to_visit:
+                i = to_visit.pop()
+                for e in edge_ids[offsets[i] : offsets[i + 1]]:
+                    if not considered[downstream[e]]:
+                        considered[downstream[e]] = 1
+                        to_visit.append(downstream[e])
+        else:
+            considered = bytearray(b"\x01") * n
+
+        in_degree = array.array("i", [0]) * n
+        for u, d in zip(upstream, downstream):
+            if considered[u] and considered[d]:
+                in_degree[d] += 1
+
+        # task ids are ascending, so this list is already a heap
+        ready = [i for i in range(n) if considered[i] and not in_degree[i]]
+        sorted_ids = []
+        while ready:
+            i = heapq.heappop(ready)
+            sorted_ids.append(i)
+            for e in edge_ids[offsets[i] : offsets[i + 1]]:
+                d = downstream[e]
+                in_degree[d] -= 1
+                if not in_degree[d]:
+                    heapq.heappush(ready, d)
+
+        if len(sorted_ids) < sum(considered):
+            unsorted = {
+                self._task_list[i]
+                for i in range(n)
+                if considered[i] and in_degree[i] > 0
+            }
+            cycle = self._find_cycle(unsorted, rank=self._task_ids)
+            raise ValueError(
+                "Cycle found; flows must be acyclic! The following tasks form a "
+                "cycle: {}".format(" -> ".join(repr(t) for t in cycle))
+            )
+
+        return tuple(self._task_list[i] for i in sorted_ids)
@@ -1,7 +1,9 @@
 import collections
 import copy
 import functools
+import heapq
 import inspect
+import itertools
 import json
 import os
 import tempfile
@@ -9,11 +11,13 @@ import time
 import uuid
 import warnings
 from collections import Counter
+from contextlib import contextmanager
 from typing import (
     Any,
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     Mapping,
     Optional,
@@ -29,7 +33,7 @@ from mypy_extensions import TypedDict
 import prefect
 import prefect.schedules
 from prefect.core.edge import Edge
-from prefect.core.task import Parameter, Task
+from prefect.core.task import Parameter, Task, _get_signature
 from prefect.engine.result import NoResult
 from prefect.engine.result_handlers import ResultHandler
 from prefect.environments import RemoteEnvironment, Environment
@@ -42,29 +46,87 @@ from prefect.utilities.tasks import as_task, unmapped
 ParameterDetails = TypedDict("ParameterDetails", {"default": Any, "required": bool})
 
 
+class _VersionedSet(set):
+    """
+    A set that counts the changes made to it, so that a Flow can tell in constant time
+    whether its tasks, edges or reference tasks have been modified directly.
+    """
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.version = 0
+
+    def copy(self) -> "_VersionedSet":
+        return _VersionedSet(self)
+
+
+def _count_changes(name: str) -> Callable:
+    method = getattr(set, name)
+
+    @functools.wraps(method)
+    def counted(self, *args):  # type: ignore
+        self.version += 1
+        return method(self, *args)
+
+    return counted
+
+
+for _name in (
+    "add",
+    "clear",
+    "difference_update",
+    "discard",
+    "intersection_update",
+    "pop",
+    "remove",
+    "symmetric_difference_update",
+    "update",
+    "__iand__",
+    "__ior__",
+    "__isub__",
+    "__ixor__",
+):
+    setattr(_VersionedSet, _name, _count_changes(_name))
+
+
+def _cache_check(collection: Any) -> Any:
+    if isinstance(collection, _VersionedSet):
+        return collection.version
+    elif isinstance(collection, set):
+        # a plain set assigned to the flow directly can only be compared by value
+        return collection.copy()
+    # read-only views (see `CompactFlow`) change only through the flow's methods
+    return None
+
+
 def cache(method: Callable) -> Callable:
     """
     Decorator for caching Flow methods.
 
-    Each Flow has a _cache dict that can be used to memoize expensive functions. This
-    decorator automatically compares a hash of the Flow's current tasks, edges, and reference_tasks
-    to a cached hash; if the hash is the same, it attempts to retrieve a value from the cache.
-    If the hash is different, it invalidates the cache.
+    Each Flow has a _cache dict that can be used to memoize expensive functions. Flow methods
+    that modify the graph are responsible for clearing the cache; as a safeguard against direct
+    modification of `flow.tasks` or `flow.edges`, this decorator also compares the number of
+    changes made to the Flow's graph, tasks, edges, and reference_tasks to the cached counts
+    and invalidates the cache if they differ. This check is constant-time, regardless of the
+    size of the Flow.
     """
 
+    signature = inspect.signature(method)
+
     @functools.wraps(method)
     def wrapper(self, *args, **kwargs):  # type: ignore
 
         cache_check = dict(
-            tasks=self.tasks.copy(),
-            edges=self.edges.copy(),
-            reference_tasks=copy.copy(self._reference_tasks),
+            graph=self._graph_version,
+            tasks=_cache_check(self.tasks),
+            edges=_cache_check(self.edges),
+            reference_tasks=_cache_check(self._reference_tasks),
         )
         if any(self._cache.get(k) != v for k, v in cache_check.items()):
             self._cache.clear()
             self._cache.update(cache_check)
 
-        callargs = inspect.signature(method).bind(self, *args, **kwargs).arguments
+        callargs = signature.bind(self, *args, **kwargs).arguments
         key = (method.__name__, tuple(callargs.items())[1:])
         if key not in self._cache:
             self._cache[key] = method(self, *args, **kwargs)
@@ -149,6 +211,10 @@ class Flow:
     ):
         self._cache = {}  # type: dict
 
+        # the number of changes made to the graph through `_store_task`, `_store_edge`
+        # and `_remove_task`, which invalidate the cache
+        self._graph_version = 0
+
         if not name:
             raise ValueError("A name must be provided for the flow.")
 
@@ -161,21 +227,27 @@ class Flow:
             result_handler or prefect.engine.get_default_result_handler_class()()
         )
 
-        self.tasks = set()  # type: Set[Task]
-        self.edges = set()  # type: Set[Edge]
+        self._init_graph()
+
+        # index of tasks by slug, used to enforce slug uniqueness
+        self._slugs = {}  # type: Dict[str, Task]
+
+        # edges whose validation has been deferred by `Flow.batch()`
+        self._deferred_edges = None  # type: Optional[List[Edge]]
 
         for t in tasks or []:
             self.add_task(t)
 
         self.set_reference_tasks(reference_tasks or [])
-        for e in edges or []:
-            self.add_edge(
-                upstream_task=e.upstream_task,
-                downstream_task=e.downstream_task,
-                key=e.key,
-                mapped=e.mapped,
-                validate=validate,
-            )
+        with self.batch():
+            for e in edges or []:
+                self.add_edge(
+                    upstream_task=e.upstream_task,
+                    downstream_task=e.downstream_task,
+                    key=e.key,
+                    mapped=e.mapped,
+                    validate=validate,
+                )
 
         self._prefect_version = prefect.__version__
 
@@ -189,6 +261,36 @@ class Flow:
 
         super().__init__()
 
+    def _init_graph(self) -> None:
+        """
+        Creates the empty collections that store the flow's tasks and edges. Subclasses
+        that store their graph differently (see `CompactFlow`) override this method along
+        with `_store_task`, `_store_edge` and `_remove_task`.
+        """
+        self.tasks = _VersionedSet()  # type: Set[Task]
+        self.edges = _VersionedSet()  # type: Set[Edge]
+
+        # adjacency indices, maintained incrementally as tasks and edges are added
+        self._upstream_edges = {}  # type: Dict[Task, Set[Edge]]
+        self._downstream_edges = {}  # type: Dict[Task, Set[Edge]]
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_graph_version", 0)
+        self.__dict__.setdefault("_deferred_edges", None)
+        # flows pickled by older versions of Prefect store their tasks and edges in plain
+        # sets, without the indices built as they are added; the graph is rebuilt
+        if "tasks" in state and "_upstream_edges" not in state:
+            tasks, edges = state["tasks"], state["edges"]
+            self._init_graph()
+            for task in tasks:
+                self._store_task(task)
+            for edge in edges:
+                self._store_edge(edge)
+            self._slugs = {t.slug: t for t in self.tasks if t.slug}
+            self._reference_tasks = _VersionedSet(state.get("_reference_tasks", ()))
+            self._cache = {}
+
     def __eq__(self, other: Any) -> bool:
         if type(self) == type(other):
             s = (self.name, self.tasks, self.edges, self.reference_tasks())
@@ -212,6 +314,10 @@ class Flow:
         new._cache = dict()
         new.tasks = self.tasks.copy()
         new.edges = self.edges.copy()
+        new._upstream_edges = {t: e.copy() for t, e in self._upstream_edges.items()}
+        new._downstream_edges = {t: e.copy() for t, e in self._downstream_edges.items()}
+        new._slugs = self._slugs.copy()
+        new._deferred_edges = None
         new.set_reference_tasks(self._reference_tasks)
         return new
 
@@ -273,18 +379,14 @@ class Flow:
 
         new = as_task(new, flow=self)
 
-        # update tasks
-        self.tasks.remove(old)
+        # update tasks, removing the old task's edges along with it
+        if self._slugs.get(old.slug) is old:
+            del self._slugs[old.slug]
+        affected_edges = self._remove_task(old)
         self.add_task(new)
 
         self._cache.clear()
 
-        affected_edges = {e for e in self.edges if old in e.tasks}
-
-        # remove old edges
-        for edge in affected_edges:
-            self.edges.remove(edge)
-
         # replace with new edges
         for edge in affected_edges:
             upstream = new if edge.upstream_task == old else edge.upstream_task
@@ -332,7 +434,7 @@ class Flow:
         Returns:
             - set of Task objects that have no upstream dependencies
         """
-        return set(t for t in self.tasks if not self.edges_to(t))
+        return set(t for t in self.tasks if not self._upstream_edges.get(t))
 
     @cache
     def terminal_tasks(self) -> Set[Task]:
@@ -342,7 +444,7 @@ class Flow:
         Returns:
             - set of Task objects that have no downstream dependencies
         """
-        return set(t for t in self.tasks if not self.edges_from(t))
+        return set(t for t in self.tasks if not self._downstream_edges.get(t))
 
     def parameters(self) -> Set[Parameter]:
         """
@@ -392,7 +494,7 @@ class Flow:
             - None
         """
         self._cache.clear()
-        reference_tasks = set(tasks)
+        reference_tasks = _VersionedSet(tasks)
         if any(t not in self.tasks for t in reference_tasks):
             raise ValueError("reference tasks must be part of the flow.")
         self._reference_tasks = reference_tasks
@@ -419,18 +521,62 @@ class Flow:
                 "Tasks must be Task instances (received {})".format(type(task))
             )
         elif task not in self.tasks:
-            if task.slug and any(task.slug == t.slug for t in self.tasks):
+            # the index may be stale if tasks were removed from `flow.tasks` directly
+            existing = self._slugs.get(task.slug)
+            if (
+                task.slug
+                and existing in self.tasks
+                and getattr(existing, "slug", None) == task.slug
+            ):
                 raise ValueError(
                     'A task with the slug "{}" already exists in this '
                     "flow.".format(task.slug)
                 )
 
         if task not in self.tasks:
-            self.tasks.add(task)
+            self._store_task(task)
+            if task.slug:
+                self._slugs[task.slug] = task
             self._cache.clear()
 
         return task
 
+    def _store_task(self, task: Task) -> None:
+        """
+        Adds a task, which is not yet part of the flow, to the flow's graph.
+        """
+        self._graph_version += 1
+        self.tasks.add(task)
+        self._upstream_edges.setdefault(task, set())
+        self._downstream_edges.setdefault(task, set())
+
+    def _store_edge(self, edge: Edge) -> None:
+        """
+        Adds an edge between two tasks of the flow to the flow's graph.
+        """
+        self._graph_version += 1
+        self.edges.add(edge)
+        self._upstream_edges.setdefault(edge.downstream_task, set()).add(edge)
+        self._downstream_edges.setdefault(edge.upstream_task, set()).add(edge)
+
+    def _remove_task(self, task: Task) -> Set[Edge]:
+        """
+        Removes a task and all of its edges from the flow's graph.
+
+        Returns:
+            - Set[Edge]: the edges that were removed
+        """
+        self._graph_version += 1
+        self.tasks.remove(task)
+        edges = self._upstream_edges.pop(task, set()).union(
+            self._downstream_edges.pop(task, set())
+        )
+        for edge in edges:
+            self.edges.remove(edge)
+            self._upstream_edges.get(edge.downstream_task, set()).discard(edge)
+            self._downstream_edges.get(edge.upstream_task, set()).discard(edge)
+        return edges
+
     def add_edge(
         self,
         upstream_task: Task,
@@ -462,6 +608,12 @@ class Flow:
         """
         if validate is None:
             validate = cast(bool, prefect.config.flows.eager_edge_validation)
+
+        # inside `Flow.batch()`, validation is deferred until the batch exits
+        defer_validation = validate and self._deferred_edges is not None
+        if defer_validation:
+            validate = False
+
         if isinstance(downstream_task, Parameter):
             raise ValueError(
                 "Parameters must be root tasks and can not have upstream dependencies."
@@ -486,14 +638,17 @@ class Flow:
             key=key,
             mapped=mapped,
         )
-        self.edges.add(edge)
+        self._store_edge(edge)
+
+        if defer_validation:
+            self._deferred_edges.append(edge)  # type: ignore
 
         # check that the edges are valid keywords by binding them
         if validate and key is not None:
             edge_keys = {
                 e.key: None for e in self.edges_to(downstream_task) if e.key is not None
             }
-            inspect.signature(downstream_task.run).bind_partial(**edge_keys)
+            _get_signature(downstream_task.run).bind_partial(**edge_keys)
 
         self._cache.clear()
 
@@ -518,14 +673,83 @@ class Flow:
             - A list of Edge objects added to the flow
         """
         edges = []
-        for u_task, d_task in zip(tasks, tasks[1:]):
-            edges.append(
-                self.add_edge(
-                    upstream_task=u_task, downstream_task=d_task, validate=validate
+        with self.batch():
+            for u_task, d_task in zip(tasks, tasks[1:]):
+                edges.append(
+                    self.add_edge(
+                        upstream_task=u_task, downstream_task=d_task, validate=validate
+                    )
                 )
-            )
         return edges
 
+    @contextmanager
+    def batch(self) -> Iterator["Flow"]:
+        """
+        Context manager for adding many edges to the flow at once. Within the context,
+        any edge that would be validated when it is added (either because `validate=True`
+        was passed or because `eager_edge_validation` is set in your Prefect configuration)
+        is instead validated a single time, when the context exits. Because validating the
+        flow requires sorting all of its tasks, this turns the cost of building a large,
+        eagerly-validated flow from quadratic to linear in the number of edges.
+
+        Validation raises the same errors as `Flow.add_edge`; however, the offending edges
+        will have already been added to the flow when the error is raised. If an error is
+        raised within the context, no validation is performed. Nested batches are
+        validated when the outermost batch exits.
+
+        Example:
+            ```python
+            flow = Flow("big flow")
+            with flow.batch():
+                for upstream, downstream in pairs:
+                    flow.add_edge(upstream, downstream, validate=True)
+            ```
+
+        Returns:
+            - Flow: this flow, when used as a context manager
+
+        Raises:
+            - ValueError: if a cycle is found, or if an argument of a task was assigned
+                more than once
+            - TypeError: if an edge key does not match an argument of its downstream task
+        """
+        if self._deferred_edges is not None:
+            yield self
+            return
+
+        self._deferred_edges = []
+        try:
+            yield self
+            deferred_edges = self._deferred_edges
+        finally:
+            self._deferred_edges = None
+
+        if deferred_edges:
+            self._validate_edge_keys({e.downstream_task for e in deferred_edges})
+            self.validate()
+
+    def _validate_edge_keys(self, tasks: Iterable[Task]) -> None:
+        """
+        Checks that no argument of the provided tasks is assigned by more than one edge
+        and that all edge keys are valid keyword arguments of the tasks' `run` methods.
+
+        Args:
+            - tasks (Iterable[Task]): the downstream tasks whose upstream edges should
+                be checked
+        """
+        for task in tasks:
+            keys = [e.key for e in self._upstream_edges.get(task, ()) if e.key]
+            for key, count in Counter(keys).items():
+                if count > 1:
+                    raise ValueError(
+                        'Argument "{a}" for task {t} has already been assigned in '
+                        "this flow. If you are trying to call the task again with "
+                        "new arguments, call Task.copy() before adding the result "
+                        "to this flow.".format(a=key, t=task)
+                    )
+            if keys:
+                _get_signature(task.run).bind_partial(**{k: None for k in keys})
+
     def update(self, flow: "Flow", validate: bool = None) -> None:
         """
         Take all tasks and edges in another flow and add it to this flow
@@ -541,15 +765,16 @@ class Flow:
             if task not in self.tasks:
                 self.add_task(task)
 
-        for edge in flow.edges:
-            if edge not in self.edges:
-                self.add_edge(
-                    upstream_task=edge.upstream_task,
-                    downstream_task=edge.downstream_task,
-                    key=edge.key,
-                    mapped=edge.mapped,
-                    validate=validate,
-                )
+        with self.batch():
+            for edge in flow.edges:
+                if edge not in self.edges:
+                    self.add_edge(
+                        upstream_task=edge.upstream_task,
+                        downstream_task=edge.downstream_task,
+                        key=edge.key,
+                        mapped=edge.mapped,
+                        validate=validate,
+                    )
 
     @cache
     def all_upstream_edges(self) -> Dict[Task, Set[Edge]]:
@@ -560,10 +785,7 @@ class Flow:
         Returns:
             - dict with the key as tasks and the value as a set of upstream edges
         """
-        edges = {t: set() for t in self.tasks}  # type: Dict[Task, Set[Edge]]
-        for edge in self.edges:
-            edges[edge.downstream_task].add(edge)
-        return edges
+        return {t: set(self._upstream_edges.get(t, ())) for t in self.tasks}
 
     @cache
     def all_downstream_edges(self) -> Dict[Task, Set[Edge]]:
@@ -574,10 +796,7 @@ class Flow:
         Returns:
             - dict with the key as tasks and the value as a set of downstream edges
         """
-        edges = {t: set() for t in self.tasks}  # type: Dict[Task, Set[Edge]]
-        for edge in self.edges:
-            edges[edge.upstream_task].add(edge)
-        return edges
+        return {t: set(self._downstream_edges.get(t, ())) for t in self.tasks}
 
     def edges_to(self, task: Task) -> Set[Edge]:
         """
@@ -597,7 +816,7 @@ class Flow:
             raise ValueError(
                 "Task {t} was not found in Flow {f}".format(t=task, f=self)
             )
-        return self.all_upstream_edges()[task]
+        return set(self._upstream_edges.get(task, ()))
 
     def edges_from(self, task: Task) -> Set[Edge]:
         """
@@ -617,7 +836,7 @@ class Flow:
             raise ValueError(
                 "Task {t} was not found in Flow {f}".format(t=task, f=self)
             )
-        return self.all_downstream_edges()[task]
+        return set(self._downstream_edges.get(task, ()))
 
     def upstream_tasks(self, task: Task) -> Set[Task]:
         """
@@ -673,6 +892,9 @@ class Flow:
         Get the tasks in this flow in a sorted manner. This allows us to find if any
         cycles exist in this flow's DAG.
 
+        The sort is deterministic: whenever more than one task is ready to be sorted,
+        the task that was added to the flow first is placed first.
+
         Args:
             - root_tasks ([Tasks], optional): an `Iterable` of `Task` objects to
             start the sorting from
@@ -681,14 +903,15 @@ class Flow:
             - tuple of task objects that were sorted
 
         Raises:
-            - ValueError: if a cycle is found in the flow's DAG
+            - ValueError: if a cycle is found in the flow's DAG; the error message
+                includes the tasks that form the cycle
         """
         return self._sorted_tasks(root_tasks=tuple(root_tasks or []))
 
     @cache
     def _sorted_tasks(self, root_tasks: Tuple[Task, ...] = None) -> Tuple[Task, ...]:
         """
-        Computes a topological sort of the flow's tasks.
+        Computes a topological sort of the flow's tasks in O((V + E) log V) time.
 
         Flow.sorted_tasks() can accept non-hashable arguments and therefore can't be
         cached, so this private method is called and cached instead.
@@ -697,50 +920,119 @@ class Flow:
         # begin by getting all tasks under consideration (root tasks and all
         # downstream tasks)
         if root_tasks:
+            for t in root_tasks:
+                if t not in self.tasks:
+                    raise ValueError(
+                        "Task {t} was not found in Flow {f}".format(t=t, f=self)
+                    )
             tasks = set(root_tasks)
-            seen = set()  # type: Set[Task]
-
-            # while the set of tasks is different from the seen tasks...
-            while tasks.difference(seen):
-                # iterate over the new tasks...
-                for t in list(tasks.difference(seen)):
-                    # add its downstream tasks to the task list
-                    tasks.update(self.downstream_tasks(t))
-                    # mark it as seen
-                    seen.add(t)
+            to_visit = list(tasks)
+            while to_visit:
+                for edge in self._downstream_edges.get(to_visit.pop(), ()):
+                    if edge.downstream_task not in tasks:
+                        tasks.add(edge.downstream_task)
+                        to_visit.append(edge.downstream_task)
         else:
             tasks = self.tasks
 
-        # build the list of sorted tasks
-        remaining_tasks = list(tasks)
-        sorted_tasks = []
-        while remaining_tasks:
-            # mark the flow as cyclic unless we prove otherwise
-            cyclic = True
-
-            # iterate over each remaining task
-            for task in remaining_tasks.copy():
-                # check all the upstream tasks of that task
-                for upstream_task in self.upstream_tasks(task):
-                    # if the upstream task is also remaining, it means it
-                    # hasn't been sorted, so we can't sort this task either
-                    if upstream_task in remaining_tasks:
-                        break
-                else:
-                    # but if all upstream tasks have been sorted, we can sort
-                    # this one too. We note that we found no cycle this time.
-                    cyclic = False
-                    remaining_tasks.remove(task)
-                    sorted_tasks.append(task)
+        # rank each task by the order in which it was added to the flow; this is used to
+        # break ties between tasks that are ready at the same time
+        rank = {}  # type: Dict[Task, int]
+        for t in itertools.chain(self._upstream_edges, tasks):
+            if t in tasks:
+                rank.setdefault(t, len(rank))
+
+        # count the number of upstream edges of each task, ignoring any tasks outside of
+        # consideration
+        in_degree = {
+            t: sum(
+                1 for e in self._upstream_edges.get(t, ()) if e.upstream_task in tasks
+            )
+            for t in tasks
+        }
 
-            # if we were unable to match any upstream tasks, we have a cycle
-            if cyclic:
-                raise ValueError("Cycle found; flows must be acyclic!")
+        # repeatedly sort the earliest-added task that has no unsorted upstream tasks
+        ready = [(rank[t], t) for t, degree in in_degree.items() if degree == 0]
+        heapq.heapify(ready)
+        sorted_tasks = []
+        while ready:
+            _, task = heapq.heappop(ready)
+            sorted_tasks.append(task)
+            for edge in self._downstream_edges.get(task, ()):
+                downstream_task = edge.downstream_task
+                if downstream_task in in_degree:
+                    in_degree[downstream_task] -= 1
+                    if in_degree[downstream_task] == 0:
+                        heapq.heappush(ready, (rank[downstream_task], downstream_task))
+
+        # if any tasks could not be sorted, we have a cycle
+        if len(sorted_tasks) < len(tasks):
+            unsorted = {t for t, degree in in_degree.items() if degree > 0}
+            cycle = self._find_cycle(unsorted, rank=rank)
+            raise ValueError(
+                "Cycle found; flows must be acyclic! The following tasks form a "
+                "cycle: {}".format(" -> ".join(repr(t) for t in cycle))
+            )
 
         return tuple(sorted_tasks)
 
+    def _find_cycle(self, tasks: Set[Task], rank: Dict[Task, int]) -> List[Task]:
+        """
+        Given a set of tasks that could not be topologically sorted, finds a cycle among
+        them. Every such task has at least one upstream task in the set, so walking
+        upstream from any of them must eventually revisit a task.
+
+        Args:
+            - tasks (Set[Task]): the tasks that could not be sorted
+            - rank (Dict[Task, int]): the order in which each task was added to the flow,
+                used to make the choice of cycle deterministic
+
+        Returns:
+            - List[Task]: the tasks forming the cycle, in upstream-to-downstream order and
+                beginning and ending with the same task
+        """
+        path = [min(tasks, key=rank.__getitem__)]
+        position = {path[0]: 0}
+        while True:
+            upstream_task = min(
+                (
+                    e.upstream_task
+                    for e in self._upstream_edges.get(path[-1], ())
+                    if e.upstream_task in tasks
+                ),
+                key=rank.__getitem__,
+            )
+            if upstream_task in position:
+                cycle = path[position[upstream_task] :] + [upstream_task]
+                return list(reversed(cycle))
+            position[upstream_task] = len(path)
+            path.append(upstream_task)
+
     # Dependencies ------------------------------------------------------------
 
+    def critical_path_lengths(
+        self, durations: Dict[Task, float] = None
+    ) -> Dict[Task, float]:
+        """
+        Computes the length of the longest path from each task to a terminal task,
+        including both, with each task weighted by its expected duration. The tasks with
+        the longest remaining paths lie on the flow's critical path, and running them
+        first keeps long chains of dependent tasks from waiting behind wide, cheap ones.
+
+        Args:
+            - durations (Dict[Task, float], optional): the expected duration of each
+                task; tasks that aren't included have a duration of 1
+
+        Returns:
+            - Dict[Task, float]: the length of the longest remaining path from each task
+        """
+        durations = durations or {}
+        lengths = {}  # type: Dict[Task, float]
+        for task in reversed(self.sorted_tasks()):
+            downstream = [lengths[t] for t in self.downstream_tasks(task)]
+            lengths[task] = durations.get(task, 1) + max(downstream, default=0)
+        return lengths
+
     def set_dependencies(
         self,
         task: object,
@@ -3,6 +3,7 @@ import copy
 import inspect
 import uuid
 import warnings
+import weakref
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Set, Tuple, Union
 
@@ -43,6 +44,36 @@ def _validate_run_signature(run: Callable) -> None:
         raise ValueError(msg)
 
 
+# signatures of run methods, keyed by their underlying functions so that entries are
+# dropped along with the functions; a task whose `run` is replaced is looked up by its
+# new function
+_SIGNATURES = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
+
+def _get_signature(run: Callable) -> inspect.Signature:
+    """
+    Returns `inspect.signature(run)`, computing it only once for each function. Bound
+    methods share the signature of their underlying function, with the first argument
+    removed, so every copy of a task reuses the same signature.
+
+    Args:
+        - run (Callable): the function or method to inspect
+
+    Returns:
+        - inspect.Signature: the signature of `run`
+    """
+    func = getattr(run, "__func__", run)
+    bound = func is not run
+    try:
+        signatures = _SIGNATURES.setdefault(func, {})
+    except TypeError:
+        # not every callable can be weakly referenced
+        return inspect.signature(run)
+    if bound not in signatures:
+        signatures[bound] = inspect.signature(run)
+    return signatures[bound]
+
+
 class SignatureValidator(type):
     def __new__(cls, name: str, parents: tuple, methods: dict) -> type:
         run = methods.get("run", lambda: None)
@@ -93,11 +124,16 @@ class Task(metaclass=SignatureValidator):
         - name (str, optional): The name of this task
         - slug (str, optional): The slug for this task. Slugs are required and must be unique
             within any flow; if not provided a random UUID will be generated.
-        - tags ([str], optional): A list of tags for this task
+        - tags ([str], optional): A list of tags for this task; tags of the form
+            `"limit:NAME=N"` limit the number of tasks tagged with `NAME` that run at once
+            to `N` (see `prefect.engine.executors`)
         - max_retries (int, optional): The maximum amount of times this task can be retried
         - retry_delay (timedelta, optional): The amount of time to wait until task is retried
         - timeout (int, optional): The amount of time (in seconds) to wait while
-            running this task before a timeout occurs; note that sub-second resolution is not supported
+            running this task before a timeout occurs; note that sub-second resolution is not supported.
+            A task that times out outside the main thread keeps running in the background unless
+            `engine.timeouts.hard` is set in your config (see
+            `prefect.utilities.executors.timeout_handler`)
         - trigger (callable, optional): a function that determines whether the task should run, based
                 on the states of any upstream tasks.
         - skip_on_upstream_skip (bool, optional): if `True`, if any immediately
@@ -130,10 +166,16 @@ class Task(metaclass=SignatureValidator):
             result of the previous handler.
         - on_failure (Callable, optional): A function with signature `fn(task: Task, state: State) -> None`
             with will be called anytime this Task enters a failure state
+        - map_chunk_size (int, optional): when this Task is mapped, the number of
+            children run together, one after the other, by each unit of work submitted to the
+            executor; defaults to the value of `tasks.defaults.map_chunk_size` in your user
+            config
 
     Raises:
         - TypeError: if `tags` is of type `str`
+        - ValueError: if a `"limit:NAME=N"` tag is malformed
         - TypeError: if `timeout` is not of type `int`
+        - ValueError: if `map_chunk_size` is less than 1
     """
 
     # Tasks are not iterable, though they do have a __getitem__ method
@@ -156,6 +198,7 @@ class Task(metaclass=SignatureValidator):
         result_handler: "ResultHandler" = None,
         state_handlers: List[Callable] = None,
         on_failure: Callable = None,
+        map_chunk_size: int = None,
     ):
 
         self.name = name or type(self).__name__
@@ -168,6 +211,7 @@ class Task(metaclass=SignatureValidator):
             raise TypeError("Tags should be a set of tags, not a string.")
         current_tags = set(prefect.context.get("tags", set()))
         self.tags = (set(tags) if tags is not None else set()) | current_tags
+        prefect.utilities.executors.concurrency_limits(self.tags)
 
         max_retries = (
             max_retries
@@ -220,6 +264,13 @@ class Task(metaclass=SignatureValidator):
             else prefect.config.tasks.defaults.checkpoint
         )
         self.result_handler = result_handler
+        self.map_chunk_size = (
+            map_chunk_size
+            if map_chunk_size is not None
+            else prefect.config.tasks.defaults.map_chunk_size
+        )
+        if self.map_chunk_size < 1:
+            raise ValueError("map_chunk_size must be a positive integer.")
 
         if state_handlers and not isinstance(state_handlers, collections.Sequence):
             raise TypeError("state_handlers should be iterable.")
@@ -389,7 +440,7 @@ class Task(metaclass=SignatureValidator):
         """
 
         # this will raise an error if callargs weren't all provided
-        signature = inspect.signature(self.run)
+        signature = _get_signature(self.run)
         callargs = dict(signature.bind(*args, **kwargs).arguments)  # type: Dict
 
         # bind() compresses all variable keyword arguments under the ** argument name,
@@ -561,7 +612,7 @@ class Task(metaclass=SignatureValidator):
             - dict
         """
         inputs = {}
-        for name, parameter in inspect.signature(self.run).parameters.items():
+        for name, parameter in _get_signature(self.run).parameters.items():
             input_type = parameter.annotation
             if input_type is inspect._empty:  # type: ignore
                 input_type = Any
@@ -585,7 +636,7 @@ class Task(metaclass=SignatureValidator):
         Returns:
             - Any
         """
-        return_annotation = inspect.signature(self.run).return_annotation
+        return_annotation = _get_signature(self.run).return_annotation
         if return_annotation is inspect._empty:  # type: ignore
             return_annotation = Any
         return return_annotation
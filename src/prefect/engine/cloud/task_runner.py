@@ -40,6 +40,8 @@ class CloudTaskRunner(TaskRunner):
             if not provided here or by the Task, will default to the one specified in your config
     """
 
+    waits_for_retries = True
+
     def __init__(
         self,
         task: Task,
@@ -58,6 +60,26 @@ class CloudTaskRunner(TaskRunner):
         except:
             warnings.warn("Heartbeat failed for Task '{}'".format(self.task.name))
 
+    @classmethod
+    def _heartbeat_many(cls, runners: List["CloudTaskRunner"]) -> None:  # type: ignore
+        """
+        Heartbeats the task runs of several runners with a single request.
+
+        Args:
+            - runners (List[CloudTaskRunner]): the runners to heartbeat
+        """
+        task_run_ids = [
+            r.task_run_id for r in runners if getattr(r, "task_run_id", None)
+        ]
+        if not task_run_ids:
+            return
+        try:
+            runners[0].client.update_task_run_heartbeats(task_run_ids)  # type: ignore
+        except:
+            warnings.warn(
+                "Heartbeat failed for {} task run(s)".format(len(task_run_ids))
+            )
+
     def call_runner_target_handlers(self, old_state: State, new_state: State) -> State:
         """
         A special state handler that the TaskRunner uses to call its task's state handlers.
@@ -224,7 +246,10 @@ class CloudTaskRunner(TaskRunner):
         The main endpoint for TaskRunners.  Calling this method will conditionally execute
         `self.task.run` with any provided inputs, assuming the upstream dependencies are in a
         state which allow this Task to run.  Additionally, this method will wait and perform Task retries
-        which are scheduled for <= 1 minute in the future.
+        which are scheduled for <= 1 minute in the future, sleeping with the executor's
+        `sleep` (which may release the executor slot that the run holds), unless the
+        `resubmit_retries` context key is set: the flow runner then resubmits the task
+        when its retry is due, and the `Retrying` state is returned straight away.
 
         Args:
             - state (State, optional): initial `State` to begin task run from;
@@ -240,33 +265,44 @@ class CloudTaskRunner(TaskRunner):
             - `State` object representing the final post-run state of the Task
         """
         context = context or {}
-        end_state = super().run(
-            state=state,
-            upstream_states=upstream_states,
-            context=context,
-            executor=executor,
-        )
-        if end_state.is_retrying() and (
-            end_state.start_time <= pendulum.now("utc").add(minutes=1)  # type: ignore
-        ):
+        resubmit_retries = context.get("resubmit_retries", False)
+
+        # the context of a resubmitted retry still holds the task run version the first
+        # run started with
+        if resubmit_retries and state is not None and state.is_retrying():
+            self._update_task_run_version(context)
+
+        while True:
+            end_state = super().run(
+                state=state,
+                upstream_states=upstream_states,
+                context=context,
+                executor=executor,
+            )
+            if resubmit_retries or not (
+                end_state.is_retrying()
+                and end_state.start_time  # type: ignore
+                <= pendulum.now("utc").add(minutes=1)
+            ):
+                return end_state
+
             assert isinstance(end_state, Retrying)
             naptime = max(
                 (end_state.start_time - pendulum.now("utc")).total_seconds(), 0
             )
-            time.sleep(naptime)
+            if executor is not None:
+                executor.sleep(naptime)
+            else:
+                time.sleep(naptime)
 
             # currently required as context has reset to its original state
-            task_run_info = self.client.get_task_run_info(
-                flow_run_id=context.get("flow_run_id", ""),
-                task_id=context.get("task_id", ""),
-                map_index=context.get("map_index"),
-            )
-            context.update(task_run_version=task_run_info.version)  # type: ignore
-            return self.run(
-                state=end_state,
-                upstream_states=upstream_states,
-                context=context,
-                executor=executor,
-            )
-        else:
-            return end_state
+            self._update_task_run_version(context)
+            state = end_state
+
+    def _update_task_run_version(self, context: Dict[str, Any]) -> None:
+        task_run_info = self.client.get_task_run_info(
+            flow_run_id=context.get("flow_run_id", ""),
+            task_id=context.get("task_id", ""),
+            map_index=context.get("map_index"),
+        )
+        context.update(task_run_version=task_run_info.version)  # type: ignore
@@ -19,14 +19,30 @@ Currently, the available executor options are:
     Note that the `LocalExecutor` is not capable of parallelism.  Currently the default executor.
 - `LocalDaskExecutor`: an executor that runs on `dask` primitives with a
     configurable dask scheduler.
+- `AsyncioExecutor`: an executor that runs tasks on a single `asyncio` event loop,
+    awaiting tasks whose `run` method is a coroutine function; suited to flows with
+    many I/O-bound tasks.
+- `ThreadPoolExecutor`: an executor that runs tasks on a pool of threads, without
+    the overhead of a `dask` scheduler.
+- `ProcessPoolExecutor`: an executor that runs the `run` methods of tasks on a pool
+    of processes, for CPU-bound tasks, and everything else on a pool of threads.
 - `DaskExecutor`: the most feature-rich of the executors, this executor runs
     on `dask.distributed` and has support for multiprocessing, multithreading, and distributed execution.
 
 Which executor you choose depends on whether you intend to use things like parallelism
 of task execution.
+
+Tasks can be given concurrency limits with tags of the form `"limit:NAME=N"`: at most `N`
+tasks tagged with the limit `NAME` run at once, and each child of a mapped task counts
+separately. Tasks that share a limit name should declare the same `N`. The
+`DaskExecutor` enforces limits across its whole cluster; the other executors enforce
+them within the flow runner's process (so the `LocalDaskExecutor` with the "processes"
+scheduler only enforces them within each process).
 """
 import prefect
 from prefect.engine.executors.base import Executor
+from prefect.engine.executors.asyncio import AsyncioExecutor
 from prefect.engine.executors.dask import DaskExecutor, LocalDaskExecutor
 from prefect.engine.executors.local import LocalExecutor
+from prefect.engine.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor
 from prefect.engine.executors.sync import SynchronousExecutor
@@ -0,0 +1,326 @@
+import asyncio
+import collections
+import inspect
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+import prefect
+from prefect.engine.executors.base import Executor
+from prefect.utilities.executors import running_loop
+
+# `asyncio.all_tasks` was added in Python 3.7
+_all_tasks = getattr(asyncio, "all_tasks", None) or asyncio.Task.all_tasks
+
+
+# futures are resolved when passed directly or in a list, tuple or dictionary (such as
+# the dictionary of upstream states passed to runners), but not at any deeper level; for
+# submitted functions, this applies to each argument
+def _futures(obj: Any) -> List[asyncio.Future]:
+    if isinstance(obj, asyncio.Future):
+        return [obj]
+    elif type(obj) in (list, tuple):
+        return [o for o in obj if isinstance(o, asyncio.Future)]
+    elif type(obj) is dict:
+        return [o for o in obj.values() if isinstance(o, asyncio.Future)]
+    return []
+
+
+def _results(obj: Any) -> Any:
+    if isinstance(obj, asyncio.Future):
+        return obj.result()
+    elif not _futures(obj):
+        return obj
+    elif isinstance(obj, dict):
+        return {
+            k: _results(o) if isinstance(o, asyncio.Future) else o
+            for k, o in obj.items()
+        }
+    return type(obj)(_results(o) if isinstance(o, asyncio.Future) else o for o in obj)
+
+
+class AsyncioExecutor(Executor):
+    """
+    An executor that runs all functions on a single `asyncio` event loop in the main
+    thread. Tasks whose `run` method is a coroutine function (`async def run`) are
+    awaited on the loop, so many I/O-bound tasks can be in flight at once without a
+    thread for each of them; tasks with a regular `run` method block the loop while
+    they run.
+
+    Submitted functions start running once `wait` or `wait_any` is called, which run the
+    loop until the requested futures are done. The children of mapped tasks run as
+    concurrent coroutines, and are never chunked (see `Task.map_chunk_size`).
+
+    Note that concurrent tasks only have isolated Prefect contexts on Python 3.7+,
+    which provides `contextvars`.
+
+    Args:
+        - map_concurrency (int, optional): the maximum number of children of a mapped
+            task that run at once; defaults to the value of
+            `engine.executor.asyncio.map_concurrency` in your config, where 0 means no
+            limit
+    """
+
+    awaits_coroutines = True
+
+    def __init__(self, map_concurrency: int = None):
+        if map_concurrency is None:
+            map_concurrency = prefect.config.engine.executor.asyncio.map_concurrency
+        self.map_concurrency = map_concurrency
+        self._loop = None  # type: Optional[asyncio.AbstractEventLoop]
+        self._slots_in_use = collections.Counter()  # type: collections.Counter
+        self._slot_waiters = (
+            collections.deque()
+        )  # type: Deque[Tuple[Dict[str, int], asyncio.Future]]
+        super().__init__()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update(
+            _loop=None,
+            _slots_in_use=collections.Counter(),
+            _slot_waiters=collections.deque(),
+        )
+        return state
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        The event loop that functions are run on, created when first needed.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def _in_loop(self) -> bool:
+        return self._loop is not None and running_loop() is self._loop
+
+    @contextmanager
+    def start(self) -> Iterator[None]:
+        """
+        Context manager for initializing execution.
+
+        Creates the event loop and closes it on exit, cancelling anything still pending
+        on it.
+        """
+        loop = self.loop
+        try:
+            yield
+        finally:
+            pending = [t for t in _all_tasks(loop) if not t.done()]
+            for t in pending:
+                t.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+            loop.close()
+            self._loop = None
+            self._slots_in_use.clear()
+            self._slot_waiters.clear()
+
+    async def _resolve(self, obj: Any) -> Any:
+        for future in _futures(obj):
+            await future
+        return _results(obj)
+
+    async def _run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        resolved_args = []
+        for arg in args:
+            resolved_args.append(await self._resolve(arg))
+        resolved_kwargs = {}
+        for key, arg in kwargs.items():
+            resolved_kwargs[key] = await self._resolve(arg)
+        result = fn(*resolved_args, **resolved_kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def _slots_free(self, limits: Dict[str, int]) -> bool:
+        return all(self._slots_in_use[name] < n for name, n in limits.items())
+
+    def _release_slots(self, limits: Dict[str, int]) -> None:
+        self._slots_in_use.subtract(limits.keys())
+        # hand the freed slots to waiting tasks, in the order they started waiting
+        for waiter in list(self._slot_waiters):
+            waiter_limits, future = waiter
+            if future.done():
+                self._slot_waiters.remove(waiter)
+            elif self._slots_free(waiter_limits):
+                self._slots_in_use.update(waiter_limits.keys())
+                self._slot_waiters.remove(waiter)
+                future.set_result(None)
+
+    @contextmanager
+    def _holding_slots(self, limits: Dict[str, int]) -> Iterator[None]:
+        try:
+            yield
+        finally:
+            self._release_slots(limits)
+
+    async def acquire_concurrency_slots(self, limits: Dict[str, int]) -> Any:
+        """
+        Waits, without blocking the loop, until a slot is free under each of the
+        provided concurrency limits (declared by task tags of the form
+        `"limit:NAME=N"`), and takes them. Used by `TaskRunner.run_async` in place of
+        `concurrency_slots`.
+
+        Args:
+            - limits (Dict[str, int]): the maximum number of tasks that may hold a slot
+                at once, for each limit name
+
+        Returns:
+            - a context manager that releases the slots on exit
+        """
+        if self._slots_free(limits):
+            self._slots_in_use.update(limits.keys())
+        else:
+            future = self.loop.create_future()
+            self._slot_waiters.append((limits, future))
+            try:
+                await future
+            except asyncio.CancelledError:
+                # the slots may have been handed over just before the cancellation
+                if future.done() and not future.cancelled():
+                    self._release_slots(limits)
+                raise
+        return self._holding_slots(limits)
+
+    @contextmanager
+    def concurrency_slots(self, limits: Dict[str, int]) -> Iterator[None]:
+        """
+        Context manager that holds a slot under each of the provided concurrency limits
+        while a task runs synchronously. Slots are taken from the same counts as
+        `acquire_concurrency_slots`, so that synchronous and coroutine tasks share
+        their limits. Outside of the loop, this runs the loop until the slots are free.
+
+        Args:
+            - limits (Dict[str, int]): the maximum number of tasks that may hold a slot
+                at once, for each limit name
+
+        Raises:
+            - RuntimeError: if called while the loop is running and a slot isn't free,
+                since waiting would block the loop
+        """
+        if self._slots_free(limits):
+            self._slots_in_use.update(limits.keys())
+            slots = self._holding_slots(limits)
+        elif self._in_loop() or self.loop.is_running():
+            raise RuntimeError(
+                "A synchronous task can't wait for a concurrency slot on a running "
+                "event loop."
+            )
+        else:
+            slots = self.loop.run_until_complete(self.acquire_concurrency_slots(limits))
+        with slots:
+            yield
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Submit a function to the executor for execution. Returns an `asyncio.Task`.
+
+        When called from a coroutine running on the loop (for example, by a task runner
+        spawning the children of a mapped task), regular functions are instead run
+        immediately and their result is returned, since the caller can't block on the
+        loop it is running on.
+
+        Args:
+            - fn (Callable): function that is being submitted for execution; may be a
+                coroutine function
+            - *args (Any): arguments to be passed to `fn`; any futures are resolved
+                before `fn` is called
+            - **kwargs (Any): keyword arguments to be passed to `fn`; any futures are
+                resolved before `fn` is called
+
+        Returns:
+            - Any: an `asyncio.Task` that represents the computation of
+                `fn(*args, **kwargs)`
+        """
+        if self._in_loop() and not inspect.iscoroutinefunction(fn):
+            return fn(
+                *[self.wait(a) for a in args],
+                **{k: self.wait(a) for k, a in kwargs.items()}
+            )
+        return self.loop.create_task(self._run(fn, *args, **kwargs))
+
+    def map(self, fn: Callable, *args: Any) -> List[Any]:
+        """
+        Submit a function to be mapped over its iterable arguments. If `fn` is a
+        coroutine function, at most `map_concurrency` calls run at once.
+
+        Args:
+            - fn (Callable): function that is being submitted for execution
+            - *args (Any): arguments that the function will be mapped over
+
+        Returns:
+            - List[Any]: the result of submitting the function for each set of
+                arguments
+        """
+        if not self.map_concurrency or not inspect.iscoroutinefunction(fn):
+            return [self.submit(fn, *args_i) for args_i in zip(*args)]
+
+        # the semaphore is created on the loop, by the first call to run
+        semaphores = []  # type: List[asyncio.Semaphore]
+
+        async def limited(*args_i: Any) -> Any:
+            if not semaphores:
+                semaphores.append(asyncio.Semaphore(self.map_concurrency))
+            async with semaphores[0]:
+                return await fn(*args_i)
+
+        return [self.submit(limited, *args_i) for args_i in zip(*args)]
+
+    def wait(self, futures: Any) -> Any:
+        """
+        Resolves futures to their values, running the event loop until they are done.
+        Futures are resolved when passed directly or in a list, tuple or dictionary.
+
+        When called from a coroutine running on the loop, the futures must already be
+        done.
+
+        Args:
+            - futures (Any): futures to resolve
+
+        Returns:
+            - Any: `futures`, with each future replaced by its result
+
+        Raises:
+            - RuntimeError: if called from the loop with futures that aren't done
+        """
+        if self._in_loop():
+            if not all(f.done() for f in _futures(futures)):
+                raise RuntimeError(
+                    "Futures must be done to be waited on from the event loop."
+                )
+            return _results(futures)
+        return self.loop.run_until_complete(self._resolve(futures))
+
+    def wait_any(self, futures: Dict[Any, Any], timeout: float = None) -> Set[Any]:
+        """
+        Runs the event loop until at least one of the provided futures is complete, or
+        until `timeout` seconds have passed.
+
+        Args:
+            - futures (Dict[Any, Any]): a dictionary of futures, keyed by arbitrary
+                hashable keys
+            - timeout (float, optional): the maximum number of seconds to wait for;
+                defaults to no limit
+
+        Returns:
+            - Set[Any]: the keys of the futures that are complete
+        """
+        pending = [
+            f
+            for f in futures.values()
+            if isinstance(f, asyncio.Future) and not f.done()
+        ]
+        if pending and len(pending) == len(futures):
+            self.loop.run_until_complete(
+                asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+            )
+        return {
+            key
+            for key, f in futures.items()
+            if not isinstance(f, asyncio.Future) or f.done()
+        }
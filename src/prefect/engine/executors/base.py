@@ -1,10 +1,11 @@
 import datetime
+import time
 import uuid
 from contextlib import contextmanager
-from typing import Any, Callable, Dict, Iterator, List
+from typing import Any, Callable, Dict, Iterator, List, Set
 
 import prefect
-from prefect.utilities.executors import timeout_handler
+from prefect.utilities.executors import concurrency_slots, timeout_handler
 
 
 class Executor:
@@ -14,6 +15,15 @@ class Executor:
 
     timeout_handler = staticmethod(timeout_handler)
 
+    # whether functions submitted by the runners may be coroutine functions, which the
+    # executor awaits on its event loop (see `AsyncioExecutor`)
+    awaits_coroutines = False
+
+    # whether submitted functions only run once `wait` is called (see
+    # `LocalDaskExecutor`), in which case the executor can't tell when individual
+    # futures are complete
+    computes_lazily = False
+
     def __init__(self) -> None:
         self.executor_id = type(self).__name__ + ": " + str(uuid.uuid4())
 
@@ -30,6 +40,23 @@ class Executor:
         """
         yield
 
+    @contextmanager
+    def concurrency_slots(self, limits: Dict[str, int]) -> Iterator[None]:
+        """
+        Context manager that holds a slot under each of the provided concurrency limits,
+        declared by task tags of the form `"limit:NAME=N"`, while a task runs. Blocks
+        until a slot is free under every limit.
+
+        By default, slots are shared by all threads of the current process (see
+        `prefect.utilities.executors.concurrency_slots`).
+
+        Args:
+            - limits (Dict[str, int]): the maximum number of tasks that may hold a slot
+                at once, for each limit name
+        """
+        with concurrency_slots(limits):
+            yield
+
     def map(self, fn: Callable, *args: Any) -> List[Any]:
         """
         Submit a function to be mapped over its iterable arguments.
@@ -69,3 +96,69 @@ class Executor:
             - Any: an iterable of resolved futures
         """
         raise NotImplementedError()
+
+    def broadcast(self, obj: Any) -> Any:
+        """
+        Makes an object (such as the flow runner that submits tasks) available to the
+        functions submitted to this executor, without serializing it with every
+        submission. Returns a reference that can be passed to `submit` or `map` in place
+        of the object; by default, this is the object itself.
+
+        Args:
+            - obj (Any): the object to share
+
+        Returns:
+            - Any: a reference to pass in place of `obj`
+        """
+        return obj
+
+    def wait_for_states(self, futures: Any) -> Any:
+        """
+        Resolves futures of task states to the states, blocking until they are done.
+        Executors that keep task results where they were computed (see `DaskExecutor`)
+        may return states whose results are only retrieved when accessed; by default,
+        this is the same as `wait`.
+
+        Args:
+            - futures (Any): futures of task states, passed directly or in a list, tuple
+                or dictionary
+
+        Returns:
+            - Any: the states, in the same shape as `futures`
+        """
+        return self.wait(futures)
+
+    def wait_any(self, futures: Dict[Any, Any], timeout: float = None) -> Set[Any]:
+        """
+        Blocks until at least one of the provided futures is complete, or until
+        `timeout` seconds have passed. Used by the `FlowRunner` to submit tasks as their
+        upstream tasks finish.
+
+        Executors whose `submit` computes results immediately can rely on this default
+        implementation, which treats every future as complete. Executors that only
+        compute results when `wait` is called set `computes_lazily`, and can't be used
+        for submitting tasks as their upstream tasks finish.
+
+        Args:
+            - futures (Dict[Any, Any]): a dictionary of future-like objects, keyed by
+                arbitrary hashable keys
+            - timeout (float, optional): the maximum number of seconds to wait for;
+                defaults to no limit
+
+        Returns:
+            - Set[Any]: the keys of the futures that are complete, which may be empty
+                if the timeout passed
+        """
+        return set(futures)
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Blocks the calling function for the provided number of seconds. Called from
+        functions submitted to this executor (such as a `CloudTaskRunner` waiting for a
+        retry); executors that run functions in a limited number of slots can release
+        the caller's slot while it sleeps. By default, this is `time.sleep`.
+
+        Args:
+            - seconds (float): the number of seconds to sleep for
+        """
+        time.sleep(seconds)
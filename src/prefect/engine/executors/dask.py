@@ -1,16 +1,116 @@
+import collections.abc
+import copy
 import dask
 import datetime
 import logging
 import queue
+import time
 import uuid
 import warnings
 from contextlib import contextmanager
-from typing import Any, Callable, Iterable, Iterator, List
-
-from distributed import Client, Future, fire_and_forget, worker_client
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import cloudpickle
+from distributed import (
+    Client,
+    Future,
+    fire_and_forget,
+    rejoin,
+    secede,
+    wait,
+    worker_client,
+)
+from distributed import TimeoutError as DaskTimeoutError
 
 from prefect import context
 from prefect.engine.executors.base import Executor
+from prefect.engine.result import NoResult, Result
+from prefect.engine.result_handlers import ResultHandler
+from prefect.engine.state import State
+
+try:
+    from distributed import Semaphore
+except ImportError:  # distributed < 2.16
+    Semaphore = None
+
+_NOT_GATHERED = object()
+
+
+class FutureResult(Result):
+    """
+    A handle to the result of a task run that was left on the Dask worker that computed
+    it (see `DaskExecutor`); its value is only gathered when it's first accessed. When
+    pickled, only the handle is kept.
+
+    Args:
+        - future (Future): the future of the task run's state
+        - result_handler (ResultHandler, optional): the result handler to use when
+            storing / serializing this result's value
+    """
+
+    __slots__ = ("future", "_value")
+
+    def __init__(self, future: Future, result_handler: ResultHandler = None):
+        self.future = future
+        super().__init__(value=_NOT_GATHERED, result_handler=result_handler)
+
+    def __reduce__(self) -> tuple:
+        return (_rebuild_future_result, (self.future, self.result_handler))
+
+    def __repr__(self) -> str:
+        if self.is_gathered:
+            return super().__repr__()
+        return "<FutureResult: not gathered>"
+
+    @property  # type: ignore
+    def value(self) -> Any:  # type: ignore
+        if not self.is_gathered:
+            self._value = self.future.result().result
+        return self._value
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        self._value = value
+
+    @property
+    def is_gathered(self) -> bool:
+        """
+        Whether the value has been gathered from the worker.
+        """
+        return self._value is not _NOT_GATHERED
+
+
+def _rebuild_future_result(
+    future: Future, result_handler: Optional[ResultHandler]
+) -> FutureResult:
+    return FutureResult(future, result_handler=result_handler)
+
+
+def _detach_result(state: Any) -> Tuple[Any, Optional[Result]]:
+    # runs next to a task run's state, and returns a copy of it without the value of its
+    # result (which stays on the worker), along with the rest of the result
+    result = getattr(state, "_result", None)
+    if not isinstance(state, State) or type(result) is not Result:
+        return state, None
+    state = copy.copy(state)
+    state._result = NoResult
+    stub = Result(value=None, result_handler=result.result_handler)
+    stub.safe_value = result.safe_value
+    return state, stub
+
+
+def _gather_future_results(client: Client, states: Iterable[Any]) -> None:
+    # gathers the values of any `FutureResult`s of the states at once
+    results = [
+        s._result
+        for s in states
+        if isinstance(s, State)
+        and isinstance(s._result, FutureResult)
+        and not s._result.is_gathered
+    ]
+    full_states = client.gather([r.future for r in results])
+    for result, full_state in zip(results, full_states):
+        result.value = full_state.result
 
 
 class DaskExecutor(Executor):
@@ -24,6 +124,21 @@ class DaskExecutor(Executor):
     and passed as [Worker Resources](https://distributed.dask.org/en/latest/resources.html) of the form
     `{"KEY": float(NUM)}` to the Dask Scheduler.
 
+    Tasks are submitted with their priority (see `FlowRunner.task_priorities`), if any,
+    as their dask `priority`.
+
+    Concurrency limits declared by tags of the form `"limit:NAME=N"` are enforced across
+    the whole cluster with `distributed.Semaphore`s (which require `distributed >= 2.16`;
+    with older versions, limits are only enforced within each worker process).
+
+    With `keep_results_on_workers`, task results stay on the workers that computed them:
+    the children of mapped tasks are passed to downstream tasks as futures, so that
+    reducers gather their inputs straight from other workers, and the final states
+    returned by `wait_for_states` (such as those of a flow run) hold a `FutureResult`
+    handle in place of each result, which is only gathered when accessed. Handles can't
+    be gathered once the executor's client is closed, so those that haven't been are
+    gathered together when `start` exits.
+
     Args:
         - address (string, optional): address of a currently running dask
             scheduler; if one is not provided, a `distributed.LocalCluster()` will be created in `executor.start()`.
@@ -33,6 +148,9 @@ class DaskExecutor(Executor):
             Defaults to `False`.
         - debug (bool, optional): whether to operate in debug mode; `debug=True`
             will produce many additional dask logs. Defaults to the `debug` value in your Prefect configuration
+        - keep_results_on_workers (bool, optional): whether task results stay on the
+            workers that computed them; defaults to the value of
+            `engine.executor.dask.keep_results_on_workers` in your config
         - **kwargs (dict, optional): additional kwargs to be passed to the
             `dask.distributed.Client` upon initialization (e.g., `n_workers`)
     """
@@ -42,6 +160,7 @@ class DaskExecutor(Executor):
         address: str = None,
         local_processes: bool = None,
         debug: bool = None,
+        keep_results_on_workers: bool = None,
         **kwargs: Any
     ):
         if address is None:
@@ -52,9 +171,17 @@ class DaskExecutor(Executor):
             local_processes = context.config.engine.executor.dask.local_processes
         if debug is None:
             debug = context.config.debug
+        if keep_results_on_workers is None:
+            keep_results_on_workers = (
+                context.config.engine.executor.dask.keep_results_on_workers
+            )
         self.address = address
         self.local_processes = local_processes
         self.debug = debug
+        self.keep_results_on_workers = keep_results_on_workers
+        self._broadcasts = {}  # type: Dict[int, Tuple[Any, Future]]
+        self._semaphores = {}  # type: Dict[str, Semaphore]
+        self._handles = []  # type: List[State]
         self.is_started = False
         self.kwargs = kwargs
         super().__init__()
@@ -76,9 +203,13 @@ class DaskExecutor(Executor):
                 self.client = client
                 self.is_started = True
                 yield self.client
+                _gather_future_results(client, self._handles)
         finally:
+            self._handles.clear()
             self.client = None
             self.is_started = False
+            self._broadcasts.clear()
+            self._semaphores.clear()
 
     def _prep_dask_kwargs(self) -> dict:
         dask_kwargs = {"pure": False}  # type: dict
@@ -88,6 +219,10 @@ class DaskExecutor(Executor):
             key = context.get("task_full_name", "") + "-" + str(uuid.uuid4())
             dask_kwargs.update(key=key)
 
+        ## pass on the task's priority (see `FlowRunner.task_priorities`)
+        if context.get("task_priority"):
+            dask_kwargs.update(priority=context.get("task_priority"))
+
         ## infer from context if dask resources are being utilized
         dask_resource_tags = [
             tag
@@ -107,11 +242,80 @@ class DaskExecutor(Executor):
         state = self.__dict__.copy()
         if "client" in state:
             del state["client"]
+        state["_broadcasts"] = {}
+        state["_semaphores"] = {}
+        state["_handles"] = []
         return state
 
     def __setstate__(self, state: dict) -> None:
         self.__dict__.update(state)
 
+    @contextmanager
+    def concurrency_slots(self, limits: Dict[str, int]) -> Iterator[None]:
+        """
+        Context manager that holds a slot under each of the provided concurrency limits,
+        declared by task tags of the form `"limit:NAME=N"`, while a task runs. Blocks
+        until a slot is free under every limit.
+
+        Slots are leases on a `distributed.Semaphore` for each limit name, shared by
+        every worker of the cluster; they are acquired in order of name, so tasks with
+        several limits can't deadlock. Each semaphore is created once per executor, and
+        while a task waits for a slot it secedes from its worker's thread pool (see
+        `sleep`).
+
+        Args:
+            - limits (Dict[str, int]): the maximum number of tasks that may hold a slot
+                at once, for each limit name
+        """
+        if not limits or Semaphore is None:
+            if limits:
+                warnings.warn(
+                    "Concurrency limits require distributed >= 2.16 to be enforced "
+                    "across workers; they will only be enforced within each worker."
+                )
+            with super().concurrency_slots(limits):
+                yield
+            return
+
+        held = []  # type: List[Semaphore]
+        try:
+            with self._seceded():
+                for name in sorted(limits):
+                    if name not in self._semaphores:
+                        self._semaphores[name] = Semaphore(
+                            max_leases=limits[name], name="prefect-limit:" + name
+                        )
+                    semaphore = self._semaphores[name]
+                    semaphore.acquire()
+                    held.append(semaphore)
+            yield
+        finally:
+            for semaphore in reversed(held):
+                semaphore.release()
+
+    def broadcast(self, obj: Any) -> Future:
+        """
+        Makes an object (such as the flow runner that submits tasks) available to the
+        functions submitted to this executor, without serializing it with every
+        submission: the object is scattered to every worker once per call to `start`,
+        and the returned future can be passed to `submit` or `map` in its place.
+
+        Args:
+            - obj (Any): the object to share
+
+        Returns:
+            - Future: a future of the object
+        """
+        if id(obj) not in self._broadcasts:
+            # workers in this process receive the object itself, so it is serialized
+            # here to raise the same errors as submitting it to other processes would
+            cloudpickle.dumps(obj)
+            with self._get_client() as client:
+                future = client.scatter(obj, broadcast=True, hash=False)
+            # the object is kept alongside its future, so that its id isn't reused
+            self._broadcasts[id(obj)] = (obj, future)
+        return self._broadcasts[id(obj)][1]
+
     def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
         """
         Submit a function to the executor for execution. Returns a Future object.
@@ -159,35 +363,172 @@ class DaskExecutor(Executor):
         dask_kwargs = self._prep_dask_kwargs()
         kwargs.update(dask_kwargs)
 
+        def client_map(client: Client) -> List[Future]:
+            # Dask only maps over sized iterables, so the items of other iterables (such
+            # as the lazily generated children of mapped tasks) are submitted one by one
+            if all(isinstance(a, collections.abc.Sized) for a in args):
+                return client.map(fn, *args, **kwargs)
+            key = kwargs.pop("key", None)
+            return [
+                client.submit(
+                    fn,
+                    *args_i,
+                    key=None if key is None else "{}-{}".format(key, i),
+                    **kwargs
+                )
+                for i, args_i in enumerate(zip(*args))
+            ]
+
         if self.is_started and hasattr(self, "client"):
-            futures = self.client.map(fn, *args, **kwargs)
+            futures = client_map(self.client)
         elif self.is_started:
             with worker_client(separate_thread=True) as client:
-                futures = client.map(fn, *args, **kwargs)
-                return client.gather(futures)
+                futures = client_map(client)
+                if not self.keep_results_on_workers:
+                    return client.gather(futures)
         else:
             raise ValueError("This executor has not been started.")
 
         fire_and_forget(futures)
         return futures
 
+    @contextmanager
+    def _get_client(self) -> Iterator[Client]:
+        if self.is_started and hasattr(self, "client"):
+            yield self.client
+        elif self.is_started:
+            with worker_client(separate_thread=True) as client:
+                yield client
+        else:
+            raise ValueError("This executor has not been started.")
+
     def wait(self, futures: Any) -> Any:
         """
         Resolves the Future objects to their values. Blocks until the computation is complete.
 
+        With `keep_results_on_workers`, the values of any `FutureResult`s of the resolved
+        states are gathered too, all at once.
+
         Args:
             - futures (Any): single or iterable of future-like objects to compute
 
         Returns:
             - Any: an iterable of resolved futures with similar shape to the input
         """
-        if self.is_started and hasattr(self, "client"):
-            return self.client.gather(futures)
-        elif self.is_started:
-            with worker_client(separate_thread=True) as client:
-                return client.gather(futures)
+        with self._get_client() as client:
+            resolved = client.gather(futures)
+            if self.keep_results_on_workers:
+                if isinstance(resolved, dict):
+                    _gather_future_results(client, resolved.values())
+                elif isinstance(resolved, (list, tuple)):
+                    _gather_future_results(client, resolved)
+                else:
+                    _gather_future_results(client, [resolved])
+            return resolved
+
+    def wait_for_states(self, futures: Any) -> Any:
+        """
+        Resolves futures of task states to the states, blocking until they are done.
+
+        With `keep_results_on_workers`, the value of each state's result is left on the
+        worker that computed it: the states are copied without their values next to
+        their data, and each copy's result is replaced by a `FutureResult` handle, which
+        gathers the value when it's first accessed.
+
+        Args:
+            - futures (Any): futures of task states, passed directly or in a list, tuple
+                or dictionary
+
+        Returns:
+            - Any: the states, in the same shape as `futures`
+        """
+        if not self.keep_results_on_workers:
+            return self.wait(futures)
+
+        if isinstance(futures, dict):
+            items = list(futures.values())
+        elif isinstance(futures, (list, tuple)):
+            items = list(futures)
         else:
+            items = [futures]
+
+        with self._get_client() as client:
+            remote = [f for f in items if isinstance(f, Future)]
+            detached = iter(
+                client.gather(client.map(_detach_result, remote, pure=False))
+            )
+            states = []
+            for item in items:
+                if not isinstance(item, Future):
+                    states.append(item)
+                    continue
+                state, stub = next(detached)
+                if stub is not None:
+                    result = FutureResult(item, result_handler=stub.result_handler)
+                    result.safe_value = stub.safe_value
+                    state._result = result
+                    if hasattr(self, "client"):
+                        self._handles.append(state)
+                states.append(state)
+
+        if isinstance(futures, dict):
+            return dict(zip(futures, states))
+        elif isinstance(futures, (list, tuple)):
+            return type(futures)(states)
+        return states[0]
+
+    def wait_any(self, futures: Dict[Any, Future], timeout: float = None) -> Set[Any]:
+        """
+        Blocks until at least one of the provided Future objects is complete, or until
+        `timeout` seconds have passed.
+
+        Args:
+            - futures (Dict[Any, Future]): a dictionary of Future objects, keyed by
+                arbitrary hashable keys
+            - timeout (float, optional): the maximum number of seconds to wait for;
+                defaults to no limit
+
+        Returns:
+            - Set[Any]: the keys of the futures that are complete
+        """
+        if not self.is_started:
             raise ValueError("This executor has not been started.")
+        try:
+            wait(list(futures.values()), timeout=timeout, return_when="FIRST_COMPLETED")
+        except DaskTimeoutError:
+            pass
+        return {key for key, future in futures.items() if future.done()}
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Blocks the calling function for the provided number of seconds. When called
+        from a task running on a worker, the task secedes from the worker's thread pool
+        while it sleeps, so that the worker can run other tasks in its place.
+
+        Args:
+            - seconds (float): the number of seconds to sleep for
+        """
+        with self._seceded():
+            time.sleep(seconds)
+
+    @contextmanager
+    def _seceded(self) -> Iterator[None]:
+        """
+        Context manager that secedes the calling task from its worker's thread pool while
+        it is entered, and rejoins it afterwards; does nothing when not called from a task
+        running on a worker.
+        """
+        try:
+            secede()
+            seceded = True
+        except Exception:
+            # not running in a task on a worker
+            seceded = False
+        try:
+            yield
+        finally:
+            if seceded:
+                rejoin()
 
 
 class LocalDaskExecutor(Executor):
@@ -200,6 +541,8 @@ class LocalDaskExecutor(Executor):
         - **kwargs (Any): Additional keyword arguments to pass to dask config
     """
 
+    computes_lazily = True
+
     def __init__(self, scheduler: str = "synchronous", **kwargs: Any):
         self.scheduler = scheduler
         self.kwargs = kwargs
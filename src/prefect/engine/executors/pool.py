@@ -0,0 +1,329 @@
+import concurrent.futures
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+import cloudpickle
+
+import prefect
+from prefect.engine.executors.base import Executor
+from prefect.utilities.executors import _process_timeout, timeout_handler
+
+
+# futures are resolved when passed directly or in a list, tuple or dictionary (such as
+# the dictionary of upstream states passed to runners), but not at any deeper level; for
+# submitted functions, this applies to each argument
+def _futures(obj: Any) -> List[Future]:
+    if isinstance(obj, Future):
+        return [obj]
+    elif type(obj) in (list, tuple):
+        return [o for o in obj if isinstance(o, Future)]
+    elif type(obj) is dict:
+        return [o for o in obj.values() if isinstance(o, Future)]
+    return []
+
+
+def _results(obj: Any) -> Any:
+    if isinstance(obj, Future):
+        return obj.result()
+    elif not _futures(obj):
+        return obj
+    elif isinstance(obj, dict):
+        return {k: _results(o) if isinstance(o, Future) else o for k, o in obj.items()}
+    return type(obj)(_results(o) if isinstance(o, Future) else o for o in obj)
+
+
+class _Work:
+    """
+    A function submitted to a `ThreadPoolExecutor`, which is handed to the pool once
+    the futures in its arguments are done.
+    """
+
+    def __init__(
+        self, fn: Callable, args: tuple, kwargs: dict, dependencies: List[Future]
+    ) -> None:
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.dependencies = dependencies
+        self.future = Future()  # type: Future
+        self.pool_future = None  # type: Optional[Future]
+
+    def run(self) -> None:
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            args = [_results(a) for a in self.args]
+            kwargs = {k: _results(a) for k, a in self.kwargs.items()}
+            result = self.fn(*args, **kwargs)
+        except BaseException as exc:
+            self.future.set_exception(exc)
+        else:
+            self.future.set_result(result)
+        # the arguments may hold large upstream results
+        self.args, self.kwargs = (), {}
+
+
+class ThreadPoolExecutor(Executor):
+    """
+    An executor that runs functions on a pool of threads, built on
+    `concurrent.futures.ThreadPoolExecutor`.
+
+    Functions are only handed to the pool once the futures in their arguments are
+    done, so threads never block on upstream tasks. A thread that waits on futures
+    (for example, a mapped task waiting for its children) runs any of them that haven't
+    started yet itself, so nested mapping can't exhaust the pool; every function runs
+    exactly once.
+
+    Args:
+        - max_workers (int, optional): the number of threads in the pool; defaults to
+            the `concurrent.futures` default
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers
+        self._pool = None  # type: Optional[concurrent.futures.ThreadPoolExecutor]
+        self._work = {}  # type: Dict[Future, _Work]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        super().__init__()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.update(_pool=None, _work={}, _lock=None, _local=None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def start(self) -> Iterator[None]:
+        """
+        Context manager for initializing execution.
+
+        Creates the thread pool, and shuts it down (waiting for any running functions)
+        on exit.
+        """
+        self._pool = concurrent.futures.ThreadPoolExecutor(self.max_workers)
+        try:
+            yield
+        finally:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            self._work.clear()
+
+    def _check_started(self) -> None:
+        if self._pool is None:
+            raise ValueError("This executor has not been started.")
+
+    def _run_in_worker(self, work: _Work) -> None:
+        self._local.in_worker = True
+        work.run()
+
+    def _dispatch(self, work: _Work) -> None:
+        with self._lock:
+            if work.future.done() or work.pool_future is not None:
+                return
+            work.pool_future = self._pool.submit(  # type: ignore
+                self._run_in_worker, work
+            )
+
+    def _dependency_done(self, work: _Work) -> None:
+        if all(f.done() for f in work.dependencies):
+            self._dispatch(work)
+
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._work.pop(future, None)
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """
+        Submit a function to the executor for execution. Returns a `Future`.
+
+        Args:
+            - fn (Callable): function that is being submitted for execution
+            - *args (Any): arguments to be passed to `fn`; any futures are resolved
+                before `fn` is called
+            - **kwargs (Any): keyword arguments to be passed to `fn`; any futures are
+                resolved before `fn` is called
+
+        Returns:
+            - Future: a `Future` that represents the computation of `fn(*args, **kwargs)`
+        """
+        self._check_started()
+        dependencies = [f for a in args for f in _futures(a)]
+        dependencies.extend(f for a in kwargs.values() for f in _futures(a))
+        work = _Work(fn, args, kwargs, dependencies=dependencies)
+        with self._lock:
+            self._work[work.future] = work
+        work.future.add_done_callback(self._forget)
+
+        if not dependencies:
+            self._dispatch(work)
+        for dependency in dependencies:
+            dependency.add_done_callback(lambda _: self._dependency_done(work))
+        return work.future
+
+    def map(self, fn: Callable, *args: Any) -> List[Future]:
+        """
+        Submit a function to be mapped over its iterable arguments.
+
+        Args:
+            - fn (Callable): function that is being submitted for execution
+            - *args (Any): arguments that the function will be mapped over
+
+        Returns:
+            - List[Future]: a `Future` for each set of arguments
+        """
+        return [self.submit(fn, *args_i) for args_i in zip(*args)]
+
+    def _help(self, future: Future) -> None:
+        # runs the work behind `future` in this thread if it hasn't started yet, after
+        # doing the same for any of its dependencies
+        with self._lock:
+            work = self._work.get(future)
+        if work is None:
+            return
+        for dependency in work.dependencies:
+            if not dependency.done():
+                self._help(dependency)
+        with self._lock:
+            if work.pool_future is None:
+                if not all(f.done() for f in work.dependencies):
+                    return
+                # claim the work, so that it isn't also handed to the pool
+                work.pool_future = Future()
+            elif not work.pool_future.cancel():
+                return
+        work.run()
+
+    def wait(self, futures: Any) -> Any:
+        """
+        Resolves futures to their values, blocking until they are done. Futures are
+        resolved when passed directly or in a list, tuple or dictionary.
+
+        Args:
+            - futures (Any): futures to resolve
+
+        Returns:
+            - Any: `futures`, with each future replaced by its result
+        """
+        if getattr(self._local, "in_worker", False):
+            for future in _futures(futures):
+                if not future.done():
+                    self._help(future)
+        return _results(futures)
+
+    def wait_any(self, futures: Dict[Any, Any], timeout: float = None) -> Set[Any]:
+        """
+        Blocks until at least one of the provided futures is complete, or until
+        `timeout` seconds have passed.
+
+        Args:
+            - futures (Dict[Any, Any]): a dictionary of futures, keyed by arbitrary
+                hashable keys
+            - timeout (float, optional): the maximum number of seconds to wait for;
+                defaults to no limit
+
+        Returns:
+            - Set[Any]: the keys of the futures that are complete
+        """
+        pending = [
+            f for f in futures.values() if isinstance(f, Future) and not f.done()
+        ]
+        if pending and len(pending) == len(futures):
+            concurrent.futures.wait(
+                pending, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+        return {
+            key for key, f in futures.items() if not isinstance(f, Future) or f.done()
+        }
+
+
+def _run_pickled(payload: bytes) -> bytes:
+    fn, args, kwargs, context = cloudpickle.loads(payload)
+    try:
+        with prefect.context(context):
+            result = (True, timeout_handler(fn, *args, **kwargs))
+    except Exception as exc:
+        result = (False, exc)
+    return cloudpickle.dumps(result)
+
+
+class ProcessPoolExecutor(ThreadPoolExecutor):
+    """
+    An executor that runs the `run` methods of tasks on a pool of processes, built on
+    `concurrent.futures.ProcessPoolExecutor`; everything else (state handling, mapping,
+    caching and so on) runs on a pool of threads in the main process, as with the
+    `ThreadPoolExecutor`. Task `run` methods, their inputs and their results are
+    serialized with `cloudpickle`.
+
+    Args:
+        - max_workers (int, optional): the number of processes in the pool; defaults to
+            the number of CPUs
+        - threads (int, optional): the number of threads in the pool that runs task
+            runners; defaults to twice the number of processes
+    """
+
+    def __init__(self, max_workers: int = None, threads: int = None):
+        self.processes = max_workers or os.cpu_count() or 1
+        self._process_pool = None  # type: Optional[concurrent.futures.Executor]
+        super().__init__(max_workers=threads or 2 * self.processes)
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        state.update(_process_pool=None)
+        return state
+
+    @contextmanager
+    def start(self) -> Iterator[None]:
+        """
+        Context manager for initializing execution.
+
+        Creates the process and thread pools, and shuts them down (waiting for any
+        running functions) on exit.
+        """
+        self._process_pool = concurrent.futures.ProcessPoolExecutor(self.processes)
+        try:
+            with super().start():
+                yield
+        finally:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+
+    def timeout_handler(  # type: ignore
+        self, fn: Callable, *args: Any, timeout: int = None, **kwargs: Any
+    ) -> Any:
+        """
+        Runs a function (such as a task's `run` method) in the process pool, with the
+        current context. A process in the pool can't be stopped without breaking the
+        pool, so functions with a timeout instead run in a process of their own, which
+        is killed if they time out.
+
+        Args:
+            - fn (callable): the function to execute
+            - *args (Any): arguments to pass to the function
+            - timeout (int): the length of time to allow for execution before raising a
+                `TimeoutError`, represented as an integer in seconds
+            - **kwargs (Any): keyword arguments to pass to the function
+
+        Returns:
+            - the result of `f(*args, **kwargs)`
+
+        Raises:
+            - TimeoutError: if function execution exceeds the allowed timeout
+        """
+        if self._process_pool is None:
+            raise ValueError("This executor has not been started.")
+        if timeout is not None:
+            return _process_timeout(fn, *args, timeout=timeout, **kwargs)
+        payload = cloudpickle.dumps((fn, args, kwargs, prefect.context.to_dict()))
+        future = self._process_pool.submit(_run_pickled, payload)
+        succeeded, result = cloudpickle.loads(future.result())
+        if not succeeded:
+            raise result
+        return result
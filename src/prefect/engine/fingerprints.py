@@ -0,0 +1,183 @@
+"""
+Fingerprints identify the result a task would produce in a flow run, so that results
+checkpointed by a previous run can be reused instead of running the task again.
+
+A task's fingerprint is a hash of:
+
+- the code of its class (and of its `run` function, for tasks created with the `@task`
+    decorator); functions are identified by their compiled code, default arguments and
+    closure variables as well as their source, since the source of a lambda is the
+    whole statement it's defined in
+- the attributes that are specific to the task, such as the value of a `Constant`;
+    attributes shared by all tasks (name, retries, triggers, result handler and so on)
+    don't affect a task's output and are not included
+- the value of the parameter, for `Parameter` tasks
+- the fingerprints of its upstream tasks, along with the keys of the edges connecting
+    them
+
+so any change to a task, or to anything upstream of it, changes its fingerprint.
+Fingerprints assume that tasks are deterministic: a task whose output depends on
+anything else (the current time, external data, ...) should not be run incrementally.
+
+Tasks that can't be fingerprinted (for example, because one of their attributes can't be
+pickled) and mapped tasks have no fingerprint, and neither do any of their downstream
+tasks; they always run.
+"""
+import hashlib
+import inspect
+import pickle
+import types
+from typing import Any, Dict, Optional
+
+from prefect.core import Edge, Flow, Parameter, Task
+from prefect.utilities.serialization import to_qualified_name
+
+# attributes set by `Task.__init__`, which don't affect the output of a task
+_TASK_ATTRIBUTES = frozenset(
+    [
+        "name",
+        "slug",
+        "logger",
+        "tags",
+        "max_retries",
+        "retry_delay",
+        "timeout",
+        "trigger",
+        "skip_on_upstream_skip",
+        "cache_for",
+        "cache_key",
+        "cache_validator",
+        "checkpoint",
+        "result_handler",
+        "state_handlers",
+        "auto_generated",
+        "map_chunk_size",
+        "run",
+    ]
+)
+
+
+def _source(obj: Any) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return to_qualified_name(obj)
+
+
+def _code(code: types.CodeType) -> tuple:
+    # nested code objects (of inner functions, lambdas and comprehensions) are replaced
+    # by their contents, since their reprs hold their memory addresses
+    return (
+        code.co_code,
+        tuple(_code(c) if isinstance(c, types.CodeType) else c for c in code.co_consts),
+        code.co_names,
+    )
+
+
+def _identify(obj: Any) -> Any:
+    """
+    Returns what identifies the code of a class or function: the source of classes, and
+    the compiled code, default arguments, closure variables and source of functions.
+    """
+    func = getattr(obj, "__func__", obj)
+    if not isinstance(func, types.FunctionType):
+        return _source(obj)
+    closure = [cell.cell_contents for cell in func.__closure__ or ()]
+    return (
+        _code(func.__code__),
+        func.__defaults__,
+        func.__kwdefaults__,
+        closure,
+        _source(obj),
+    )
+
+
+def _encode(value: Any) -> bytes:
+    """
+    Encodes a value as bytes that are identical for equal values across runs. Containers
+    are encoded element by element (so that sets and dicts don't depend on their
+    iteration order); other values are pickled.
+    """
+    if isinstance(value, (list, tuple)):
+        items = [_encode(v) for v in value]
+    elif isinstance(value, (set, frozenset)):
+        items = sorted(_encode(v) for v in value)
+    elif isinstance(value, dict):
+        items = sorted(_encode(k) + b":" + _encode(v) for k, v in value.items())
+    else:
+        return pickle.dumps(value, protocol=4)
+    return type(value).__name__.encode() + b"[" + b",".join(items) + b"]"
+
+
+def task_fingerprint(
+    task: Task,
+    upstream_fingerprints: Dict[Edge, Optional[str]],
+    parameters: Dict[str, Any] = None,
+) -> Optional[str]:
+    """
+    Computes the fingerprint of a task.
+
+    Args:
+        - task (Task): the task to fingerprint
+        - upstream_fingerprints (Dict[Edge, Optional[str]]): the fingerprint of the
+            upstream task of each of the task's upstream edges
+        - parameters (dict, optional): the parameter values of the flow run
+
+    Returns:
+        - str: the fingerprint, or `None` if the task can't be fingerprinted
+    """
+    if any(
+        e.mapped or fingerprint is None
+        for e, fingerprint in upstream_fingerprints.items()
+    ):
+        return None
+
+    code = []
+    for cls in type(task).__mro__:
+        if cls in (Task, object):
+            break
+        code.append(_identify(cls))
+    if "run" in vars(task):
+        code.append(_identify(task.run))
+
+    attributes = {
+        k: v
+        for k, v in vars(task).items()
+        if not k.startswith("_") and k not in _TASK_ATTRIBUTES
+    }
+    if isinstance(task, Parameter):
+        attributes["value"] = (parameters or {}).get(task.name, task.default)
+    upstream = sorted(
+        (e.key or "", fingerprint) for e, fingerprint in upstream_fingerprints.items()
+    )
+    hasher = hashlib.sha256()
+    try:
+        hasher.update(_encode(code))
+        hasher.update(_encode(attributes))
+        hasher.update(_encode(upstream))
+    except Exception:
+        return None
+    return hasher.hexdigest()
+
+
+def flow_fingerprints(flow: Flow, parameters: Dict[str, Any] = None) -> Dict[Task, str]:
+    """
+    Computes the fingerprints of the tasks of a flow.
+
+    Args:
+        - flow (Flow): the flow
+        - parameters (dict, optional): the parameter values of the flow run
+
+    Returns:
+        - Dict[Task, str]: the fingerprint of each task that can be fingerprinted
+    """
+    fingerprints = {}  # type: Dict[Task, Optional[str]]
+    for task in flow.sorted_tasks():
+        fingerprints[task] = task_fingerprint(
+            task,
+            upstream_fingerprints={
+                e: fingerprints.get(e.upstream_task) for e in flow.edges_to(task)
+            },
+            parameters=parameters,
+        )
+    return {t: f for t, f in fingerprints.items() if f is not None}
@@ -1,8 +1,16 @@
+import copy
+import heapq
+import logging
+import operator
+import time
+from contextlib import contextmanager
+from functools import partial
 from typing import (
     Any,
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     NamedTuple,
     Optional,
@@ -11,11 +19,14 @@ from typing import (
     Union,
 )
 
+import cloudpickle
 import pendulum
 
 import prefect
 from prefect.core import Edge, Flow, Task
 from prefect.engine import signals
+from prefect.engine.fingerprints import flow_fingerprints
+from prefect.engine.result import NoResult, Result
 from prefect.engine.runner import ENDRUN, Runner, call_state_handlers
 from prefect.engine.state import (
     Failed,
@@ -28,9 +39,110 @@ from prefect.engine.state import (
     Success,
 )
 from prefect.engine.task_runner import TaskRunner
-from prefect.utilities.collections import flatten_seq
+from prefect.utilities.collections import LazySequence, flatten_seq
 from prefect.utilities.executors import run_with_heartbeat
 
+
+def _is_finished(state: State) -> bool:
+    return isinstance(state, State) and state.is_finished()
+
+
+def _is_done(state: Optional[State]) -> bool:
+    """
+    Whether a task with the provided starting state doesn't need to run.
+    """
+    return (
+        isinstance(state, State)
+        and state.is_finished()
+        and not state.is_cached()
+        and not state.is_mapped()
+    )
+
+
+def _release_result(state: State, *consumers_finished: bool) -> State:
+    """
+    Returns a copy of the provided state without the value of its result (or of the
+    results of its mapped children), if all of the provided flags are `True`. Values are
+    written with their result handler, if they have one, and replaced by the resulting
+    `SafeResult`; otherwise they are replaced by `NoResult`.
+    """
+    if not isinstance(state, State) or not all(consumers_finished):
+        return state
+
+    released = copy.copy(state)
+    result = state._result  # type: ignore
+    if isinstance(result, Result):
+        if result.result_handler is not None:
+            result.store_safe_value()
+            released._result = result.safe_value  # type: ignore
+        else:
+            released._result = NoResult  # type: ignore
+    if state.is_mapped():
+        released.map_states = [  # type: ignore
+            _release_result(s) for s in state.map_states  # type: ignore
+        ]
+    return released
+
+
+def _serialized_size(obj: Any) -> Optional[int]:
+    try:
+        return len(cloudpickle.dumps(obj))
+    except Exception:
+        return None
+
+
+def _run_task(
+    runner: "FlowRunner",
+    task_slug: str,
+    context: Dict[str, Any],
+    run_context: Dict[str, Any] = None,
+    **kwargs: Any
+) -> State:
+    """
+    Runs a task with `runner.run_task`. This is submitted to executors in place of the
+    bound method: the flow runner and the parts of the context shared by the whole run
+    are broadcast to the executor's workers once (see `Executor.broadcast`), and the
+    task is referenced by its slug and only sent its own context, so that submissions
+    don't serialize the flow or the whole context.
+    """
+    task = runner._task_from_slug(task_slug)
+    return runner.run_task(
+        task=task, context=dict(run_context or {}, **context), **kwargs
+    )
+
+
+async def _run_task_async(
+    runner: "FlowRunner",
+    task_slug: str,
+    context: Dict[str, Any],
+    run_context: Dict[str, Any] = None,
+    **kwargs: Any
+) -> State:
+    """
+    As `_run_task`, with `runner.run_task_async`.
+    """
+    task = runner._task_from_slug(task_slug)
+    return await runner.run_task_async(
+        task=task, context=dict(run_context or {}, **context), **kwargs
+    )
+
+
+def _run_chain(
+    runner: "FlowRunner",
+    method: str,
+    task_slugs: List[str],
+    contexts: List[Dict[str, Any]],
+    run_context: Dict[str, Any] = None,
+    **kwargs: Any
+) -> List[State]:
+    """
+    As `_run_task`, with `runner.run_chain` or `runner.run_mapped_chain`.
+    """
+    tasks = [runner._task_from_slug(slug) for slug in task_slugs]
+    contexts = [dict(run_context or {}, **c) for c in contexts]
+    return getattr(runner, method)(tasks=tasks, contexts=contexts, **kwargs)
+
+
 FlowRunnerInitializeResult = NamedTuple(
     "FlowRunnerInitializeResult",
     [
@@ -97,6 +209,67 @@ class FlowRunner(Runner):
     def __repr__(self) -> str:
         return "<{}: {}>".format(type(self).__name__, self.flow.name)
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # the context of a run in progress is broadcast separately (see `_task_context`)
+        state.pop("_run_context", None)
+        state.pop("_run_context_handle", None)
+        return state
+
+    @contextmanager
+    def _sharing_run_context(
+        self, executor: "prefect.engine.executors.Executor"
+    ) -> Iterator[None]:
+        # while entered, the context shared by every task run of the flow run is
+        # broadcast to the executor once, and each submission only carries the keys
+        # specific to its task along with the handle of the broadcast context (see
+        # `_task_context`)
+        self._run_context = dict(prefect.context)  # type: Optional[Dict[str, Any]]
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Sharing {} bytes of context with every task run.".format(
+                    _serialized_size(self._run_context)
+                )
+            )
+        self._run_context_handle = executor.broadcast(self._run_context)
+        try:
+            yield
+        finally:
+            self._run_context = None
+            self._run_context_handle = None
+
+    def _task_context(
+        self, task: Task, task_context: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Any]:
+        # splits the context of a task run being submitted into the keys that differ from
+        # the context of the flow run (along with the task's own context) and the handle
+        # of the flow run's context, which was broadcast to the executor once
+        run_context = self.__dict__.get("_run_context")
+        if run_context is None:
+            return dict(prefect.context, **task_context), None
+
+        context = {
+            key: value
+            for key, value in prefect.context.items()
+            if key not in run_context or run_context[key] is not value
+        }
+        context.update(task_context)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Task '{name}': submitting {size} bytes of context.".format(
+                    name=task.name, size=_serialized_size(context)
+                )
+            )
+        return context, self._run_context_handle
+
+    def _task_from_slug(self, slug: str) -> Task:
+        # the index is built once for each copy of the flow runner (such as the copy
+        # broadcast to each worker), and rebuilt if the flow has changed since
+        tasks = self.__dict__.get("_tasks_by_slug")
+        if tasks is None or slug not in tasks:
+            tasks = self._tasks_by_slug = {t.slug: t for t in self.flow.tasks}
+        return tasks[slug]
+
     def call_runner_target_handlers(self, old_state: State, new_state: State) -> State:
         """
         A special state handler that the FlowRunner uses to call its flow's state handlers.
@@ -174,6 +347,14 @@ class FlowRunner(Runner):
             task_contexts.setdefault(task, {}).update(
                 task_name=task.name, task_slug=task.slug
             )
+
+        if prefect.config.flows.incremental:
+            fingerprints = flow_fingerprints(
+                self.flow, parameters=context.get("parameters")
+            )
+            for task, fingerprint in fingerprints.items():
+                task_contexts[task].update(task_fingerprint=fingerprint)
+
         state, context = super().initialize_run(state=state, context=context)
         return FlowRunnerInitializeResult(
             state=state,
@@ -388,44 +569,99 @@ class FlowRunner(Runner):
         if set(return_tasks).difference(self.flow.tasks):
             raise ValueError("Some tasks in return_tasks were not found in the flow.")
 
-        # -- process each task in order
-
-        with executor.start():
+        # -- submit each task to the executor
 
-            for task in self.flow.sorted_tasks():
+        with executor.start(), self._sharing_run_context(executor):
 
-                task_state = task_states.get(task)
-
-                # if the state is finished, don't run the task, just use the provided state
-                if (
-                    isinstance(task_state, State)
-                    and task_state.is_finished()
-                    and not task_state.is_cached()
-                    and not task_state.is_mapped()
-                ):
-                    continue
-
-                upstream_states = {}  # type: Dict[Edge, Union[State, Iterable]]
+            scheduling = prefect.config.engine.flow_runner.scheduling
+            release_results = prefect.config.engine.flow_runner.release_results
+            if scheduling not in ("eager", "ready"):
+                raise ValueError(
+                    'Unknown scheduling mode "{}"; expected "eager" or '
+                    '"ready".'.format(scheduling)
+                )
+            # lazy executors can't report which tasks have finished, which submitting
+            # tasks as they become ready (or capping the tasks in flight) relies on
+            max_in_flight = prefect.config.engine.flow_runner.max_in_flight
+            if executor.computes_lazily and (
+                scheduling == "ready" or (release_results and max_in_flight)
+            ):
+                raise ValueError(
+                    "{} only runs tasks once their results are waited on, so it "
+                    'cannot be used with "ready" scheduling or '
+                    "max_in_flight.".format(type(executor).__name__)
+                )
 
-                # -- process each edge to the task
-                for edge in self.flow.edges_to(task):
-                    upstream_states[edge] = task_states.get(
-                        edge.upstream_task, Pending(message="Task state not available.")
+            chains = []  # type: List[List[Task]]
+            if prefect.config.engine.flow_runner.fuse_chains:
+                chains.extend(self.find_chains())
+            if prefect.config.engine.flow_runner.depth_first_mapping:
+                chains.extend(self.find_mapped_chains())
+            if executor.awaits_coroutines:
+                # chains run synchronously on the executor's loop, where tasks can't
+                # wait for a concurrency slot
+                chains = [
+                    chain
+                    for chain in chains
+                    if not any(
+                        tag.lower().startswith("limit:")
+                        for t in chain
+                        for tag in t.tags
                     )
-
-                # -- run the task
-
-                with prefect.context(task_full_name=task.name, task_tags=task.tags):
-                    task_states[task] = executor.submit(
-                        self.run_task,
-                        task=task,
-                        state=task_state,
-                        upstream_states=upstream_states,
-                        context=dict(prefect.context, **task_contexts.get(task, {})),
-                        task_runner_state_handlers=task_runner_state_handlers,
-                        executor=executor,
+                ]
+
+            priorities = {}  # type: Dict[Task, float]
+            if prefect.config.engine.flow_runner.critical_path_priority:
+                priorities = self.task_priorities()
+                for task, priority in priorities.items():
+                    task_contexts[task] = dict(
+                        task_contexts.get(task, {}), task_priority=priority
                     )
 
+            # the results of reference tasks are always kept, as are those of terminal
+            # tasks when releasing results (and of return tasks otherwise); the
+            # children of other tasks in chains of mapped tasks are released once used
+            keep_results = self.flow.reference_tasks()
+            if release_results:
+                keep_results = keep_results.union(self.flow.terminal_tasks())
+            else:
+                keep_results = keep_results.union(return_tasks)
+
+            # results can only be released once their consumers are known to have
+            # finished, which requires submitting tasks as they become ready
+            if scheduling == "ready" or release_results:
+                self.submit_ready_tasks(
+                    task_states=task_states,
+                    task_contexts=task_contexts,
+                    task_runner_state_handlers=task_runner_state_handlers,
+                    executor=executor,
+                    keep_results=keep_results,
+                    release_results=release_results,
+                    chains=chains,
+                    priorities=priorities,
+                )
+            else:
+                chain_heads = {chain[0]: chain for chain in chains}
+                fused_tasks = {t for chain in chains for t in chain[1:]}
+                for task in self.prioritized_tasks(priorities):
+                    if task in chain_heads:
+                        self.submit_chain(
+                            chain_heads[task],
+                            task_states=task_states,
+                            task_contexts=task_contexts,
+                            task_runner_state_handlers=task_runner_state_handlers,
+                            executor=executor,
+                            keep_results=keep_results,
+                        )
+                    elif task not in fused_tasks:
+                        self.submit_task(
+                            task,
+                            task_states=task_states,
+                            task_contexts=task_contexts,
+                            task_runner_state_handlers=task_runner_state_handlers,
+                            executor=executor,
+                        )
+
             # ---------------------------------------------
             # Collect results
             # ---------------------------------------------
@@ -438,7 +674,7 @@ class FlowRunner(Runner):
 
             # wait until all terminal tasks are finished
             final_tasks = terminal_tasks.union(reference_tasks).union(return_tasks)
-            final_states = executor.wait(
+            final_states = executor.wait_for_states(
                 {
                     t: task_states.get(t, Pending("Task not evaluated by FlowRunner."))
                     for t in final_tasks
@@ -450,8 +686,10 @@ class FlowRunner(Runner):
             all_final_states = final_states.copy()
             for t, s in list(final_states.items()):
                 if s.is_mapped():
-                    s.map_states = executor.wait(s.map_states)
-                    s.result = [ms.result for ms in s.map_states]
+                    s.map_states.resolve(executor.wait_for_states)
+                    # the results are read from the children on access, so that any
+                    # results left on workers are only retrieved on request
+                    s.result = s.map_states.results
                     all_final_states[t] = s.map_states
 
             assert isinstance(final_states, dict)
@@ -471,6 +709,729 @@ class FlowRunner(Runner):
 
         return state
 
+    def task_priorities(self) -> Dict[Task, float]:
+        """
+        Computes the priority of each task in the flow: the length of the longest path
+        from the task to the end of the flow (see `Flow.critical_path_lengths`), so that
+        tasks on the critical path come first. Tasks are weighted by the durations, in
+        seconds and keyed by task slug, in the `task_durations` context key (such as the
+        durations of previous runs), and otherwise have a duration of 1.
+
+        Returns:
+            - Dict[Task, float]: the priority of each task
+        """
+        durations = prefect.context.get("task_durations") or {}
+        return self.flow.critical_path_lengths(
+            {t: durations[t.slug] for t in self.flow.tasks if t.slug in durations}
+        )
+
+    def prioritized_tasks(self, priorities: Dict[Task, float] = None) -> List[Task]:
+        """
+        Sorts the flow's tasks topologically, placing the task with the highest priority
+        first whenever more than one task could come next; ties are broken by the
+        flow's own topological sort.
+
+        Args:
+            - priorities (Dict[Task, float], optional): the priority of each task (see
+                `task_priorities`); tasks that aren't included have a priority of 0
+
+        Returns:
+            - List[Task]: the sorted tasks
+        """
+        sorted_tasks = self.flow.sorted_tasks()
+        if not priorities:
+            return list(sorted_tasks)
+
+        rank = {t: (-priorities.get(t, 0), i) for i, t in enumerate(sorted_tasks)}
+        waiting_on = {t: len(self.flow.upstream_tasks(t)) for t in sorted_tasks}
+        ready = [(rank[t], t) for t in sorted_tasks if not waiting_on[t]]
+        heapq.heapify(ready)
+        prioritized = []
+        while ready:
+            _, task = heapq.heappop(ready)
+            prioritized.append(task)
+            for downstream_task in self.flow.downstream_tasks(task):
+                waiting_on[downstream_task] -= 1
+                if not waiting_on[downstream_task]:
+                    heapq.heappush(ready, (rank[downstream_task], downstream_task))
+        return prioritized
+
+    def submit_task(
+        self,
+        task: Task,
+        task_states: Dict[Task, State],
+        task_contexts: Dict[Task, Dict[str, Any]],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.base.Executor",
+    ) -> bool:
+        """
+        Submits a single task to the executor, passing it the states (or futures) of its
+        upstream tasks. The resulting future is stored in `task_states`.
+
+        Args:
+            - task (Task): the task to submit
+            - task_states (dict): dictionary of task states (or futures) computed so far,
+                with keys being Tasks and values their corresponding state
+            - task_contexts (Dict[Task, Dict[str, Any]]): contexts that will be provided to each task
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (Executor): executor to use when performing computation
+
+        Returns:
+            - bool: `False` if the task already has a finished state and was not
+                submitted, `True` otherwise
+        """
+        task_state = task_states.get(task)
+
+        # if the state is finished, don't run the task, just use the provided state
+        if _is_done(task_state):
+            return False
+
+        upstream_states = {}  # type: Dict[Edge, Union[State, Iterable]]
+
+        # -- process each edge to the task
+        for edge in self.flow.edges_to(task):
+            upstream_states[edge] = task_states.get(
+                edge.upstream_task, Pending(message="Task state not available.")
+            )
+
+        # -- run the task
+
+        with prefect.context(
+            task_full_name=task.name,
+            task_tags=task.tags,
+            task_priority=task_contexts.get(task, {}).get("task_priority", 0),
+        ):
+            context, run_context = self._task_context(task, task_contexts.get(task, {}))
+            task_states[task] = executor.submit(
+                _run_task_async if executor.awaits_coroutines else _run_task,
+                executor.broadcast(self),
+                task_slug=task.slug,
+                state=task_state,
+                upstream_states=upstream_states,
+                context=context,
+                run_context=run_context,
+                task_runner_state_handlers=task_runner_state_handlers,
+                executor=executor,
+            )
+        return True
+
+    def find_chains(self) -> List[List[Task]]:
+        """
+        Finds the linear chains of tasks in the flow that can be submitted to the executor
+        as single units. Within a chain, each task is the only downstream task of the
+        previous one, and has no other upstream tasks. Tasks with mapped edges, retries
+        or a timeout are never part of a chain, since they need to be submitted on their
+        own.
+
+        Returns:
+            - List[List[Task]]: the chains (each of at least two tasks), in topological
+                order
+        """
+
+        def fusable(task: Task) -> bool:
+            return (
+                not task.max_retries
+                and task.timeout is None
+                and not any(e.mapped for e in self.flow.edges_to(task))
+                and not any(e.mapped for e in self.flow.edges_from(task))
+            )
+
+        def next_task(task: Task) -> Optional[Task]:
+            downstream_tasks = self.flow.downstream_tasks(task)
+            if len(downstream_tasks) != 1:
+                return None
+            (downstream_task,) = downstream_tasks
+            if len(self.flow.upstream_tasks(downstream_task)) != 1:
+                return None
+            return downstream_task if fusable(downstream_task) else None
+
+        chains = []
+        fused_tasks = set()  # type: Set[Task]
+        for task in self.flow.sorted_tasks():
+            if task in fused_tasks or not fusable(task):
+                continue
+            chain = [task]
+            downstream_task = next_task(task)
+            while downstream_task is not None:
+                chain.append(downstream_task)
+                downstream_task = next_task(downstream_task)
+            if len(chain) > 1:
+                chains.append(chain)
+                fused_tasks.update(chain)
+        return chains
+
+    def find_mapped_chains(self) -> List[List[Task]]:
+        """
+        Finds the chains of mapped tasks in the flow that can run depth-first. Within a
+        chain, each task is the only downstream task of the previous one, and is mapped
+        over it (all of its upstream edges are mapped edges from the previous task). Tasks
+        with retries or a timeout are never part of a chain.
+
+        Returns:
+            - List[List[Task]]: the chains (each of at least two tasks), in topological
+                order
+        """
+
+        def is_mapped(task: Task) -> bool:
+            return (
+                not task.max_retries
+                and task.timeout is None
+                and any(e.mapped for e in self.flow.edges_to(task))
+            )
+
+        def next_task(task: Task) -> Optional[Task]:
+            downstream_tasks = self.flow.downstream_tasks(task)
+            if len(downstream_tasks) != 1:
+                return None
+            (downstream_task,) = downstream_tasks
+            if not is_mapped(downstream_task) or not all(
+                e.mapped and e.upstream_task is task
+                for e in self.flow.edges_to(downstream_task)
+            ):
+                return None
+            return downstream_task
+
+        chains = []
+        chained_tasks = set()  # type: Set[Task]
+        for task in self.flow.sorted_tasks():
+            if task in chained_tasks or not is_mapped(task):
+                continue
+            chain = [task]
+            downstream_task = next_task(task)
+            while downstream_task is not None:
+                chain.append(downstream_task)
+                downstream_task = next_task(downstream_task)
+            if len(chain) > 1:
+                chains.append(chain)
+                chained_tasks.update(chain)
+        return chains
+
+    def submit_chain(
+        self,
+        chain: List[Task],
+        task_states: Dict[Task, State],
+        task_contexts: Dict[Task, Dict[str, Any]],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.base.Executor",
+        keep_results: Set[Task] = None,
+    ) -> bool:
+        """
+        Submits a chain of tasks (see `find_chains` and `find_mapped_chains`) to the
+        executor as a single unit, passing it the states (or futures) of the upstream
+        tasks of its first task. The state (or future) of each task in the chain is stored
+        in `task_states`. Chains of mapped tasks are run with `run_mapped_chain`, and
+        other chains with `run_chain`.
+
+        Args:
+            - chain (List[Task]): the tasks to submit
+            - task_states (dict): dictionary of task states (or futures) computed so far,
+                with keys being Tasks and values their corresponding state
+            - task_contexts (Dict[Task, Dict[str, Any]]): contexts that will be provided to each task
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (Executor): executor to use when performing computation
+            - keep_results (Set[Task], optional): for chains of mapped tasks, the tasks
+                whose child results should be kept in memory (see `run_mapped_chain`)
+
+        Returns:
+            - bool: `False` if every task in the chain already has a finished state and
+                the chain was not submitted, `True` otherwise
+        """
+        states = [task_states.get(t) for t in chain]
+        if all(_is_done(s) for s in states):
+            return False
+
+        upstream_states = {}  # type: Dict[Edge, Union[State, Iterable]]
+        for edge in self.flow.edges_to(chain[0]):
+            upstream_states[edge] = task_states.get(
+                edge.upstream_task, Pending(message="Task state not available.")
+            )
+
+        contexts = []
+        run_context = None
+        for task in chain:
+            with prefect.context(task_full_name=task.name, task_tags=task.tags):
+                context, run_context = self._task_context(
+                    task, task_contexts.get(task, {})
+                )
+                contexts.append(context)
+
+        kwargs = {}  # type: Dict[str, Any]
+        method = "run_chain"
+        if any(e.mapped for e in self.flow.edges_to(chain[1])):
+            method = "run_mapped_chain"
+            kwargs.update(keep_results=keep_results)
+
+        tags = set()  # type: Set[str]
+        for task in chain:
+            tags.update(task.tags)
+        with prefect.context(
+            task_full_name=chain[0].name,
+            task_tags=tags,
+            task_priority=contexts[0].get("task_priority", 0),
+        ):
+            chain_states = executor.submit(
+                _run_chain,
+                executor.broadcast(self),
+                method=method,
+                task_slugs=[t.slug for t in chain],
+                states=states,
+                upstream_states=upstream_states,
+                upstream_edges=[self.flow.edges_to(t) for t in chain[1:]],
+                contexts=contexts,
+                run_context=run_context,
+                task_runner_state_handlers=task_runner_state_handlers,
+                executor=executor,
+                **kwargs
+            )
+            for i, task in enumerate(chain):
+                task_states[task] = executor.submit(operator.getitem, chain_states, i)
+        return True
+
+    def run_chain(
+        self,
+        tasks: List[Task],
+        states: List[Optional[State]],
+        upstream_states: Dict[Edge, State],
+        upstream_edges: List[Set[Edge]],
+        contexts: List[Dict[str, Any]],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.Executor",
+    ) -> List[State]:
+        """
+        Runs a chain of tasks one after the other, each with its own TaskRunner. This
+        method is intended to be called by submitting it to an executor.
+
+        Args:
+            - tasks (List[Task]): the tasks to run
+            - states (List[State]): the starting state of each task (or `None`)
+            - upstream_states (Dict[Edge, State]): dictionary of the upstream states of
+                the first task
+            - upstream_edges (List[Set[Edge]]): the upstream edges of every other task,
+                which all come from the previous task
+            - contexts (List[Dict[str, Any]]): a context dictionary for each task run
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (Executor): executor to use when performing
+                computation; defaults to the executor provided in your prefect configuration
+
+        Returns:
+            - List[State]: the final post-run state of each task
+        """
+        chain_states = []  # type: List[State]
+        for i, task in enumerate(tasks):
+            if i > 0:
+                upstream_states = {e: chain_states[-1] for e in upstream_edges[i - 1]}
+
+            # as in `submit_task`, tasks with finished states are not run again
+            state = states[i] or Pending()
+            if not _is_done(state):
+                state = self.run_task(
+                    task=task,
+                    state=state,
+                    upstream_states=upstream_states,
+                    context=contexts[i],
+                    task_runner_state_handlers=task_runner_state_handlers,
+                    executor=executor,
+                )
+            chain_states.append(state)
+        return chain_states
+
+    def run_mapped_chain(
+        self,
+        tasks: List[Task],
+        states: List[Optional[State]],
+        upstream_states: Dict[Edge, State],
+        upstream_edges: List[Set[Edge]],
+        contexts: List[Dict[str, Any]],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.Executor",
+        keep_results: Set[Task] = None,
+    ) -> List[State]:
+        """
+        Runs a chain of mapped tasks depth-first: each child of the first task is
+        submitted to the executor as a single unit, in which the corresponding child of
+        every task runs in turn, so that children run in parallel and child `i` of each
+        task runs as soon as child `i` of the previous task has finished. The children's
+        states are then passed to the task runner of each task, which ends in a `Mapped`
+        state holding them. This method is intended to be called by submitting it to an
+        executor.
+
+        The result of each child of a task that isn't in `keep_results` is released (as
+        in `release_result`) as soon as the corresponding child of the next task has
+        run, since that child is its only consumer.
+
+        If any task in the chain has already started (its state isn't pending), or if any
+        upstream task of the first task didn't succeed (or was skipped), the chain is run
+        breadth-first with `run_chain` instead, so that each task goes through the usual
+        upstream and trigger checks. A child that raises an unexpected error ends in a
+        `Failed` state.
+
+        Args:
+            - tasks (List[Task]): the tasks to run
+            - states (List[State]): the starting state of each task (or `None`)
+            - upstream_states (Dict[Edge, State]): dictionary of the upstream states of
+                the first task
+            - upstream_edges (List[Set[Edge]]): the upstream edges of every other task,
+                which are all mapped edges from the previous task
+            - contexts (List[Dict[str, Any]]): a context dictionary for each task run
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (Executor): executor to use when performing
+                computation; defaults to the executor provided in your prefect configuration
+            - keep_results (Set[Task], optional): the tasks whose child results should be
+                kept in memory; defaults to the flow's reference tasks
+
+        Returns:
+            - List[State]: the final post-run state of each task
+        """
+
+        def run_breadth_first() -> List[State]:
+            return self.run_chain(
+                tasks=tasks,
+                states=states,
+                upstream_states=upstream_states,
+                upstream_edges=upstream_edges,
+                contexts=contexts,
+                task_runner_state_handlers=task_runner_state_handlers,
+                executor=executor,
+            )
+
+        if any(s is not None and not s.is_pending() for s in states):
+            self.logger.debug(
+                "Chain starting at task '{}' has already started; running it "
+                "breadth-first.".format(tasks[0].name)
+            )
+            return run_breadth_first()
+
+        # the children of the first task are generated here rather than by its task
+        # runner, which would first check that its upstream tasks succeeded
+        if not all(
+            s.is_successful() and not s.is_skipped() for s in upstream_states.values()
+        ):
+            self.logger.debug(
+                "Not every upstream task of task '{}' succeeded; running its chain "
+                "breadth-first.".format(tasks[0].name)
+            )
+            return run_breadth_first()
+
+        if keep_results is None:
+            keep_results = self.flow.reference_tasks()
+        release = [task not in keep_results for task in tasks]
+        flow_context = self.context
+
+        with prefect.context(flow_context):
+            task_runners = [
+                self.task_runner_cls(
+                    task=task,
+                    state_handlers=task_runner_state_handlers,
+                    result_handler=task.result_handler or self.flow.result_handler,
+                )
+                for task in tasks
+            ]
+
+            # the children are generated from the upstream states here, so the children
+            # of any mapped upstream task must have finished
+            for edge, upstream_state in upstream_states.items():
+                if upstream_state.is_mapped():
+                    assert isinstance(upstream_state, Mapped)  # mypy assert
+                    upstream_state.map_states.resolve(executor.wait)
+                    if not edge.mapped:
+                        upstream_state.result = upstream_state.map_states.results
+
+            def run_child(
+                map_index: int, child_upstream_states: Dict[Edge, State]
+            ) -> List[State]:
+                child_states = []  # type: List[State]
+                with prefect.context(flow_context):
+                    for i, parent_runner in enumerate(task_runners):
+                        # runners keep per-run attributes (such as the task run id of
+                        # a `CloudTaskRunner`), so children that run concurrently each
+                        # need their own
+                        task_runner = type(parent_runner)(
+                            task=parent_runner.task,
+                            state_handlers=parent_runner.state_handlers,
+                            result_handler=parent_runner.result_handler,
+                        )
+                        if i > 0:
+                            child_upstream_states = {
+                                e: child_states[-1] for e in upstream_edges[i - 1]
+                            }
+                        try:
+                            child_state = task_runner.run(
+                                upstream_states=child_upstream_states,
+                                context=dict(contexts[i], map_index=map_index),
+                                executor=executor,
+                            )
+                        except Exception as exc:
+                            msg = "Unexpected error: {}".format(repr(exc))
+                            task_runner.logger.exception(msg)
+                            child_state = Failed(msg, result=exc)
+                        # the previous child's only consumer has run
+                        if i > 0 and release[i - 1]:
+                            child_states[-1] = _release_result(child_states[-1])
+                        child_states.append(child_state)
+                return child_states
+
+            # the children are generated as they are submitted, but can still be
+            # counted, so that executors can submit them all at once
+            n_children = task_runners[0].count_map_children(
+                state=Pending(), upstream_states=upstream_states
+            )
+            children = LazySequence(
+                partial(
+                    task_runners[0].get_map_child_upstream_states,
+                    Pending(),
+                    upstream_states,
+                ),
+                range(n_children),
+            )
+            child_chains = executor.wait(
+                executor.map(run_child, range(n_children), children)
+            )
+
+            # each task's children have finished, so its task runner only collects them
+            chain_states = []  # type: List[State]
+            for i, task_runner in enumerate(task_runners):
+                if i > 0:
+                    upstream_states = {
+                        e: chain_states[-1] for e in upstream_edges[i - 1]
+                    }
+                mapped_state = Mapped(
+                    message="{} mapped tasks ran depth-first.".format(
+                        len(child_chains)
+                    ),
+                    map_states=[child_states[i] for child_states in child_chains],
+                )
+                chain_states.append(
+                    task_runner.run(
+                        state=mapped_state,
+                        upstream_states=upstream_states,
+                        context=dict(contexts[i]),
+                        executor=executor,
+                    )
+                )
+            return chain_states
+
+    def submit_ready_tasks(
+        self,
+        task_states: Dict[Task, State],
+        task_contexts: Dict[Task, Dict[str, Any]],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.base.Executor",
+        keep_results: Set[Task] = None,
+        release_results: bool = False,
+        chains: List[List[Task]] = None,
+        priorities: Dict[Task, float] = None,
+    ) -> None:
+        """
+        Submits tasks to the executor as their upstream tasks finish, rather than all at
+        once. Tasks whose upstream tasks have all finished are kept in a ready queue,
+        ordered by their priority (highest first) and then by their position in the
+        flow's topological sort, and at most `engine.flow_runner.max_in_flight` tasks
+        are submitted at any time (no limit if this is 0). The method blocks until every
+        task has been submitted and has finished.
+
+        If `release_results` is True, the results of all tasks that aren't in
+        `keep_results` are released (see `release_result`) as soon as all of their
+        downstream tasks have finished.
+
+        Each of the provided `chains` (see `find_chains` and `find_mapped_chains`) is
+        submitted as a single unit once its first task is ready.
+
+        Tasks that finish in a `Retrying` state whose start time is less than a minute
+        away are resubmitted once their start time arrives, without holding an executor
+        slot while they wait; their downstream tasks only become ready once they have
+        finished. Task runners that would otherwise wait for such retries themselves
+        (see `TaskRunner.waits_for_retries`) are told not to through the
+        `resubmit_retries` context key.
+
+        Args:
+            - task_states (dict): dictionary of task states to begin
+                computation with, with keys being Tasks and values their corresponding state
+            - task_contexts (Dict[Task, Dict[str, Any]]): contexts that will be provided to each task
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (Executor): executor to use when performing computation
+            - keep_results (Set[Task], optional): the tasks whose results should be
+                kept in memory, which is also passed on to chains (see `submit_chain`)
+            - release_results (bool, optional): whether to release the results of all
+                other tasks; defaults to `False`
+            - chains (List[List[Task]], optional): chains of tasks to submit as single
+                units
+            - priorities (Dict[Task, float], optional): the priority of each task (see
+                `task_priorities`); tasks that aren't included have a priority of 0
+        """
+        max_in_flight = prefect.config.engine.flow_runner.max_in_flight
+        sorted_tasks = self.flow.sorted_tasks()
+        priorities = priorities or {}
+        rank = {t: (-priorities.get(t, 0), i) for i, t in enumerate(sorted_tasks)}
+        waiting_on = {t: len(self.flow.upstream_tasks(t)) for t in sorted_tasks}
+        consumers = {t: len(self.flow.downstream_tasks(t)) for t in sorted_tasks}
+
+        # chains are tracked through their last task, and finish all at once
+        chain_heads = {chain[0]: chain for chain in chains or []}
+        chain_tails = {chain[-1]: chain for chain in chains or []}
+        fused_tasks = {t for chain in chains or [] for t in chain[1:]}
+
+        # tasks that can retry are resubmitted for short retries, instead of their task
+        # runners waiting for them
+        for task in sorted_tasks:
+            if task.max_retries and getattr(
+                self.task_runner_cls, "waits_for_retries", False
+            ):
+                task_contexts[task] = dict(
+                    task_contexts.get(task, {}), resubmit_retries=True
+                )
+
+        ready = [(rank[t], t) for t in sorted_tasks if not waiting_on[t]]
+        heapq.heapify(ready)
+        in_flight = {}  # type: Dict[Task, Any]
+        # tasks waiting for a retry, ordered by start time
+        retrying = []  # type: List[Tuple[pendulum.DateTime, Tuple[float, int], Task]]
+
+        while ready or in_flight or retrying:
+            now = pendulum.now("utc")
+            while retrying and retrying[0][0] <= now:
+                _, task_rank, task = heapq.heappop(retrying)
+                heapq.heappush(ready, (task_rank, task))
+
+            finished = []  # type: List[Task]
+            while ready and (not max_in_flight or len(in_flight) < max_in_flight):
+                _, task = heapq.heappop(ready)
+                if task in chain_heads:
+                    chain = chain_heads[task]
+                    if self.submit_chain(
+                        chain,
+                        task_states=task_states,
+                        task_contexts=task_contexts,
+                        task_runner_state_handlers=task_runner_state_handlers,
+                        executor=executor,
+                        keep_results=keep_results,
+                    ):
+                        in_flight[chain[-1]] = task_states[chain[-1]]
+                    else:
+                        finished.extend(chain)
+                elif self.submit_task(
+                    task,
+                    task_states=task_states,
+                    task_contexts=task_contexts,
+                    task_runner_state_handlers=task_runner_state_handlers,
+                    executor=executor,
+                ):
+                    in_flight[task] = task_states[task]
+                else:
+                    finished.append(task)
+
+            if not finished:
+                if retrying:
+                    timeout = max((retrying[0][0] - now).total_seconds(), 0)
+                    if in_flight:
+                        done = executor.wait_any(in_flight, timeout=timeout)
+                    else:
+                        time.sleep(timeout)
+                        done = set()
+                else:
+                    done = executor.wait_any(in_flight)
+
+                for task in done:
+                    del in_flight[task]
+                    retry_time = self._short_retry_time(task, task_states, executor)
+                    if retry_time is not None:
+                        heapq.heappush(retrying, (retry_time, rank[task], task))
+                    else:
+                        finished.extend(chain_tails.get(task, [task]))
+
+            for task in finished:
+                for downstream_task in self.flow.downstream_tasks(task):
+                    waiting_on[downstream_task] -= 1
+                    if (
+                        not waiting_on[downstream_task]
+                        and downstream_task not in fused_tasks
+                    ):
+                        heapq.heappush(ready, (rank[downstream_task], downstream_task))
+
+                if not release_results:
+                    continue
+                for upstream_task in self.flow.upstream_tasks(task):
+                    consumers[upstream_task] -= 1
+                    if not consumers[upstream_task] and upstream_task not in (
+                        keep_results or set()
+                    ):
+                        self.release_result(
+                            upstream_task, task_states=task_states, executor=executor
+                        )
+
+    def _short_retry_time(
+        self,
+        task: Task,
+        task_states: Dict[Task, State],
+        executor: "prefect.engine.executors.base.Executor",
+    ) -> Optional[pendulum.DateTime]:
+        # the start time of a task that finished in a Retrying state due within a minute,
+        # if any; only tasks that can retry are checked, so that the states of other
+        # tasks aren't retrieved from the executor
+        if not task.max_retries or task not in task_states:
+            return None
+        state = executor.wait_for_states({task: task_states[task]})[task]
+        if not isinstance(state, Retrying):
+            return None
+        start_time = state.start_time  # type: pendulum.DateTime
+        if start_time <= pendulum.now("utc").add(minutes=1):
+            return start_time
+        return None
+
+    def release_result(
+        self,
+        task: Task,
+        task_states: Dict[Task, State],
+        executor: "prefect.engine.executors.base.Executor",
+    ) -> None:
+        """
+        Releases the in-memory result of a task whose downstream tasks have all been run,
+        by replacing its state with a copy that doesn't hold the result's value. If the
+        result has a result handler, the value is first written with it and the copy
+        holds the resulting `SafeResult`; otherwise, the copy holds `NoResult`. The
+        result is only released if every downstream task has finished, so that tasks
+        which will run again (for example, `Paused` or `Scheduled` tasks) still receive
+        their inputs.
+
+        The copy is created by the executor, so results that live on remote workers are
+        never gathered. The children of mapped tasks may still be futures (see
+        `MapStates.resolve`), so mapped states are resolved, along with their children,
+        and released by the flow runner itself.
+
+        Args:
+            - task (Task): the task whose result should be released
+            - task_states (dict): dictionary of task states (or futures), with keys
+                being Tasks and values their corresponding state
+            - executor (Executor): executor to use when performing computation
+        """
+        if task not in task_states:
+            return
+        consumers_finished = [
+            executor.submit(_is_finished, task_states[t])
+            for t in self.flow.downstream_tasks(task)
+        ]
+        is_mapped = any(edge.mapped for edge in self.flow.edges_to(task))
+        if is_mapped and not executor.computes_lazily:
+            state = executor.wait_for_states(task_states[task])
+            if isinstance(state, State) and state.is_mapped():
+                state.map_states.resolve(executor.wait_for_states)  # type: ignore
+                task_states[task] = _release_result(
+                    state, *executor.wait(consumers_finished)
+                )
+                return
+        task_states[task] = executor.submit(
+            _release_result, task_states[task], *consumers_finished
+        )
+
     def determine_final_state(
         self,
         state: State,
@@ -545,27 +1506,86 @@ class FlowRunner(Runner):
 
         """
         with prefect.context(self.context):
-            default_handler = task.result_handler or self.flow.result_handler
-            task_runner = self.task_runner_cls(
-                task=task,
-                state_handlers=task_runner_state_handlers,
-                result_handler=default_handler,
+            task_runner = self._prepare_task_run(
+                task,
+                upstream_states=upstream_states,
+                task_runner_state_handlers=task_runner_state_handlers,
+                executor=executor,
+            )
+            return task_runner.run(
+                state=state,
+                upstream_states=upstream_states,
+                context=context,
+                executor=executor,
             )
 
-            # if this task reduces over a mapped state, make sure its children have finished
-            for edge, upstream_state in upstream_states.items():
+    async def run_task_async(
+        self,
+        task: Task,
+        state: State,
+        upstream_states: Dict[Edge, State],
+        context: Dict[str, Any],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.Executor",
+    ) -> State:
+        """
+        Runs a specific task with `TaskRunner.run_async`. This method is intended to be
+        submitted to executors that await coroutines (see `AsyncioExecutor`).
 
-                # if the upstream state is Mapped, wait until its results are all available
-                if not edge.mapped and upstream_state.is_mapped():
-                    assert isinstance(upstream_state, Mapped)  # mypy assert
-                    upstream_state.map_states = executor.wait(upstream_state.map_states)
-                    upstream_state.result = [
-                        s.result for s in upstream_state.map_states
-                    ]
+        Args:
+            - task (Task): the task to run
+            - state (State): starting state for the Flow. Defaults to
+                `Pending`
+            - upstream_states (Dict[Edge, State]): dictionary of upstream states
+            - context (Dict[str, Any]): a context dictionary for the task run
+            - task_runner_state_handlers (Iterable[Callable]): A list of state change
+                handlers that will be provided to the task_runner, and called whenever a task changes
+                state.
+            - executor (Executor): executor to use when performing
+                computation; defaults to the executor provided in your prefect configuration
 
-            return task_runner.run(
+        Returns:
+            - State: `State` representing the final post-run state of the `Flow`.
+        """
+        with prefect.context(self.context):
+            task_runner = self._prepare_task_run(
+                task,
+                upstream_states=upstream_states,
+                task_runner_state_handlers=task_runner_state_handlers,
+                executor=executor,
+            )
+            return await task_runner.run_async(
                 state=state,
                 upstream_states=upstream_states,
                 context=context,
                 executor=executor,
             )
+
+    def _prepare_task_run(
+        self,
+        task: Task,
+        upstream_states: Dict[Edge, State],
+        task_runner_state_handlers: Iterable[Callable],
+        executor: "prefect.engine.executors.Executor",
+    ) -> TaskRunner:
+        # creates the task runner for a task, after waiting for the children of any
+        # mapped states the task reduces over
+        default_handler = task.result_handler or self.flow.result_handler
+        task_runner = self.task_runner_cls(
+            task=task,
+            state_handlers=task_runner_state_handlers,
+            result_handler=default_handler,
+        )
+
+        # if this task reduces over a mapped state, make sure its children have finished
+        for edge, upstream_state in upstream_states.items():
+
+            # if the upstream state is Mapped, wait until its results are all available
+            if not edge.mapped and upstream_state.is_mapped():
+                assert isinstance(upstream_state, Mapped)  # mypy assert
+                upstream_state.map_states.resolve(executor.wait)
+                # the task receives a view of the results in the compact container,
+                # rather than a state or a copy of the result for each child
+                upstream_state.result = upstream_state.map_states.results
+
+        return task_runner
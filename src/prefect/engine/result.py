@@ -17,10 +17,12 @@ also provides a `NoResult` object representing the _absence_ of computation / da
 whose value is `None`.
 """
 
-from typing import Any, Union
+from typing import Any, Tuple, Union
 
 from prefect.engine.result_handlers import ResultHandler
 
+_MISSING = object()
+
 
 class ResultInterface:
     """
@@ -28,14 +30,30 @@ class ResultInterface:
     in its attributes without pickle recursion problems.
     """
 
+    __slots__ = ()
+
+    # the attributes compared by `__eq__`
+    _eq_attributes = ()  # type: Tuple[str, ...]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)  # type: ignore
+        cls._eq_attributes = tuple(
+            attr
+            for c in reversed(cls.__mro__)
+            for attr in getattr(c, "__slots__", ())
+            if not attr.startswith("_")
+        )
+
     def __eq__(self, other: Any) -> bool:
         if type(self) == type(other):
-            eq = True
-            for attr in self.__dict__:
-                if attr.startswith("_"):
-                    continue
-                eq &= getattr(self, attr, object()) == getattr(other, attr, object())
-            return eq
+            attrs = self._eq_attributes
+            if hasattr(self, "__dict__"):
+                # subclasses without `__slots__` can have any attributes
+                attrs += tuple(a for a in self.__dict__ if not a.startswith("_"))
+            return all(
+                getattr(self, attr, _MISSING) == getattr(other, attr, _MISSING)
+                for attr in attrs
+            )
         return False
 
     def __repr__(self) -> str:
@@ -63,6 +81,8 @@ class Result(ResultInterface):
             when storing / serializing this result's value; required if you intend on persisting this result in some way
     """
 
+    __slots__ = ("value", "safe_value", "result_handler")
+
     def __init__(self, value: Any, result_handler: ResultHandler = None):
         self.value = value
         self.safe_value = NoResult  # type: SafeResult
@@ -92,6 +112,8 @@ class SafeResult(ResultInterface):
         - result_handler (ResultHandler): the result handler to use when reading this result's value
     """
 
+    __slots__ = ("value", "result_handler")
+
     def __init__(self, value: Any, result_handler: ResultHandler):
         self.value = value
         self.result_handler = result_handler
@@ -119,6 +141,10 @@ class NoResultType(SafeResult):
     def __init__(self) -> None:
         pass
 
+    def __reduce__(self) -> tuple:
+        # the `value` slot inherited from `SafeResult` is shadowed by a read-only property
+        return (NoResultType, ())
+
     def __eq__(self, other: Any) -> bool:
         if type(self) == type(other):
             return True
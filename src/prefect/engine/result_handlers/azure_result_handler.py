@@ -1,7 +1,7 @@
 import base64
 import json
 import uuid
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
 import cloudpickle
 import pendulum
@@ -104,6 +104,42 @@ class AzureResultHandler(ResultHandler):
 
         return uri
 
+    def write_checkpoint(self, key: str, result: Any) -> str:
+        """
+        Given a result, writes the result to a location in Azure Blob storage determined
+        by `key` and returns the resulting URI.
+
+        Args:
+            - key (str): the key identifying the result
+            - result (Any): the written result
+
+        Returns:
+            - str: the Blob URI
+        """
+        uri = "checkpoints/{key}.prefect_result".format(key=key)
+        self.logger.debug("Starting to upload result to {}...".format(uri))
+        binary_data = base64.b64encode(cloudpickle.dumps(result)).decode()
+        self.service.create_blob_from_text(
+            container_name=self.container, blob_name=uri, text=binary_data
+        )
+        self.logger.debug("Finished uploading result to {}.".format(uri))
+        return uri
+
+    def find_checkpoint(self, key: str) -> Optional[str]:
+        """
+        Returns the URI of a result written by `write_checkpoint` under the given key.
+
+        Args:
+            - key (str): the key identifying the result
+
+        Returns:
+            - str: the Blob URI, or `None` if there is no such result
+        """
+        uri = "checkpoints/{key}.prefect_result".format(key=key)
+        if self.service.exists(container_name=self.container, blob_name=uri):
+            return uri
+        return None
+
     def read(self, uri: str) -> Any:
         """
         Given a uri, reads a result from Azure Blob storage, reads it and returns it
@@ -1,6 +1,6 @@
 import base64
 import uuid
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
 import cloudpickle
 import pendulum
@@ -86,6 +86,38 @@ class GCSResultHandler(ResultHandler):
         self.logger.debug("Finished uploading result to {}.".format(uri))
         return uri
 
+    def write_checkpoint(self, key: str, result: Any) -> str:
+        """
+        Given a result, writes the result to a location in GCS determined by `key`
+        and returns the resulting URI.
+
+        Args:
+            - key (str): the key identifying the result
+            - result (Any): the written result
+
+        Returns:
+            - str: the GCS URI
+        """
+        uri = "checkpoints/{key}.prefect_result".format(key=key)
+        self.logger.debug("Starting to upload result to {}...".format(uri))
+        binary_data = base64.b64encode(cloudpickle.dumps(result)).decode()
+        self.gcs_bucket.blob(uri).upload_from_string(binary_data)
+        self.logger.debug("Finished uploading result to {}.".format(uri))
+        return uri
+
+    def find_checkpoint(self, key: str) -> Optional[str]:
+        """
+        Returns the URI of a result written by `write_checkpoint` under the given key.
+
+        Args:
+            - key (str): the key identifying the result
+
+        Returns:
+            - str: the GCS URI, or `None` if there is no such result
+        """
+        uri = "checkpoints/{key}.prefect_result".format(key=key)
+        return uri if self.gcs_bucket.blob(uri).exists() else None
+
     def read(self, uri: str) -> Any:
         """
         Given a uri, reads a result from GCS, reads it and returns it
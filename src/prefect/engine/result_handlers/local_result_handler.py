@@ -4,8 +4,9 @@ Result Handlers provide the hooks that Prefect uses to store task results in pro
 Anytime a task needs its output or inputs stored, a result handler is used to determine where this data should be stored (and how it can be retrieved).
 """
 import base64
+import os
 import tempfile
-from typing import Any
+from typing import Any, Optional
 
 import cloudpickle
 
@@ -61,3 +62,42 @@ class LocalResultHandler(ResultHandler):
             f.write(cloudpickle.dumps(result))
         self.logger.debug("Finished uploading result to {}...".format(loc))
         return loc
+
+    def _checkpoint_path(self, key: str) -> str:
+        return os.path.join(
+            self.dir or tempfile.gettempdir(), "prefect-checkpoint-{}".format(key)
+        )
+
+    def write_checkpoint(self, key: str, result: Any) -> str:
+        """
+        Serialize the provided result to local disk, at a path determined by `key`.
+
+        Args:
+            - key (str): the key identifying the result
+            - result (Any): the result to write and store
+
+        Returns:
+            - str: the _absolute_ path to the written result on disk
+        """
+        loc = self._checkpoint_path(key)
+        self.logger.debug("Starting to upload result to {}...".format(loc))
+        # write to a temporary file first, so that partially written results are never found
+        fd, tmp = tempfile.mkstemp(prefix="prefect-", dir=os.path.dirname(loc))
+        with open(fd, "wb") as f:
+            f.write(cloudpickle.dumps(result))
+        os.replace(tmp, loc)
+        self.logger.debug("Finished uploading result to {}...".format(loc))
+        return loc
+
+    def find_checkpoint(self, key: str) -> Optional[str]:
+        """
+        Returns the path of a result written by `write_checkpoint` under the given key.
+
+        Args:
+            - key (str): the key identifying the result
+
+        Returns:
+            - str: the _absolute_ path to the result, or `None` if it doesn't exist
+        """
+        loc = self._checkpoint_path(key)
+        return loc if os.path.exists(loc) else None
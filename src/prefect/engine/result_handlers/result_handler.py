@@ -6,7 +6,7 @@ Anytime a task needs its output or inputs stored, a result handler is used to de
 import base64
 import tempfile
 from abc import ABCMeta, abstractmethod
-from typing import Any
+from typing import Any, Optional
 
 import cloudpickle
 
@@ -30,6 +30,34 @@ class ResultHandler(metaclass=ABCMeta):
     def read(self, loc: str) -> Any:
         raise NotImplementedError()
 
+    def write_checkpoint(self, key: str, result: Any) -> Optional[str]:
+        """
+        Writes a result to a location determined by `key`, so that later flow runs can find
+        it with `find_checkpoint`. Result handlers which don't support this return `None`
+        without writing anything.
+
+        Args:
+            - key (str): the key identifying the result
+            - result (Any): the result to write
+
+        Returns:
+            - str: the location of the written result, or `None`
+        """
+        return None
+
+    def find_checkpoint(self, key: str) -> Optional[str]:
+        """
+        Returns the location of a result written by `write_checkpoint` under the given key,
+        if there is one.
+
+        Args:
+            - key (str): the key identifying the result
+
+        Returns:
+            - str: the location of the result (which can be passed to `read`), or `None`
+        """
+        return None
+
     def __eq__(self, other: object) -> bool:
         """
         Equality depends on result handler type and any public attributes
@@ -2,7 +2,7 @@ import base64
 import io
 import json
 import uuid
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
 import cloudpickle
 import pendulum
@@ -97,6 +97,42 @@ class S3ResultHandler(ResultHandler):
         self.logger.debug("Finished uploading result to {}.".format(uri))
         return uri
 
+    def write_checkpoint(self, key: str, result: Any) -> str:
+        """
+        Given a result, writes the result to a location in S3 determined by `key`
+        and returns the resulting URI.
+
+        Args:
+            - key (str): the key identifying the result
+            - result (Any): the written result
+
+        Returns:
+            - str: the S3 URI
+        """
+        uri = "checkpoints/{key}.prefect_result".format(key=key)
+        self.logger.debug("Starting to upload result to {}...".format(uri))
+        binary_data = base64.b64encode(cloudpickle.dumps(result))
+        stream = io.BytesIO(binary_data)
+        self.client.upload_fileobj(stream, Bucket=self.bucket, Key=uri)
+        self.logger.debug("Finished uploading result to {}.".format(uri))
+        return uri
+
+    def find_checkpoint(self, key: str) -> Optional[str]:
+        """
+        Returns the URI of a result written by `write_checkpoint` under the given key.
+
+        Args:
+            - key (str): the key identifying the result
+
+        Returns:
+            - str: the S3 URI, or `None` if there is no such result
+        """
+        uri = "checkpoints/{key}.prefect_result".format(key=key)
+        response = self.client.list_objects_v2(Bucket=self.bucket, Prefix=uri)
+        if any(obj["Key"] == uri for obj in response.get("Contents", [])):
+            return uri
+        return None
+
     def read(self, uri: str) -> Any:
         """
         Given a uri, reads a result from S3, reads it and returns it
@@ -1,6 +1,6 @@
 import collections
 import functools
-from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import prefect
 from prefect.engine import signals
@@ -95,6 +95,23 @@ class Runner:
     def _heartbeat(self) -> None:
         pass
 
+    @classmethod
+    def _heartbeat_many(cls, runners: List["Runner"]) -> None:
+        """
+        Heartbeats several runners of this class at once; called periodically for the
+        runners that are running a method decorated with
+        `prefect.utilities.executors.run_with_heartbeat`. Defaults to calling each
+        runner's `_heartbeat`; subclasses can batch the heartbeats instead.
+
+        Args:
+            - runners (List[Runner]): the runners to heartbeat
+        """
+        for runner in runners:
+            try:
+                runner._heartbeat()
+            except Exception:
+                pass
+
     def initialize_run(
         self, state: Optional[State], context: Dict[str, Any]
     ) -> Tuple[State, Dict[str, Any]]:
@@ -9,9 +9,11 @@ This module contains all Prefect state classes, all ultimately inheriting from t
 Every run is initialized with the `Pending` state, meaning that it is waiting for
 execution. During execution a run will enter a `Running` state. Finally, runs become `Finished`.
 """
+import array
 import datetime
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Union
+from collections.abc import MutableSequence, Sequence
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import pendulum
 
@@ -20,6 +22,8 @@ from prefect.engine.result import NoResult, Result, ResultInterface, SafeResult
 from prefect.engine.result_handlers import ResultHandler
 from prefect.utilities.collections import DotDict
 
+_MISSING = object()
+
 
 class State:
     """
@@ -41,8 +45,41 @@ class State:
         - result (Any, optional): Defaults to `None`. A data payload for the state.
     """
 
+    __slots__ = ("message", "_result")
+
     color = "#696969"
 
+    # the state-checking methods read these flags, which each state class sets for
+    # itself (and its subclasses) rather than running `isinstance` checks
+    _is_pending = False
+    _is_scheduled = False
+    _is_retrying = False
+    _is_running = False
+    _is_finished = False
+    _is_looped = False
+    _is_successful = False
+    _is_cached = False
+    _is_mapped = False
+    _is_failed = False
+    _is_skipped = False
+    _is_submitted = False
+    _is_meta_state = False
+
+    # the attributes of the class, and those compared by `__eq__` besides the result
+    _attributes = ("message", "_result")  # type: Tuple[str, ...]
+    _eq_attributes = ()  # type: Tuple[str, ...]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)  # type: ignore
+        cls._attributes = tuple(
+            attr for c in reversed(cls.__mro__) for attr in getattr(c, "__slots__", ())
+        )
+        cls._eq_attributes = tuple(
+            attr
+            for attr in cls._attributes
+            if not attr.startswith("_") and attr != "message"
+        )
+
     def __init__(self, message: str = None, result: Any = NoResult):
         self.message = message
         self.result = result
@@ -56,12 +93,20 @@ class State:
         """
         if type(self) == type(other):
             assert isinstance(other, State)  # this assertion is here for MyPy only
-            eq = self._result.value == other._result.value  # type: ignore
-            for attr in self.__dict__:
-                if attr.startswith("_") or attr in ["message", "result"]:
-                    continue
-                eq &= getattr(self, attr, object()) == getattr(other, attr, object())
-            return eq
+            if self._result.value != other._result.value:  # type: ignore
+                return False
+            attrs = self._eq_attributes
+            if hasattr(self, "__dict__"):
+                # subclasses without `__slots__` can have any attributes
+                attrs += tuple(
+                    attr
+                    for attr in self.__dict__
+                    if not attr.startswith("_") and attr not in ["message", "result"]
+                )
+            return all(
+                getattr(self, attr, _MISSING) == getattr(other, attr, _MISSING)
+                for attr in attrs
+            )
         return False
 
     def __hash__(self) -> int:
@@ -85,8 +130,7 @@ class State:
         Returns:
             - bool: `True` if the state is pending, `False` otherwise
         """
-
-        return isinstance(self, Pending)
+        return self._is_pending
 
     def is_retrying(self) -> bool:
         """
@@ -95,8 +139,7 @@ class State:
         Returns:
             - bool: `True` if the state is retrying, `False` otherwise
         """
-
-        return isinstance(self, Retrying)
+        return self._is_retrying
 
     def is_running(self) -> bool:
         """
@@ -105,7 +148,7 @@ class State:
         Returns:
             - bool: `True` if the state is running, `False` otherwise
         """
-        return isinstance(self, Running)
+        return self._is_running
 
     def is_cached(self) -> bool:
         """
@@ -114,7 +157,7 @@ class State:
         Returns:
             - bool: `True` if the state is Cached, `False` otherwise
         """
-        return isinstance(self, Cached)
+        return self._is_cached
 
     def is_finished(self) -> bool:
         """
@@ -123,7 +166,7 @@ class State:
         Returns:
             - bool: `True` if the state is finished, `False` otherwise
         """
-        return isinstance(self, Finished)
+        return self._is_finished
 
     def is_looped(self) -> bool:
         """
@@ -132,7 +175,7 @@ class State:
         Returns:
             - bool: `True` if the state is looped, `False` otherwise
         """
-        return isinstance(self, Looped)
+        return self._is_looped
 
     def is_scheduled(self) -> bool:
         """
@@ -141,7 +184,7 @@ class State:
         Returns:
             - bool: `True` if the state is skipped, `False` otherwise
         """
-        return isinstance(self, Scheduled)
+        return self._is_scheduled
 
     def is_submitted(self) -> bool:
         """
@@ -150,7 +193,7 @@ class State:
         Returns:
             - bool: `True` if the state is submitted, `False` otherwise
         """
-        return isinstance(self, Submitted)
+        return self._is_submitted
 
     def is_skipped(self) -> bool:
         """
@@ -159,7 +202,7 @@ class State:
         Returns:
             - bool: `True` if the state is skipped, `False` otherwise
         """
-        return isinstance(self, Skipped)
+        return self._is_skipped
 
     def is_successful(self) -> bool:
         """
@@ -168,7 +211,7 @@ class State:
         Returns:
             - bool: `True` if the state is successful, `False` otherwise
         """
-        return isinstance(self, Success)
+        return self._is_successful
 
     def is_failed(self) -> bool:
         """
@@ -177,7 +220,7 @@ class State:
         Returns:
             - bool: `True` if the state is failed, `False` otherwise
         """
-        return isinstance(self, Failed)
+        return self._is_failed
 
     def is_mapped(self) -> bool:
         """
@@ -186,7 +229,7 @@ class State:
         Returns:
             - bool: `True` if the state is mapped, `False` otherwise
         """
-        return isinstance(self, Mapped)
+        return self._is_mapped
 
     def is_meta_state(self) -> bool:
         """
@@ -195,7 +238,7 @@ class State:
         Returns:
             - bool: `True` if the state is a meta state, `False` otherwise
         """
-        return isinstance(self, _MetaState)
+        return self._is_meta_state
 
     @staticmethod
     def deserialize(json_blob: dict) -> "State":
@@ -240,6 +283,9 @@ class Pending(State):
             keys to fully hydrated `Result`s.  Used / set if the Task requires Retries.
     """
 
+    __slots__ = ("cached_inputs",)
+    _is_pending = True
+
     color = "#7ebdff"
 
     def __init__(
@@ -269,6 +315,9 @@ class Scheduled(Pending):
             keys to fully hydrated `Result`s.  Used / set if the Task requires Retries.
     """
 
+    __slots__ = ("start_time",)
+    _is_scheduled = True
+
     color = "#ffab00"
 
     def __init__(
@@ -297,6 +346,8 @@ class Paused(Scheduled):
             keys to fully hydrated `Result`s.  Used / set if the Task requires Retries.
     """
 
+    __slots__ = ()
+
     color = "#cfd8dc"
 
     def __init__(
@@ -327,6 +378,9 @@ class _MetaState(State):
     easily identified.
     """
 
+    __slots__ = ("state",)
+    _is_meta_state = True
+
     def __init__(
         self, message: str = None, result: Any = NoResult, state: State = None
     ):
@@ -351,6 +405,8 @@ class ClientFailed(_MetaState):
 
     """
 
+    __slots__ = ()
+
     color = "#eb0000"
 
 
@@ -373,6 +429,9 @@ class Submitted(_MetaState):
 
     """
 
+    __slots__ = ()
+    _is_submitted = True
+
     color = "#ffdf5d"
 
 
@@ -393,6 +452,8 @@ class Queued(_MetaState):
 
     """
 
+    __slots__ = ("start_time",)
+
     color = "#ffea7f"
 
     def __init__(
@@ -419,6 +480,8 @@ class Resume(Scheduled):
             keys to fully hydrated `Result`s.  Used / set if the Task requires Retries.
     """
 
+    __slots__ = ()
+
     color = "#fb8532"
 
 
@@ -438,6 +501,9 @@ class Retrying(Scheduled):
             if that value isn't found.
     """
 
+    __slots__ = ("run_count",)
+    _is_retrying = True
+
     color = "#f66a0a"
 
     def __init__(
@@ -475,6 +541,9 @@ class Running(State):
         - result (Any, optional): Defaults to `None`. A data payload for the state.
     """
 
+    __slots__ = ()
+    _is_running = True
+
     color = "#3d67ff"
 
 
@@ -493,6 +562,9 @@ class Finished(State):
         - result (Any, optional): Defaults to `None`. A data payload for the state.
     """
 
+    __slots__ = ()
+    _is_finished = True
+
     color = "#003ccb"
 
 
@@ -510,6 +582,9 @@ class Looped(Finished):
             if that value isn't found.
     """
 
+    __slots__ = ("loop_count",)
+    _is_looped = True
+
     color = "#003ccb"
 
     def __init__(
@@ -532,6 +607,9 @@ class Success(Finished):
         - result (Any, optional): Defaults to `None`. A data payload for the state.
     """
 
+    __slots__ = ()
+    _is_successful = True
+
     color = "#28a745"
 
 
@@ -551,6 +629,9 @@ class Cached(Success):
             expires and can no longer be used. Defaults to `None`
     """
 
+    __slots__ = ("cached_inputs", "cached_parameters", "cached_result_expiration")
+    _is_cached = True
+
     color = "#34d058"
 
     def __init__(
@@ -571,6 +652,302 @@ class Cached(Success):
         )  # type: Optional[datetime.datetime]
 
 
+class MapStates(list):
+    """
+    A compact `list` of the states of the children of a `Mapped` task.
+
+    Children added to the container (for example, with `append` or by assignment) are
+    stored as-is, exactly as in a `list`. The states that children resolve to (see
+    `resolve`), which nothing else refers to, are instead stored in parallel arrays of
+    their type, message and result, rather than as a `State` object (and a `Result`
+    object) each; a `State` is only created from them when a child is first accessed,
+    and is then kept, so that modifying it modifies the container. Resolved states with
+    other attributes (for example, `Cached` or `Retrying` states) are stored as-is.
+
+    Args:
+        - states (Iterable, optional): the initial child states
+    """
+
+    def __init__(self, states: Iterable = None):
+        # the items of the underlying `list` are never used; every list method is
+        # implemented with the arrays below
+        super().__init__()
+        self._classes = [None]  # type: List[Optional[type]]
+        self._codes = array.array("H")
+        self._messages = []  # type: List[Any]
+        self._values = []  # type: List[Any]
+        self._result_handlers = []  # type: List[Optional[ResultHandler]]
+        # indices of children stored as-is, or whose results are stored as-is
+        self._objects = set()  # type: set
+        self._boxed = set()  # type: set
+        for state in states or []:
+            self.append(state)
+
+    def _keep(self, index: int, obj: Any) -> None:
+        # stores the object as-is
+        self._objects.add(index)
+        self._boxed.discard(index)
+        self._codes[index] = 0
+        self._messages[index] = None
+        self._values[index] = obj
+        self._result_handlers[index] = None
+
+    def _pack(self, index: int, state: Any) -> None:
+        self._objects.discard(index)
+        self._boxed.discard(index)
+        if (
+            not isinstance(state, State)
+            or state._attributes != State._attributes
+            or hasattr(state, "__dict__")
+        ):
+            self._keep(index, state)
+            return
+
+        cls = type(state)
+        if cls not in self._classes:
+            self._classes.append(cls)
+        self._codes[index] = self._classes.index(cls)
+        self._messages[index] = state.message
+        result = state._result  # type: ignore
+        # only plain results are unboxed; subclasses (such as `SafeResult`) are kept
+        if (
+            isinstance(result, Result)
+            and type(result) is Result
+            and result.safe_value is NoResult
+        ):
+            self._values[index] = result.value
+            self._result_handlers[index] = result.result_handler
+        else:
+            self._boxed.add(index)
+            self._values[index] = result
+            self._result_handlers[index] = None
+
+    def _unpack(self, index: int) -> Any:
+        if index in self._objects:
+            return self._values[index]
+        state = State.__new__(self._classes[self._codes[index]])  # type: ignore
+        state.message = self._messages[index]
+        if index in self._boxed:
+            state._result = self._values[index]
+        else:
+            state._result = Result(
+                self._values[index], result_handler=self._result_handlers[index]
+            )
+        self._keep(index, state)
+        return state
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._unpack(i) for i in range(len(self))[index]]
+        return self._unpack(range(len(self))[index])
+
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        if not isinstance(index, slice):
+            self._keep(range(len(self))[index], value)
+            return
+        indices = range(len(self))[index]
+        values = list(value)
+        if index.step not in (None, 1):
+            if len(values) != len(indices):
+                raise ValueError(
+                    "attempt to assign sequence of size {} to extended slice of "
+                    "size {}".format(len(values), len(indices))
+                )
+            for i, v in zip(indices, values):
+                self._keep(i, v)
+            return
+        del self[index]
+        for offset, v in enumerate(values):
+            self.insert(indices.start + offset, v)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            for i in sorted(range(len(self))[index], reverse=True):
+                del self[i]
+            return
+        index = range(len(self))[index]
+        del self._codes[index]
+        del self._messages[index]
+        del self._values[index]
+        del self._result_handlers[index]
+        self._objects = {i - (i > index) for i in self._objects if i != index}
+        self._boxed = {i - (i > index) for i in self._boxed if i != index}
+
+    def insert(self, index: int, value: Any) -> None:
+        # clamp the index like `list.insert`
+        index = max(0, min(index + len(self) if index < 0 else index, len(self)))
+        self._codes.insert(index, 0)
+        self._messages.insert(index, None)
+        self._values.insert(index, None)
+        self._result_handlers.insert(index, None)
+        self._objects = {i + (i >= index) for i in self._objects}
+        self._boxed = {i + (i >= index) for i in self._boxed}
+        self._keep(index, value)
+
+    # the other list methods are implemented in terms of the ones above
+    __iter__ = Sequence.__iter__
+    __reversed__ = Sequence.__reversed__
+    __contains__ = Sequence.__contains__
+    index = Sequence.index
+    count = Sequence.count
+    append = MutableSequence.append
+    extend = MutableSequence.extend
+    pop = MutableSequence.pop
+    remove = MutableSequence.remove
+    reverse = MutableSequence.reverse
+
+    def clear(self) -> None:
+        del self[:]
+
+    def copy(self) -> "MapStates":
+        new = MapStates()
+        new._classes = list(self._classes)
+        new._codes = array.array("H", self._codes)
+        new._messages = list(self._messages)
+        new._values = list(self._values)
+        new._result_handlers = list(self._result_handlers)
+        new._objects = set(self._objects)
+        new._boxed = set(self._boxed)
+        return new
+
+    __copy__ = copy
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        self[:] = sorted(self, *args, **kwargs)
+
+    def __iadd__(self, other: Iterable) -> "MapStates":  # type: ignore
+        self.extend(other)
+        return self
+
+    def __add__(self, other: Any) -> Any:
+        if isinstance(other, list):
+            return list(self) + list(other)
+        return NotImplemented
+
+    def __radd__(self, other: Any) -> Any:
+        if isinstance(other, list):
+            return list(other) + list(self)
+        return NotImplemented
+
+    def __mul__(self, n: int) -> List[Any]:
+        return list(self) * n
+
+    __rmul__ = __mul__
+
+    def __imul__(self, n: int) -> "MapStates":
+        self[:] = list(self) * n
+        return self
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return False
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __lt__(self, other: Any) -> bool:
+        return list(self) < list(other)
+
+    def __le__(self, other: Any) -> bool:
+        return list(self) <= list(other)
+
+    def __gt__(self, other: Any) -> bool:
+        return list(self) > list(other)
+
+    def __ge__(self, other: Any) -> bool:
+        return list(self) >= list(other)
+
+    def __repr__(self) -> str:
+        return "<MapStates: {} children>".format(len(self))
+
+    def __reduce__(self) -> tuple:
+        # the arrays are pickled rather than the (unused) items of the list
+        return (MapStates, (), self.__dict__)
+
+    def resolve(self, wait: Callable[[List[Any]], List[Any]]) -> None:
+        """
+        Replaces the children that aren't states yet (such as futures) with the states
+        they resolve to, by passing them in a list to `wait` (for instance
+        `Executor.wait`), and stores those states compactly. Other children are left as
+        they are, so that no state is created for them, and `wait` isn't called if
+        there is nothing to resolve.
+
+        Args:
+            - wait (Callable): a function resolving a list of futures to their values
+        """
+        indices = sorted(
+            i for i in self._objects if not isinstance(self._values[i], State)
+        )
+        if not indices:
+            return
+        for i, state in zip(indices, wait([self._values[i] for i in indices])):
+            self._pack(i, state)
+
+    @property
+    def results(self) -> "MapResults":
+        """
+        A read-only sequence of the results of the children, backed by this container.
+        """
+        return MapResults(self)
+
+
+class MapResults(Sequence):
+    """
+    A read-only sequence of the results of the children of a `Mapped` task, which reads
+    them from a `MapStates` container rather than copying them into a list. It compares
+    equal to any other sequence with the same items, concatenates with lists into a
+    list, and is pickled as a list.
+
+    Args:
+        - map_states (MapStates): the child states
+    """
+
+    def __init__(self, map_states: MapStates):
+        self._map_states = map_states
+
+    def _result(self, index: int) -> Any:
+        states = self._map_states
+        if index in states._objects:
+            return states._values[index].result
+        if index in states._boxed:
+            return states._values[index].value
+        return states._values[index]
+
+    def __len__(self) -> int:
+        return len(self._map_states)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._result(i) for i in range(len(self))[index]]
+        return self._result(range(len(self))[index])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return False
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __add__(self, other: Any) -> Any:
+        # concatenates like a list, since tasks receive this view as a list of results
+        if isinstance(other, (list, MapResults)):
+            return list(self) + list(other)
+        return NotImplemented
+
+    def __radd__(self, other: Any) -> Any:
+        if isinstance(other, list):
+            return other + list(self)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce__(self) -> tuple:
+        return (list, (list(self),))
+
+
 class Mapped(Success):
     """
     State indicated this task was mapped over, and all mapped tasks were _submitted_ successfully.
@@ -587,8 +964,13 @@ class Mapped(Success):
         - map_states (List): A list containing the states of any "children" of this task. When
             a task enters a Mapped state, it indicates that it has dynamically created copies
             of itself to map its operation over its inputs. Those copies are the children.
+            The states are stored in a `MapStates` list, which stores the states
+            of children resolved from futures compactly.
     """
 
+    __slots__ = ("_map_states",)
+    _is_mapped = True
+
     color = "#003ccb"
 
     def __init__(
@@ -598,7 +980,23 @@ class Mapped(Success):
         map_states: List[State] = None,
     ):
         super().__init__(message=message, result=result)
-        self.map_states = map_states or []  # type: List[State]
+        self.map_states = map_states or []  # type: ignore
+
+    def __eq__(self, other: object) -> bool:
+        return super().__eq__(other) and self.map_states == other.map_states  # type: ignore
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    @property
+    def map_states(self) -> MapStates:
+        return self._map_states
+
+    @map_states.setter
+    def map_states(self, value: Iterable) -> None:
+        if not isinstance(value, MapStates):
+            value = MapStates(value)
+        self._map_states = value
 
     @property
     def n_map_states(self) -> int:
@@ -615,6 +1013,9 @@ class Failed(Finished):
         - result (Any, optional): Defaults to `None`. A data payload for the state.
     """
 
+    __slots__ = ()
+    _is_failed = True
+
     color = "#eb0000"
 
 
@@ -628,6 +1029,8 @@ class Aborted(Failed):
         - result (Any, optional): Defaults to `None`. A data payload for the state.
     """
 
+    __slots__ = ()
+
     color = "#c42800"
 
 
@@ -643,6 +1046,8 @@ class TimedOut(Failed):
             keys to fully hydrated `Result`s.  Used / set if the Task requires Retries.
     """
 
+    __slots__ = ("cached_inputs",)
+
     color = "#ff4e33"
 
     def __init__(
@@ -665,6 +1070,8 @@ class TriggerFailed(Failed):
         - result (Any, optional): Defaults to `None`. A data payload for the state.
     """
 
+    __slots__ = ()
+
     color = "#ff5131"
 
 
@@ -678,6 +1085,9 @@ class Skipped(Success):
         - result (Any, optional): Defaults to `None`. A data payload for the state.
     """
 
+    __slots__ = ()
+    _is_skipped = True
+
     color = "#62757f"
 
     # note: this does not allow setting "cached" as Success states do
@@ -1,14 +1,19 @@
+import asyncio
 import collections
 import copy
+import inspect
 import itertools
 import threading
 from functools import partial, wraps
 from typing import (
     TYPE_CHECKING,
     Any,
+    Awaitable,
     Callable,
     Dict,
+    Generator,
     Iterable,
+    Iterator,
     List,
     NamedTuple,
     Optional,
@@ -16,6 +21,7 @@ from typing import (
     Sized,
     Tuple,
     Union,
+    cast,
 )
 
 import pendulum
@@ -24,7 +30,7 @@ import prefect
 from prefect import config
 from prefect.core import Edge, Task
 from prefect.engine import signals
-from prefect.engine.result import NoResult, Result
+from prefect.engine.result import NoResult, Result, SafeResult
 from prefect.engine.result_handlers import JSONResultHandler
 from prefect.engine.runner import ENDRUN, Runner, call_state_handlers
 from prefect.engine.state import (
@@ -45,7 +51,8 @@ from prefect.engine.state import (
     TimedOut,
     TriggerFailed,
 )
-from prefect.utilities.executors import run_with_heartbeat
+from prefect.utilities.collections import LazySequence
+from prefect.utilities.executors import concurrency_limits, run_with_heartbeat
 
 if TYPE_CHECKING:
     from prefect.engine.result_handlers import ResultHandler
@@ -56,6 +63,47 @@ TaskRunnerInitializeResult = NamedTuple(
 )
 
 
+async def _wait_for_futures(futures: Iterable[Any]) -> None:
+    pending = [f for f in futures if isinstance(f, asyncio.Future)]
+    if pending:
+        await asyncio.wait(pending)
+
+
+class _ChunkChild:
+    """
+    Stands in for the state of a mapped child that runs in a chunk with other children,
+    until `TaskRunner.wait_for_mapped_task` resolves the chunk's future.
+    """
+
+    __slots__ = ("chunk", "index")
+
+    def __init__(self, chunk: Any, index: int):
+        self.chunk = chunk
+        self.index = index
+
+
+def _wait_for_children(
+    executor: "prefect.engine.executors.Executor", children: List[Any]
+) -> List[State]:
+    # the future of each chunk is waited for once, and its states are flattened so
+    # that there is still one state per child
+    chunks = {}  # type: Dict[int, Any]
+    futures = []  # type: List[Any]
+    for child in children:
+        if isinstance(child, _ChunkChild):
+            chunks.setdefault(id(child.chunk), child.chunk)
+        else:
+            futures.append(child)
+    chunk_states = dict(zip(chunks, executor.wait(list(chunks.values()))))
+    states = iter(executor.wait_for_states(futures) if futures else [])
+    return [
+        chunk_states[id(child.chunk)][child.index]
+        if isinstance(child, _ChunkChild)
+        else next(states)
+        for child in children
+    ]
+
+
 class TaskRunner(Runner):
     """
     TaskRunners handle the execution of Tasks and determine the State of a Task
@@ -78,6 +126,10 @@ class TaskRunner(Runner):
             if not provided here or by the Task, will default to the one specified in your config
     """
 
+    # whether `run` waits for retries that are due within a minute itself, unless the
+    # `resubmit_retries` context key is set (see `CloudTaskRunner`)
+    waits_for_retries = False
+
     def __init__(
         self,
         task: Task,
@@ -201,6 +253,71 @@ class TaskRunner(Runner):
         Returns:
             - `State` object representing the final post-run state of the Task
         """
+        steps = self._run_steps(
+            state=state,
+            upstream_states=upstream_states,
+            context=context,
+            executor=executor,
+            is_async=False,
+        )
+        # synchronous runs never suspend, so the pipeline finishes in a single step
+        try:
+            next(steps)
+        except StopIteration as exc:
+            return exc.value
+        raise RuntimeError("Synchronous task run was suspended.")
+
+    async def run_async(
+        self,
+        state: State = None,
+        upstream_states: Dict[Edge, State] = None,
+        context: Dict[str, Any] = None,
+        executor: "prefect.engine.executors.Executor" = None,
+    ) -> State:
+        """
+        Runs the task like `run`, for executors that run tasks on an event loop (see
+        `AsyncioExecutor`). If `self.task.run` is a coroutine function, it is awaited
+        rather than run in a thread, as are the children of mapped tasks.
+
+        Args:
+            - state (State, optional): initial `State` to begin task run from;
+                defaults to `Pending()`
+            - upstream_states (Dict[Edge, State]): a dictionary
+                representing the states of any tasks upstream of this one. The keys of the
+                dictionary should correspond to the edges leading to the task.
+            - context (dict, optional): prefect Context to use for execution
+            - executor (Executor, optional): executor to use when performing
+                computation; defaults to the executor specified in your prefect configuration
+
+        Returns:
+            - `State` object representing the final post-run state of the Task
+        """
+        steps = self._run_steps(
+            state=state,
+            upstream_states=upstream_states,
+            context=context,
+            executor=executor,
+            is_async=True,
+        )
+        result = None
+        while True:
+            try:
+                awaitable = steps.send(result)
+            except StopIteration as exc:
+                return exc.value
+            result = await awaitable
+
+    def _run_steps(
+        self,
+        state: Optional[State],
+        upstream_states: Optional[Dict[Edge, State]],
+        context: Optional[Dict[str, Any]],
+        executor: Optional["prefect.engine.executors.Executor"],
+        is_async: bool,
+    ) -> Generator[Awaitable, Any, State]:
+        # the task run pipeline shared by `run` and `run_async`; when `is_async` is
+        # True, the steps that await something yield an awaitable and are sent back
+        # its result, and otherwise the pipeline never yields
         upstream_states = upstream_states or {}
         context = context or {}
         map_index = context.setdefault("map_index", None)
@@ -259,6 +376,10 @@ class TaskRunner(Runner):
                         executor=executor,
                     )
 
+                    # let the children run on the loop before waiting for them
+                    if is_async and state.is_mapped():
+                        yield _wait_for_futures(state.map_states)  # type: ignore
+
                     state = self.wait_for_mapped_task(state=state, executor=executor)
 
                     self.logger.debug(
@@ -268,6 +389,11 @@ class TaskRunner(Runner):
                     )
                     raise ENDRUN(state)
 
+                # check if a previous run checkpointed the task's result
+                state = self.check_task_is_checkpointed(
+                    state, upstream_states=upstream_states
+                )
+
                 # retrieve task inputs from upstream and also explicitly passed inputs
                 task_inputs = self.get_task_inputs(
                     state=state, upstream_states=upstream_states
@@ -281,13 +407,32 @@ class TaskRunner(Runner):
                 # so we run this after the previous step
                 state = self.check_task_trigger(state, upstream_states=upstream_states)
 
-                # set the task state to running
-                state = self.set_task_to_running(state)
-
-                # run the task
-                state = self.get_task_run_state(
-                    state, inputs=task_inputs, timeout_handler=executor.timeout_handler
-                )
+                # wait for a slot under each of the task's concurrency limits, which
+                # is held until the task has run
+                limits = concurrency_limits(self.task.tags)
+                if is_async and limits and executor.awaits_coroutines:
+                    slots = yield executor.acquire_concurrency_slots(  # type: ignore
+                        limits
+                    )
+                else:
+                    slots = executor.concurrency_slots(limits)
+
+                with slots:
+                    # set the task state to running
+                    state = self.set_task_to_running(state)
+
+                    # run the task; coroutines are awaited here, and their outcome is
+                    # then replayed by `get_task_run_state`
+                    timeout_handler = executor.timeout_handler
+                    if (
+                        is_async
+                        and state.is_running()
+                        and inspect.iscoroutinefunction(self.task.run)
+                    ):
+                        timeout_handler = yield self._await_task_run(inputs=task_inputs)
+                    state = self.get_task_run_state(
+                        state, inputs=task_inputs, timeout_handler=timeout_handler
+                    )
 
                 # cache the output, if appropriate
                 state = self.cache_result(state, inputs=task_inputs)
@@ -295,13 +440,22 @@ class TaskRunner(Runner):
                 # check if the task needs to be retried
                 state = self.check_for_retry(state, inputs=task_inputs)
 
-                state = self.check_task_is_looping(
-                    state,
-                    inputs=task_inputs,
-                    upstream_states=upstream_states,
-                    context=context,
-                    executor=executor,
-                )
+                if is_async and state.is_looped():
+                    next_loop = self.run_async(
+                        self._start_next_loop(state, context=context),
+                        upstream_states=upstream_states,
+                        context=context,
+                        executor=executor,
+                    )
+                    state = cast(State, (yield next_loop))
+                else:
+                    state = self.check_task_is_looping(
+                        state,
+                        inputs=task_inputs,
+                        upstream_states=upstream_states,
+                        context=context,
+                        executor=executor,
+                    )
 
         # for pending signals, including retries and pauses we need to make sure the
         # task_inputs are set
@@ -600,6 +754,48 @@ class TaskRunner(Runner):
 
         return task_inputs
 
+    @call_state_handlers
+    def check_task_is_checkpointed(
+        self, state: State, upstream_states: Dict[Edge, State]
+    ) -> State:
+        """
+        Checks whether a previous run checkpointed a result under the task's fingerprint
+        (see `prefect.engine.fingerprints`), in which case the task doesn't need to run
+        again and finishes with that result.
+
+        Args:
+            - state (State): the current state of this task
+            - upstream_states (Dict[Edge, State]): the upstream states
+
+        Returns:
+            - State: the state of the task after running the check
+
+        Raises:
+            - ENDRUN: if a checkpointed result was found
+        """
+        fingerprint = prefect.context.get("task_fingerprint")
+        if (
+            fingerprint is None
+            or not prefect.config.flows.incremental
+            or not self.task.checkpoint
+            or self.result_handler is None
+            or not state.is_pending()
+            or not all(s.is_successful() for s in upstream_states.values())
+        ):
+            return state
+
+        loc = self.result_handler.find_checkpoint(fingerprint)
+        if loc is None:
+            return state
+
+        self.logger.debug(
+            "Task '{name}': reusing result checkpointed by a previous run.".format(
+                name=prefect.context.get("task_full_name", self.task.name)
+            )
+        )
+        result = SafeResult(loc, result_handler=self.result_handler).to_result()
+        raise ENDRUN(Success(result=result, message="Reused checkpointed result."))
+
     @call_state_handlers
     def check_task_is_cached(self, state: State, inputs: Dict[str, Result]) -> State:
         """
@@ -648,6 +844,121 @@ class TaskRunner(Runner):
             )
         return state or Pending("Cache was invalid; ready to run.")
 
+    def get_map_upstream_states(
+        self, state: State, upstream_states: Dict[Edge, State]
+    ) -> Iterator[Dict[Edge, State]]:
+        """
+        Lazily generates the upstream states of each child of a mapped task, in order of
+        `map_index`. Unmapped edges keep their upstream state; mapped edges are given the
+        appropriately-indexed child state or result of their upstream task.
+
+        Args:
+            - state (State): the current task state
+            - upstream_states (Dict[Edge, State]): the upstream states
+
+        Returns:
+            - Iterator[Dict[Edge, State]]: the upstream states of each child
+        """
+        # we don't know how long the iterables are, but we want to iterate until we reach
+        # the end of the shortest one
+        if not upstream_states:
+            return
+        for i in itertools.count():
+            try:
+                states = self.get_map_child_upstream_states(
+                    state=state, upstream_states=upstream_states, map_index=i
+                )
+            # index error means we reached the end of the shortest iterable
+            except IndexError:
+                return
+            yield states
+
+    def get_map_child_upstream_states(
+        self, state: State, upstream_states: Dict[Edge, State], map_index: int
+    ) -> Dict[Edge, State]:
+        """
+        Returns the upstream states of the child of a mapped task with the given
+        `map_index`, as `get_map_upstream_states` generates them.
+
+        Args:
+            - state (State): the current task state
+            - upstream_states (Dict[Edge, State]): the upstream states
+            - map_index (int): the index of the child
+
+        Returns:
+            - Dict[Edge, State]: the upstream states of the child
+
+        Raises:
+            - IndexError: if any of the mapped iterables has no item at `map_index`
+        """
+        i = map_index
+        states = {}
+
+        for edge, upstream_state in upstream_states.items():
+
+            # if the edge is not mapped over, then we simply take its state
+            if not edge.mapped:
+                states[edge] = upstream_state
+
+            # if the edge is mapped and the upstream state is Mapped, then we are mapping
+            # over a mapped task. In this case, we take the appropriately-indexed upstream
+            # state from the upstream tasks's `Mapped.map_states` array.
+            # Note that these "states" might actually be futures at this time; we aren't
+            # blocking until they finish.
+            elif edge.mapped and upstream_state.is_mapped():
+                states[edge] = upstream_state.map_states[i]  # type: ignore
+
+            # Otherwise, we are mapping over the result of a "vanilla" task. In this
+            # case, we create a copy of the upstream state but set the result to the
+            # appropriately-indexed item from the upstream task's `State.result`
+            # array.
+            else:
+                states[edge] = copy.copy(upstream_state)
+
+                # if the current state is already Mapped, then we might be executing
+                # a re-run of the mapping pipeline. In that case, the upstream states
+                # might not have `result` attributes (as any required results could be
+                # in the `cached_inputs` attribute of one of the child states).
+                # Therefore, we only try to get a result if EITHER this task's
+                # state is not already mapped OR the upstream result is not None.
+                if not state.is_mapped() or upstream_state.result != NoResult:
+                    upstream_result = Result(
+                        upstream_state.result[i],
+                        result_handler=upstream_state._result.result_handler,  # type: ignore
+                    )
+                    states[edge].result = upstream_result
+                elif state.is_mapped():
+                    if i >= len(state.map_states):  # type: ignore
+                        raise IndexError()
+
+        return states
+
+    def count_map_children(
+        self, state: State, upstream_states: Dict[Edge, State]
+    ) -> int:
+        """
+        Counts the children of a mapped task, which is the number of upstream states
+        `get_map_upstream_states` generates, without generating them.
+
+        Args:
+            - state (State): the current task state
+            - upstream_states (Dict[Edge, State]): the upstream states
+
+        Returns:
+            - int: the number of children
+        """
+        counts = []
+        for edge, upstream_state in upstream_states.items():
+            if not edge.mapped:
+                continue
+            elif upstream_state.is_mapped():
+                counts.append(len(upstream_state.map_states))  # type: ignore
+            elif not state.is_mapped() or upstream_state.result != NoResult:
+                counts.append(len(upstream_state.result))
+            else:
+                counts.append(len(state.map_states))  # type: ignore
+        return min(counts) if counts else 0
+
     def run_mapped_task(
         self,
         state: State,
@@ -658,6 +969,16 @@ class TaskRunner(Runner):
         """
         If the task is being mapped, submits children tasks for execution. Returns a `Mapped` state.
 
+        The upstream states of each child are generated as the child is submitted, and
+        children that have already finished (for instance, when a `Mapped` task is run
+        again) keep their states rather than being submitted again.
+
+        If the task's `map_chunk_size` is greater than 1, children are grouped into chunks
+        that each run as a single unit of work for the executor; the chunks' states are
+        flattened into the states of the children by `wait_for_mapped_task`. Executors
+        that await coroutines (see `AsyncioExecutor`) instead run each child as a
+        coroutine.
+
         Args:
             - state (State): the current task state
             - upstream_states (Dict[Edge, State]): the upstream states
@@ -670,69 +991,16 @@ class TaskRunner(Runner):
         Raises:
             - ENDRUN: if the current state is not `Running`
         """
+        n_children = self.count_map_children(
+            state=state, upstream_states=upstream_states
+        )
 
-        map_upstream_states = []
-
-        # we don't know how long the iterables are, but we want to iterate until we reach
-        # the end of the shortest one
-        counter = itertools.count()
-
-        # infinite loop, if upstream_states has any entries
-        while True and upstream_states:
-            i = next(counter)
-            states = {}
-
-            try:
-
-                for edge, upstream_state in upstream_states.items():
-
-                    # if the edge is not mapped over, then we simply take its state
-                    if not edge.mapped:
-                        states[edge] = upstream_state
-
-                    # if the edge is mapped and the upstream state is Mapped, then we are mapping
-                    # over a mapped task. In this case, we take the appropriately-indexed upstream
-                    # state from the upstream tasks's `Mapped.map_states` array.
-                    # Note that these "states" might actually be futures at this time; we aren't
-                    # blocking until they finish.
-                    elif edge.mapped and upstream_state.is_mapped():
-                        states[edge] = upstream_state.map_states[i]  # type: ignore
-
-                    # Otherwise, we are mapping over the result of a "vanilla" task. In this
-                    # case, we create a copy of the upstream state but set the result to the
-                    # appropriately-indexed item from the upstream task's `State.result`
-                    # array.
-                    else:
-                        states[edge] = copy.copy(upstream_state)
-
-                        # if the current state is already Mapped, then we might be executing
-                        # a re-run of the mapping pipeline. In that case, the upstream states
-                        # might not have `result` attributes (as any required results could be
-                        # in the `cached_inputs` attribute of one of the child states).
-                        # Therefore, we only try to get a result if EITHER this task's
-                        # state is not already mapped OR the upstream result is not None.
-                        if not state.is_mapped() or upstream_state.result != NoResult:
-                            upstream_result = Result(
-                                upstream_state.result[i],
-                                result_handler=upstream_state._result.result_handler,  # type: ignore
-                            )
-                            states[edge].result = upstream_result
-                        elif state.is_mapped():
-                            if i >= len(state.map_states):  # type: ignore
-                                raise IndexError()
-
-                # only add this iteration if we made it through all iterables
-                map_upstream_states.append(states)
-
-            # index error means we reached the end of the shortest iterable
-            except IndexError:
-                break
-
-        def run_fn(
-            state: State, map_index: int, upstream_states: Dict[Edge, State]
-        ) -> State:
+        def run_fn(child: Tuple[Optional[State], int, Dict[Edge, State]]) -> State:
+            state, map_index, upstream_states = child
             map_context = context.copy()
-            map_context.update(map_index=map_index)
+            # the flow runner doesn't see the children, so it can't resubmit them for
+            # retries (see `FlowRunner.submit_ready_tasks`)
+            map_context.update(map_index=map_index, resubmit_retries=False)
             with prefect.context(self.context):
                 return self.run(
                     upstream_states=upstream_states,
@@ -744,10 +1012,34 @@ class TaskRunner(Runner):
 
         # generate initial states, if available
         if isinstance(state, Mapped):
-            initial_states = list(state.map_states)  # type: List[Optional[State]]
+            initial_states = list(state.map_states)[:n_children]  # type: List[Any]
         else:
             initial_states = []
-        initial_states.extend([None] * (len(map_upstream_states) - len(initial_states)))
+        initial_states.extend([None] * (n_children - len(initial_states)))
+
+        def is_finished(child_state: Any) -> bool:
+            return (
+                isinstance(child_state, State)
+                and child_state.is_finished()
+                and not child_state.is_cached()
+            )
+
+        # finished children would end their runs right away, so they aren't submitted;
+        # the others are generated as they are submitted, but can still be counted, so
+        # that executors can submit them all at once
+        get_upstream_states = partial(
+            self.get_map_child_upstream_states,
+            state=state,
+            upstream_states=upstream_states,
+        )
+        children = LazySequence(
+            lambda map_index: (
+                initial_states[map_index],
+                map_index,
+                get_upstream_states(map_index=map_index),
+            ),
+            [i for i, s in enumerate(initial_states) if not is_finished(s)],
+        )
 
         current_state = Mapped(  # type: ignore
             message="Preparing to submit {} mapped tasks.".format(len(initial_states)),
@@ -757,14 +1049,58 @@ class TaskRunner(Runner):
         if state is not current_state:
             return state
 
-        # map over the initial states, a counter representing the map_index, and also the mapped upstream states
-        map_states = executor.map(
-            run_fn, initial_states, range(len(map_upstream_states)), map_upstream_states
-        )
+        # tasks unpickled from flows stored before chunking existed have no chunk size
+        chunk_size = getattr(self.task, "map_chunk_size", 1)
+        if executor.awaits_coroutines:
+
+            async def run_fn_async(
+                child: Tuple[Optional[State], int, Dict[Edge, State]]
+            ) -> State:
+                state, map_index, upstream_states = child
+                map_context = context.copy()
+                map_context.update(map_index=map_index, resubmit_retries=False)
+                with prefect.context(self.context):
+                    return await self.run_async(
+                        upstream_states=upstream_states,
+                        state=state,
+                        context=map_context,
+                        executor=executor,
+                    )
+
+            # the children run as concurrent coroutines, so they are never chunked
+            submitted = executor.map(run_fn_async, children)
+        elif chunk_size > 1:
+
+            def run_chunk(
+                chunk: List[Tuple[Optional[State], int, Dict[Edge, State]]]
+            ) -> List[State]:
+                return [run_fn(child) for child in chunk]
+
+            chunks = LazySequence(
+                lambda start: list(children[start : start + chunk_size]),
+                range(0, len(children), chunk_size),
+            )
+
+            # run the children in chunks, each of which is a single unit of work for the
+            # executor; each child refers to its chunk until the chunks are waited for
+            submitted = [
+                _ChunkChild(chunk, i)
+                for start, chunk in zip(
+                    range(0, len(children), chunk_size),
+                    executor.map(run_chunk, chunks),
+                )
+                for i in range(min(chunk_size, len(children) - start))
+            ]
+        else:
+            submitted = executor.map(run_fn, children)
 
         self.logger.debug(
-            "{} mapped tasks submitted for execution.".format(len(map_states))
+            "{} mapped tasks submitted for execution.".format(len(submitted))
         )
+        submitted_states = iter(submitted)
+        map_states = [
+            s if is_finished(s) else next(submitted_states) for s in initial_states
+        ]
         new_state = Mapped(
             message="Mapped tasks submitted for execution.", map_states=map_states
         )
@@ -775,7 +1111,9 @@ class TaskRunner(Runner):
         self, state: State, executor: "prefect.engine.executors.Executor"
     ) -> State:
         """
-        Blocks until a mapped state's children have finished running.
+        Blocks until a mapped state's children have finished running. The children that
+        ran in chunks (see `run_mapped_task`) get their states from the states of their
+        chunk.
 
         Args:
             - state (State): the current `Mapped` state
@@ -786,7 +1124,7 @@ class TaskRunner(Runner):
         """
         if state.is_mapped():
             assert isinstance(state, Mapped)  # mypy assert
-            state.map_states = executor.wait(state.map_states)
+            state.map_states.resolve(partial(_wait_for_children, executor))
         return state
 
     @call_state_handlers
@@ -814,6 +1152,27 @@ class TaskRunner(Runner):
 
         return Running(message="Starting task run.")
 
+    @run_with_heartbeat
+    async def _await_task_run(self, inputs: Dict[str, Result]) -> Callable:
+        # awaits `self.task.run` under the task's timeout (heartbeating while it runs),
+        # and returns a timeout handler that replays its outcome in `get_task_run_state`
+        raw_inputs = {k: r.value for k, r in inputs.items()}
+        result, error = None, None  # type: Any, Optional[Exception]
+        try:
+            run = cast(Callable[..., Awaitable[Any]], self.task.run)
+            result = await asyncio.wait_for(run(**raw_inputs), self.task.timeout)
+        except asyncio.TimeoutError:
+            error = TimeoutError("Execution timed out.")
+        except Exception as exc:
+            error = exc
+
+        def replay(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+            if error is not None:
+                raise error
+            return result
+
+        return replay
+
     @run_with_heartbeat
     @call_state_handlers
     def get_task_run_state(
@@ -888,6 +1247,18 @@ class TaskRunner(Runner):
         result = Result(value=result, result_handler=self.result_handler)
         state = Success(result=result, message="Task run succeeded.")
 
+        ## checkpoint the result under the task's fingerprint when running incrementally
+        fingerprint = prefect.context.get("task_fingerprint")
+        if (
+            fingerprint is not None
+            and prefect.config.flows.incremental
+            and self.task.checkpoint
+            and self.result_handler is not None
+        ):
+            loc = self.result_handler.write_checkpoint(fingerprint, result.value)
+            if loc is not None:
+                result.safe_value = SafeResult(loc, result_handler=self.result_handler)
+
         ## only checkpoint tasks if checkpointing is turned on
         if (
             state.is_successful()
@@ -1003,22 +1374,23 @@ class TaskRunner(Runner):
             - `State` object representing the final post-run state of the Task
         """
         if state.is_looped():
-            assert isinstance(state, Looped)  # mypy assert
             assert isinstance(context, dict)  # mypy assert
-            msg = "Looping task (on loop index {})".format(state.loop_count)
-            context.update(
-                {
-                    "task_loop_result": state.result,
-                    "task_loop_count": state.loop_count + 1,
-                }
-            )
-            context.update(task_run_version=prefect.context.get("task_run_version"))
-            new_state = Pending(message=msg)
             return self.run(
-                new_state,
+                self._start_next_loop(state, context=context),
                 upstream_states=upstream_states,
                 context=context,
                 executor=executor,
             )
 
         return state
+
+    def _start_next_loop(self, state: State, context: Dict[str, Any]) -> State:
+        # updates the context for the next iteration of a looping task, and returns the
+        # state to start it from
+        assert isinstance(state, Looped)  # mypy assert
+        msg = "Looping task (on loop index {})".format(state.loop_count)
+        context.update(
+            {"task_loop_result": state.result, "task_loop_count": state.loop_count + 1}
+        )
+        context.update(task_run_version=prefect.context.get("task_run_version"))
+        return Pending(message=msg)
@@ -1,7 +1,7 @@
 import collections
 import json
-from collections.abc import MutableMapping
-from typing import Any, Generator, Iterable, Iterator, Union, cast
+from collections.abc import MutableMapping, Sequence
+from typing import Any, Callable, Generator, Iterable, Iterator, Union, cast
 
 DictLike = Union[dict, "DotDict"]
 
@@ -170,6 +170,40 @@ def as_nested_dict(
     return obj
 
 
+class LazySequence(Sequence):
+    """
+    A read-only sequence whose items are computed on access, by calling `fn` with the
+    corresponding item of `seq`. Unlike a generator, it has a length, so it can be passed
+    to functions that only accept sized iterables (such as `Client.map` in Dask).
+
+    Example:
+        ```python
+        squares = LazySequence(lambda x: x ** 2, range(10**9))
+        len(squares) # 1000000000
+        squares[3] # 9
+        ```
+
+    Args:
+        - fn (Callable): the function computing each item
+        - seq (Sequence): the items `fn` is called with
+    """
+
+    def __init__(self, fn: Callable, seq: Sequence):
+        self._fn = fn
+        self._seq = seq
+
+    def __len__(self) -> int:
+        return len(self._seq)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return LazySequence(self._fn, self._seq[index])
+        return self._fn(self._seq[index])
+
+    def __repr__(self) -> str:
+        return "<LazySequence: {} items>".format(len(self))
+
+
 class CompoundKey(tuple):
     pass
 
@@ -56,18 +56,63 @@ Users can also provide values to context at runtime.
 
 import contextlib
 import threading
-from typing import Any, Iterator, MutableMapping
+from typing import Any, Dict, Iterator, MutableMapping, Optional, Tuple
 
 from prefect.configuration import config, Config
 from prefect.utilities.collections import DotDict, as_nested_dict, merge_dicts
 
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python < 3.7
 
-class Context(DotDict, threading.local):
+    class ContextVar:  # type: ignore
+        """
+        A thread-local stand-in for `contextvars.ContextVar`, for Pythons without the
+        `contextvars` module; asyncio tasks share the context of their thread.
+        """
+
+        def __init__(self, name: str, default: Any) -> None:
+            self.name = name
+            self.default = default
+            self.local = threading.local()
+
+        def get(self) -> Any:
+            return getattr(self.local, "value", self.default)
+
+        def set(self, value: Any) -> None:
+            self.local.value = value
+
+
+# marks keys deleted in a layer, which may still be set in the layers below it
+_DELETED = object()
+
+
+class _Layer(dict):
+    """
+    A layer of the context, holding the keys set in it. Layers are never modified once
+    pushed, so each one caches the values of the context up to and including it.
+    """
+
+    __slots__ = ("flattened",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.flattened = None  # type: Optional[Dict[str, Any]]
+
+
+class Context(DotDict):
     """
     A thread safe context store for Prefect data.
 
     The `Context` is a `DotDict` subclass, and can be instantiated the same way.
 
+    The context is stored as a stack of layers, each holding only the keys set in it, in
+    a `contextvars.ContextVar`. Entering the context manager pushes a layer and exiting
+    it pops the layer, so neither copies the rest of the context. New threads start with
+    the context the `Context` was created with, while asyncio tasks start with a copy of
+    the context they were created in (on Python < 3.7, which has no `contextvars`, they
+    share the context of their thread).
+
     Args:
         - *args (Any): arguments to provide to the `DotDict` constructor (e.g.,
             an initial dictionary)
@@ -75,18 +120,110 @@ class Context(DotDict, threading.local):
     """
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
+        base = dict(*args, **kwargs)
         if "context" in config:
-            self.update(config.context)
-        if "config" in self:
-            new_config = merge_dicts(config, self["config"])  # order matters
-            self["config"] = as_nested_dict(new_config, dct_class=Config)
+            base.update(config.context)
+        if "config" in base:
+            new_config = merge_dicts(config, base["config"])  # order matters
+            base["config"] = as_nested_dict(new_config, dct_class=Config)
         else:
-            self["config"] = config
+            base["config"] = config
+        layers = ContextVar(
+            "prefect.context", default=(_Layer(base),)
+        )  # type: ContextVar[Tuple[_Layer, ...]]
+        object.__setattr__(self, "_layers", layers)
 
     def __repr__(self) -> str:
         return "<Context>"
 
+    def __getitem__(self, key: str) -> Any:
+        for layer in reversed(self._layers.get()):
+            if key in layer:
+                value = layer[key]
+                if value is _DELETED:
+                    break
+                return value
+        raise KeyError(key)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr == "_layers":  # not set yet, for example while unpickling
+            raise AttributeError(attr)
+        try:
+            return self[attr]
+        except KeyError:
+            raise AttributeError(attr) from None
+
+    def __delattr__(self, attr: str) -> None:
+        try:
+            del self[attr]
+        except KeyError:
+            raise AttributeError(attr) from None
+
+    def _set_top_layer(self, **values: Any) -> None:
+        # layers are shared with nested contexts and asyncio tasks, so they are
+        # replaced rather than modified
+        layers = self._layers.get()
+        self._layers.set(layers[:-1] + (_Layer(layers[-1], **values),))
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._set_top_layer(**{key: value})
+
+    def __delitem__(self, key: str) -> None:
+        self[key]  # raises a KeyError for missing keys
+        self._set_top_layer(**{key: _DELETED})
+
+    def update(self, *args: Any, **kwargs: Any) -> None:  # type: ignore
+        """
+        Sets several keys at once, in the innermost layer of the context
+
+        Args:
+            - *args (Any): a dictionary of keys and values to set
+            - **kwargs (Any): keys and values to set
+        """
+        self._set_top_layer(**dict(*args, **kwargs))
+
+    def clear(self) -> None:
+        """Removes all keys from the context, until the innermost layer is exited"""
+        self._set_top_layer(**{key: _DELETED for key in self})
+
+    def _flatten(self) -> Dict[str, Any]:
+        # the values are built from the highest layer that has cached them, so each
+        # layer is only flattened once; the returned dictionary must not be modified
+        layers = self._layers.get()
+        start = len(layers)
+        while start and layers[start - 1].flattened is None:
+            start -= 1
+        values = layers[start - 1].flattened if start else {}  # type: Dict[str, Any]
+        for layer in layers[start:]:
+            values = dict(values)
+            for key, value in layer.items():
+                if value is _DELETED:
+                    values.pop(key, None)
+                else:
+                    values[key] = value
+            layer.flattened = values
+        return values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._flatten())
+
+    def __len__(self) -> int:
+        return len(self._flatten())
+
+    def copy(self) -> "Context":
+        """Creates and returns a new `Context` holding the current values"""
+        new_context = type(self).__new__(type(self))
+        layers = ContextVar("prefect.context", default=(_Layer(self._flatten()),))
+        object.__setattr__(new_context, "_layers", layers)
+        return new_context
+
+    def to_dict(self) -> dict:
+        """
+        Converts the current context (and any `DotDict`s contained within) to an
+        appropriate nested dictionary.
+        """
+        return as_nested_dict(self._flatten(), dct_class=dict)  # type: ignore
+
     @contextlib.contextmanager
     def __call__(self, *args: MutableMapping, **kwargs: Any) -> Iterator["Context"]:
         """
@@ -97,17 +234,29 @@ class Context(DotDict, threading.local):
             with prefect.context(dict(a=1, b=2), c=3):
                 print(prefect.context.a) # 1
         """
-        previous_context = self.copy()
+        previous_layers = self._layers.get()
         try:
-            new_context = dict(*args, **kwargs)
+            new_context = _Layer(*args, **kwargs)
+            # contexts copied from this one carry a config with the same values as the
+            # current one, which is kept rather than merged again (unless either is the
+            # global config, which is copied so that later changes to it don't affect
+            # this context)
             if "config" in new_context:
-                new_config = merge_dicts(self.get("config", {}), new_context["config"])
-                new_context["config"] = as_nested_dict(new_config, dct_class=Config)
-            self.update(new_context)  # type: ignore
+                new_config = new_context["config"]
+                current_config = self.get("config", {})
+                if (
+                    config is not new_config
+                    and config is not current_config
+                    and (new_config is current_config or new_config == current_config)
+                ):
+                    new_context["config"] = current_config
+                else:
+                    new_config = merge_dicts(current_config, new_config)
+                    new_context["config"] = as_nested_dict(new_config, dct_class=Config)
+            self._layers.set(previous_layers + (new_context,))
             yield self
         finally:
-            self.clear()
-            self.update(previous_context)
+            self._layers.set(previous_layers)
 
 
 context = Context()
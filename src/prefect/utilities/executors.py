@@ -1,11 +1,36 @@
+import asyncio
+import collections
 import datetime
+import inspect
+import itertools
+import multiprocessing
+import os
 import signal
 import threading
-from concurrent.futures import ThreadPoolExecutor
+import time
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
 from functools import wraps
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
+import cloudpickle
 import dask
 import dask.bag
 
@@ -15,8 +40,10 @@ from prefect.core.edge import Edge
 if TYPE_CHECKING:
     import prefect.engine.runner
     import prefect.engine.state
+    from prefect.engine.runner import Runner
     from prefect.engine.state import State
 StateList = Union["State", List["State"]]
+F = TypeVar("F", bound=Callable[..., Any])
 
 
 class Heartbeat(threading.Timer):
@@ -27,32 +54,405 @@ class Heartbeat(threading.Timer):
             self.finished.wait(self.interval)  # type: ignore
 
 
-def run_with_heartbeat(
-    runner_method: Callable[..., "prefect.engine.state.State"]
-) -> Callable[..., "prefect.engine.state.State"]:
+class HeartbeatManager:
+    """
+    Sends the heartbeats of every runner in the process that is running a method
+    decorated with `run_with_heartbeat`, from a single thread.
+
+    Runners register with the heartbeat interval they were started with; the thread
+    wakes up at the shortest registered interval and heartbeats all registered runners
+    at once, grouped by class, with a single call to each class's `_heartbeat_many`
+    (for example, `CloudTaskRunner` sends the heartbeats of all of its task runs in one
+    request). The thread is started by the first registration and exits once no runners
+    are registered.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._runners = {}  # type: Dict[int, Tuple[Runner, float]]
+        self._intervals = collections.Counter()  # type: collections.Counter
+        self._keys = itertools.count()
+        self._thread = None  # type: Optional[threading.Thread]
+        self._pid = os.getpid()
+
+    def register(self, runner: "Runner", interval: float) -> int:
+        """
+        Starts heartbeating a runner.
+
+        Args:
+            - runner (Runner): the runner to heartbeat
+            - interval (float): the maximum time between two heartbeats, in seconds
+
+        Returns:
+            - int: a key that unregisters the runner (see `unregister`)
+        """
+        with self._condition:
+            # the thread doesn't survive a fork, so forked processes start their own
+            if self._pid != os.getpid():
+                self._runners.clear()
+                self._intervals.clear()
+                self._thread = None
+                self._pid = os.getpid()
+
+            # the thread only needs waking if its next heartbeat is now due sooner
+            if self._intervals and interval < min(self._intervals):
+                self._condition.notify()
+            key = next(self._keys)
+            self._runners[key] = (runner, interval)
+            self._intervals[interval] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="PrefectHeartbeat", daemon=True
+                )
+                self._thread.start()
+        return key
+
+    def unregister(self, key: int) -> None:
+        """
+        Stops heartbeating a runner.
+
+        Args:
+            - key (int): the key returned when the runner was registered
+        """
+        with self._condition:
+            _, interval = self._runners.pop(key, (None, None))
+            if interval is not None:
+                self._intervals[interval] -= 1
+                if not self._intervals[interval]:
+                    del self._intervals[interval]
+            if not self._runners:
+                self._condition.notify()
+
+    def _run(self) -> None:
+        last_beat = time.monotonic()
+        with self._condition:
+            while self._runners:
+                next_beat = last_beat + min(self._intervals)
+                now = time.monotonic()
+                if now < next_beat:
+                    self._condition.wait(next_beat - now)
+                    continue
+                last_beat = now
+                runners = [runner for runner, _ in self._runners.values()]
+                self._condition.release()
+                try:
+                    self._heartbeat(runners)
+                finally:
+                    self._condition.acquire()
+            self._thread = None
+
+    @staticmethod
+    def _heartbeat(runners: List["Runner"]) -> None:
+        by_class = collections.OrderedDict()  # type: Dict[Type[Runner], List[Runner]]
+        for runner in runners:
+            by_class.setdefault(type(runner), []).append(runner)
+        for runner_cls, batch in by_class.items():
+            try:
+                runner_cls._heartbeat_many(batch)
+            except Exception:
+                pass
+
+
+_heartbeat_manager = HeartbeatManager()
+
+
+def run_with_heartbeat(runner_method: F) -> F:
     """
     Utility decorator for running class methods with a heartbeat.  The class should implement
-    `self._heartbeat` with no arguments.
+    `self._heartbeat` with no arguments, which is called once when the method starts; while
+    the method runs, the runner is then heartbeated every `cloud.heartbeat_interval` seconds
+    by a `HeartbeatManager` shared by the whole process, through the class's
+    `_heartbeat_many`. Coroutine methods are heartbeated while they are awaited.
     """
 
+    def start_heartbeat(self: "prefect.engine.runner.Runner") -> int:
+        try:
+            self._heartbeat()
+        except:
+            pass
+        return _heartbeat_manager.register(
+            self, prefect.config.cloud.heartbeat_interval
+        )
+
+    if inspect.iscoroutinefunction(runner_method):
+
+        @wraps(runner_method)
+        async def inner_async(
+            self: "prefect.engine.runner.Runner", *args: Any, **kwargs: Any
+        ) -> Any:
+            key = start_heartbeat(self)
+            try:
+                return await runner_method(self, *args, **kwargs)
+            finally:
+                _heartbeat_manager.unregister(key)
+
+        return cast(F, inner_async)
+
     @wraps(runner_method)
     def inner(
         self: "prefect.engine.runner.Runner", *args: Any, **kwargs: Any
     ) -> "prefect.engine.state.State":
+        key = start_heartbeat(self)
         try:
-            timer = Heartbeat(prefect.config.cloud.heartbeat_interval, self._heartbeat)
-            timer.daemon = True
-            try:
-                self._heartbeat()
-            except:
-                pass
-            timer.start()
             return runner_method(self, *args, **kwargs)
         finally:
-            timer.cancel()
-            timer.join()
+            _heartbeat_manager.unregister(key)
+
+    return cast(F, inner)
+
+
+def concurrency_limits(tags: Iterable[str]) -> Dict[str, int]:
+    """
+    Parses the concurrency limits declared by task tags of the form `"limit:NAME=N"`,
+    which allow at most `N` tasks tagged with the limit `NAME` to run at once.
 
-    return inner
+    Args:
+        - tags (Iterable[str]): the tags of a task
+
+    Returns:
+        - Dict[str, int]: the limit declared for each name
+
+    Raises:
+        - ValueError: if a limit tag is malformed
+    """
+    limits = {}
+    for tag in tags:
+        if not tag.lower().startswith("limit:"):
+            continue
+        name, _, value = tag[len("limit:") :].partition("=")
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = 0
+        if not name or limit < 1:
+            raise ValueError(
+                'Invalid concurrency limit tag "{}"; expected "limit:NAME=N" with N '
+                "a positive integer.".format(tag)
+            )
+        limits[name] = limit
+    return limits
+
+
+_slots_in_use = collections.Counter()  # type: collections.Counter
+_slots_condition = threading.Condition()
+
+
+@contextmanager
+def concurrency_slots(limits: Dict[str, int]) -> Iterator[None]:
+    """
+    Context manager that holds a slot under each of the provided concurrency limits
+    (see `concurrency_limits`) while it is entered, blocking until there are fewer
+    tasks holding a slot than each limit allows. Slots are shared by all threads of the
+    current process, and all of them are taken at once, so tasks with several limits
+    can't deadlock.
+
+    Args:
+        - limits (Dict[str, int]): the maximum number of slots for each name
+    """
+    if not limits:
+        yield
+        return
+
+    with _slots_condition:
+        _slots_condition.wait_for(
+            lambda: all(_slots_in_use[name] < n for name, n in limits.items())
+        )
+        _slots_in_use.update(limits.keys())
+    try:
+        yield
+    finally:
+        with _slots_condition:
+            _slots_in_use.subtract(limits.keys())
+            _slots_condition.notify_all()
+
+
+def running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """
+    Returns the event loop running in the current thread, if any.
+
+    Returns:
+        - AbstractEventLoop: the running event loop, or `None`
+    """
+    get_running_loop = getattr(asyncio, "_get_running_loop", None)
+    return get_running_loop() if get_running_loop is not None else None
+
+
+def run_coroutine(fn: Callable, *args: Any, timeout: int = None, **kwargs: Any) -> Any:
+    """
+    Runs a coroutine function to completion on a new event loop and returns its result.
+    If an event loop is already running in the current thread, the new loop is run in
+    another thread (with the current context), since loops can't be nested.
+
+    Args:
+        - fn (callable): the coroutine function to execute
+        - *args (Any): arguments to pass to the function
+        - timeout (int): the length of time to allow for
+            execution before raising a `TimeoutError`, represented as an integer in seconds
+        - **kwargs (Any): keyword arguments to pass to the function
+
+    Returns:
+        - the result of `await f(*args, **kwargs)`
+
+    Raises:
+        - TimeoutError: if function execution exceeds the allowed timeout
+    """
+    if running_loop() is not None:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            ctx = prefect.context.to_dict()
+
+            def run_with_ctx() -> Any:
+                with prefect.context(ctx):
+                    return run_coroutine(fn, *args, timeout=timeout, **kwargs)
+
+            return executor.submit(run_with_ctx).result()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(asyncio.wait_for(fn(*args, **kwargs), timeout))
+    except asyncio.TimeoutError:
+        raise TimeoutError("Execution timed out.")
+    finally:
+        loop.close()
+
+
+_timeout_pool = None  # type: Optional[ThreadPoolExecutor]
+_timeout_pool_pid = None  # type: Optional[int]
+_timeout_lock = threading.Lock()
+_timed_out = set()  # type: Set[Future]
+
+
+def _get_timeout_pool() -> ThreadPoolExecutor:
+    global _timeout_pool, _timeout_pool_pid
+    with _timeout_lock:
+        # the threads of a pool don't survive a fork, so forked processes get their own
+        if _timeout_pool is None or _timeout_pool_pid != os.getpid():
+            _timeout_pool = ThreadPoolExecutor(
+                max_workers=prefect.config.engine.timeouts.max_threads
+            )
+            _timeout_pool_pid = os.getpid()
+            _timed_out.clear()
+        return _timeout_pool
+
+
+def _forget_timed_out(future: Future) -> None:
+    with _timeout_lock:
+        _timed_out.discard(future)
+
+
+def _can_use_signals() -> bool:
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+        # don't clobber a handler or an alarm that is already in use, for example by an
+        # enclosing timeout
+        and signal.getsignal(signal.SIGALRM) == signal.SIG_DFL
+        and signal.getitimer(signal.ITIMER_REAL)[0] == 0
+    )
+
+
+def _signal_timeout(fn: Callable, *args: Any, timeout: int, **kwargs: Any) -> Any:
+    def handler(signum: int, frame: Any) -> None:
+        raise TimeoutError("Execution timed out.")
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _thread_timeout(fn: Callable, *args: Any, timeout: int, **kwargs: Any) -> Any:
+    started = threading.Event()
+    ctx = prefect.context.to_dict()
+
+    def run_with_ctx() -> Any:
+        started.set()
+        with prefect.context(ctx):
+            return fn(*args, **kwargs)
+
+    deadline = time.monotonic() + timeout
+    pool = _get_timeout_pool()
+    fut = pool.submit(run_with_ctx)
+
+    # the timeout includes the time spent waiting for a thread of the pool; if a thread
+    # picks the function up just as that wait times out, it gets whatever time is left
+    if not started.wait(timeout) and fut.cancel():
+        raise TimeoutError(
+            "Execution timed out: no thread was available to run the function "
+            "(engine.timeouts.max_threads = {}).".format(
+                prefect.config.engine.timeouts.max_threads
+            )
+        )
+
+    try:
+        return fut.result(timeout=max(deadline - time.monotonic(), 0))
+    except FutureTimeout:
+        with _timeout_lock:
+            _timed_out.add(fut)
+        fut.add_done_callback(_forget_timed_out)
+        logger = prefect.context.get("logger") or prefect.utilities.logging.get_logger(
+            "timeout_handler"
+        )
+        logger.warning(
+            "Execution timed out after {} seconds, but the function can't be stopped and "
+            "is still running in a background thread; {} timed out function(s) are "
+            "still running in this process, out of {} threads available for timeouts. "
+            "Set engine.timeouts.hard to run functions with a timeout in a subprocess "
+            "that is killed instead.".format(
+                timeout, len(_timed_out), prefect.config.engine.timeouts.max_threads
+            )
+        )
+        raise TimeoutError("Execution timed out.")
+
+
+def _run_in_subprocess(conn: Any, payload: bytes) -> None:
+    fn, args, kwargs, context = cloudpickle.loads(payload)
+    try:
+        with prefect.context(context):
+            result = cloudpickle.dumps((True, fn(*args, **kwargs)))
+    except Exception as exc:
+        try:
+            result = cloudpickle.dumps((False, exc))
+        except Exception:
+            result = cloudpickle.dumps((False, RuntimeError(repr(exc))))
+    conn.send_bytes(result)
+    conn.close()
+
+
+def _process_timeout(fn: Callable, *args: Any, timeout: int, **kwargs: Any) -> Any:
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    payload = cloudpickle.dumps((fn, args, kwargs, prefect.context.to_dict()))
+    process = multiprocessing.Process(target=_run_in_subprocess, args=(sender, payload))
+    process.start()
+    sender.close()
+    result = None  # type: Optional[bytes]
+    try:
+        if not receiver.poll(timeout):
+            raise TimeoutError("Execution timed out.")
+        try:
+            result = receiver.recv_bytes()
+        except EOFError:
+            pass
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        receiver.close()
+
+    if result is None:
+        raise RuntimeError(
+            "The process running the function exited unexpectedly with code {}.".format(
+                process.exitcode
+            )
+        )
+    succeeded, value = cloudpickle.loads(result)
+    if not succeeded:
+        raise value
+    return value
 
 
 def timeout_handler(
@@ -60,7 +460,18 @@ def timeout_handler(
 ) -> Any:
     """
     Helper function for implementing timeouts on function executions.
-    Implemented via `concurrent.futures.ThreadPoolExecutor`.
+
+    In the main thread (on platforms with `SIGALRM`), the timeout is enforced with a
+    signal, which interrupts the function. Elsewhere, the function runs on a pool of
+    threads shared by the whole process and bounded by `engine.timeouts.max_threads`;
+    a thread can't be stopped, so a function that times out keeps running in the
+    background, and the number of such functions is logged. If `engine.timeouts.hard`
+    is set, the function instead runs in a subprocess, which is killed when it times
+    out; its arguments and result must be serializable with `cloudpickle`. Daemonic
+    processes (such as Dask nanny workers) can't start subprocesses, so they fall back
+    to signals or threads, with a warning. Coroutine functions are run on an event
+    loop (see `run_coroutine`), which enforces the timeout. Time spent waiting for a
+    free thread counts towards the timeout.
 
     Args:
         - fn (callable): the function to execute
@@ -75,20 +486,20 @@ def timeout_handler(
     Raises:
         - TimeoutError: if function execution exceeds the allowed timeout
     """
+    if inspect.iscoroutinefunction(fn):
+        return run_coroutine(fn, *args, timeout=timeout, **kwargs)
+
     if timeout is None:
         return fn(*args, **kwargs)
 
-    executor = ThreadPoolExecutor()
-
-    def run_with_ctx(*args: Any, _ctx_dict: dict, **kwargs: Any) -> Any:
-        with prefect.context(_ctx_dict):
-            return fn(*args, **kwargs)
-
-    fut = executor.submit(
-        run_with_ctx, *args, _ctx_dict=prefect.context.to_dict(), **kwargs
-    )
-
-    try:
-        return fut.result(timeout=timeout)
-    except FutureTimeout:
-        raise TimeoutError("Execution timed out.")
+    if prefect.config.engine.timeouts.hard:
+        if not multiprocessing.current_process().daemon:
+            return _process_timeout(fn, *args, timeout=timeout, **kwargs)
+        warnings.warn(
+            "engine.timeouts.hard is set, but daemonic processes can't start "
+            "subprocesses; timeouts in this process can't kill the functions they "
+            "interrupt."
+        )
+    if _can_use_signals():
+        return _signal_timeout(fn, *args, timeout=timeout, **kwargs)
+    return _thread_timeout(fn, *args, timeout=timeout, **kwargs)
@@ -26,6 +26,10 @@ def tags(*tags: str) -> Iterator[None]:
         - *tags ([str]): a list of tags to apply to the tasks created within
             the context manager
 
+    Raises:
+        - ValueError: if a `"limit:NAME=N"` tag is malformed (see
+            `prefect.utilities.executors.concurrency_limits`)
+
     Example:
     ```python
     @task
@@ -39,6 +43,7 @@ def tags(*tags: str) -> Iterator[None]:
     print(result.tags) # {"function", "math"}
     ```
     """
+    prefect.utilities.executors.concurrency_limits(tags)
     tags_set = set(tags)
     tags_set.update(prefect.context.get("tags", set()))
     with prefect.context(tags=tags_set):
@@ -425,6 +425,22 @@ def test_set_task_run_state(patch_post):
     assert result is None
 
 
+def test_update_task_run_heartbeats_sends_one_request(patch_post):
+    response = {"data": {"task_run_0": {"success": True}}}
+    post = patch_post(response)
+
+    with set_temporary_config(
+        {"cloud.graphql": "http://my-cloud.foo", "cloud.auth_token": "secret_token"}
+    ):
+        client = Client()
+    client.update_task_run_heartbeats(["id-a", "id-b"])
+
+    assert post.call_count == 1
+    query = post.call_args[1]["json"]["query"]
+    assert 'task_run_0: updateTaskRunHeartbeat(input: { taskRunId: "id-a" })' in query
+    assert 'task_run_1: updateTaskRunHeartbeat(input: { taskRunId: "id-b" })' in query
+
+
 def test_set_task_run_state_serializes(patch_post):
     response = {"data": {"setTaskRunState": None}}
     post = patch_post(response)
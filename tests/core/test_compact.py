@@ -0,0 +1,197 @@
+import cloudpickle
+import pytest
+
+from prefect.core.compact import CompactFlow
+from prefect.core.edge import Edge
+from prefect.core.flow import Flow
+from prefect.core.task import Parameter, Task
+
+
+class AddTask(Task):
+    def run(self, x, y):
+        return x + y
+
+
+def build_flow(flow_class: type) -> Flow:
+    flow = flow_class(name="test")
+    t1, t2, t3, t4 = Task("1"), Task("2"), AddTask("3"), Task("4")
+    flow.add_edge(t1, t2)
+    flow.add_edge(t1, t3, key="x")
+    flow.add_edge(t2, t3, key="y", mapped=True)
+    flow.add_edge(t3, t4)
+    flow.add_task(Task("5"))
+    return flow
+
+
+class TestCompactFlow:
+    def test_compact_flow_is_a_flow(self):
+        assert isinstance(CompactFlow(name="test"), Flow)
+
+    def test_tasks_and_edges_match_flow(self):
+        flow = build_flow(Flow)
+        compact = CompactFlow(name="test", tasks=flow.tasks, edges=flow.edges)
+
+        assert compact.tasks == flow.tasks
+        assert compact.edges == flow.edges
+        assert set(compact.edges) == flow.edges
+        assert len(compact.edges) == 4
+
+    def test_edges_are_created_as_views(self):
+        flow = CompactFlow(name="test")
+        t1, t2 = Task(), Task()
+        edge = flow.add_edge(t1, t2, key="x", mapped=True)
+
+        (view,) = flow.edges
+        assert view == edge
+        assert view is not edge
+        assert edge in flow.edges
+        assert Edge(t1, t2, key="x") not in flow.edges
+        assert Edge(t1, t2, key="y", mapped=True) not in flow.edges
+        assert Edge(t1, Task(), key="x", mapped=True) not in flow.edges
+
+    def test_duplicate_edges_are_stored_once(self):
+        flow = CompactFlow(name="test")
+        t1, t2 = Task(), Task()
+        flow.add_edge(t1, t2)
+        flow.add_edge(t1, t2)
+        flow.add_edge(t1, t2, mapped=True)
+
+        assert len(flow.edges) == 2
+
+    def test_keys_are_interned(self):
+        flow = CompactFlow(name="test")
+        for _ in range(3):
+            flow.add_edge(Task(), AddTask(), key="x")
+
+        assert flow._keys == ["x"]
+
+    def test_adjacency_matches_flow(self):
+        flow = build_flow(Flow)
+        compact = CompactFlow(name="test", tasks=flow.tasks, edges=flow.edges)
+
+        for t in flow.tasks:
+            assert compact.edges_to(t) == flow.edges_to(t)
+            assert compact.edges_from(t) == flow.edges_from(t)
+            assert compact.upstream_tasks(t) == flow.upstream_tasks(t)
+            assert compact.downstream_tasks(t) == flow.downstream_tasks(t)
+        assert compact.root_tasks() == flow.root_tasks()
+        assert compact.terminal_tasks() == flow.terminal_tasks()
+        assert compact.all_upstream_edges() == flow.all_upstream_edges()
+
+    def test_sort_matches_flow(self):
+        flow = build_flow(Flow)
+        compact = CompactFlow(name="test")
+        for t in flow.sorted_tasks():
+            compact.add_task(t)
+        compact.update(flow)
+        t1 = flow.get_tasks(name="1")[0]
+        t3 = flow.get_tasks(name="3")[0]
+
+        assert compact.sorted_tasks() == flow.sorted_tasks()
+        assert compact.sorted_tasks([t3]) == flow.sorted_tasks([t3])
+        assert compact.sorted_tasks([t1]) == flow.sorted_tasks([t1])
+
+    def test_sort_is_updated_when_edges_are_added(self):
+        flow = CompactFlow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        flow.add_edge(t2, t3)
+        flow.add_task(t1)
+        assert flow.sorted_tasks() == (t2, t3, t1)
+
+        flow.add_edge(t1, t2)
+        assert flow.sorted_tasks() == (t1, t2, t3)
+
+    def test_cycles_are_detected(self):
+        flow = CompactFlow(name="test")
+        t1, t2, t3 = Task("1"), Task("2"), Task("3")
+        flow.add_edge(t1, t2)
+        flow.add_edge(t2, t3)
+        with pytest.raises(
+            ValueError, match="<Task: 1> -> <Task: 2> -> <Task: 3> -> <Task: 1>"
+        ):
+            flow.add_edge(t3, t1, validate=True)
+
+    def test_edge_keys_are_validated(self):
+        flow = CompactFlow(name="test")
+        t1, t2 = Task(), AddTask()
+        flow.add_edge(t1, t2, key="x")
+        with pytest.raises(ValueError, match="already been assigned"):
+            flow.add_edge(Task(), t2, key="x", validate=True)
+        with pytest.raises(TypeError):
+            flow.add_edge(Task(), t2, key="z", validate=True)
+
+    def test_batch_validates_edges(self):
+        flow = CompactFlow(name="test")
+        t1, t2 = Task(), Task()
+        with pytest.raises(ValueError, match="Cycle found"):
+            with flow.batch():
+                flow.add_edge(t1, t2, validate=True)
+                flow.add_edge(t2, t1, validate=True)
+
+    def test_parameters_cant_have_upstream_tasks(self):
+        flow = CompactFlow(name="test")
+        with pytest.raises(ValueError, match="Parameters must be root tasks"):
+            flow.add_edge(Task(), Parameter("p"))
+
+    def test_slugs_are_unique(self):
+        flow = CompactFlow(name="test")
+        flow.add_task(Task(slug="x"))
+        with pytest.raises(ValueError, match="already exists"):
+            flow.add_task(Task(slug="x"))
+
+    def test_replace(self):
+        flow = CompactFlow(name="test")
+        t1, t2, t3, t4 = Task(), AddTask(), Task(), AddTask()
+        flow.add_edge(t1, t2, key="x")
+        flow.add_edge(t2, t3)
+        flow.set_reference_tasks([t2])
+        flow.replace(t2, t4)
+
+        assert t2 not in flow.tasks
+        assert flow.edges == {Edge(t1, t4, key="x"), Edge(t4, t3)}
+        assert flow.reference_tasks() == {t4}
+        assert flow.sorted_tasks() == (t1, t4, t3)
+
+    def test_removing_tasks_renumbers_the_tasks_after_them(self):
+        flow = build_flow(Flow)
+        compact = CompactFlow(name="test", tasks=flow.tasks, edges=flow.edges)
+        t1, t2 = flow.get_tasks(name="1")[0], flow.get_tasks(name="2")[0]
+        t6, t7 = Task("6"), Task("7")
+        for f in (flow, compact):
+            f.replace(t1, t6)
+            f.replace(t2, t7)
+
+        assert compact.tasks == flow.tasks
+        assert compact.edges == flow.edges
+        assert all(e in compact.edges for e in flow.edges)
+        assert all(compact.edges_to(t) == flow.edges_to(t) for t in flow.tasks)
+        assert [t.name for t in compact.sorted_tasks()] == ["5", "6", "7", "3", "4"]
+
+    def test_copy_is_independent(self):
+        flow = build_flow(CompactFlow)
+        t4 = flow.get_tasks(name="4")[0]
+        new = flow.copy()
+        new.add_edge(t4, Task())
+
+        assert len(flow.edges) == 4
+        assert len(new.edges) == 5
+        assert flow.terminal_tasks() != new.terminal_tasks()
+
+    def test_pickling(self):
+        flow = build_flow(CompactFlow)
+        flow.sorted_tasks()
+        new = cloudpickle.loads(cloudpickle.dumps(flow))
+
+        assert new._csr_index is None
+        assert len(new.edges) == 4
+        assert [t.name for t in new.sorted_tasks()] == [
+            t.name for t in flow.sorted_tasks()
+        ]
+
+    def test_serialize(self):
+        flow = build_flow(Flow)
+        compact = CompactFlow(name="test", tasks=flow.tasks, edges=flow.edges)
+        serialized = compact.serialize()
+
+        assert len(serialized["tasks"]) == 5
+        assert len(serialized["edges"]) == 4
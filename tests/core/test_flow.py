@@ -183,6 +183,33 @@ def test_add_task_raise_an_error_if_the_task_is_not_a_task_class():
         f.add_task(1)
 
 
+def test_add_task_raises_for_duplicate_slugs():
+    f = Flow(name="test")
+    f.add_task(Task(slug="x"))
+    with pytest.raises(ValueError, match='slug "x" already exists'):
+        f.add_task(Task(slug="x"))
+
+
+def test_replace_frees_the_old_slug():
+    f = Flow(name="test")
+    t1 = Task(slug="x")
+    f.add_task(t1)
+    f.replace(t1, Task(slug="y"))
+    f.add_task(Task(slug="x"))
+    with pytest.raises(ValueError, match='slug "y" already exists'):
+        f.add_task(Task(slug="y"))
+
+
+def test_copied_flows_have_independent_slugs():
+    f = Flow(name="test")
+    f.add_task(Task(slug="x"))
+    f2 = f.copy()
+    f2.add_task(Task(slug="y"))
+    f.add_task(Task(slug="y"))
+    with pytest.raises(ValueError, match='slug "x" already exists'):
+        f2.add_task(Task(slug="x"))
+
+
 def test_set_dependencies_adds_all_arguments_to_flow():
     f = Flow(name="test")
 
@@ -525,6 +552,98 @@ def test_eager_cycle_detection_works():
     assert not prefect.config.flows.eager_edge_validation
 
 
+class TestBatch:
+    def test_batch_validates_once_on_exit(self, monkeypatch):
+        f = Flow(name="test")
+        validate = MagicMock()
+        monkeypatch.setattr(f, "validate", validate)
+        tasks = [Task() for _ in range(10)]
+
+        with f.batch():
+            for t1, t2 in zip(tasks, tasks[1:]):
+                f.add_edge(t1, t2, validate=True)
+            assert validate.call_count == 0
+
+        assert validate.call_count == 1
+
+    def test_batch_skips_validation_if_nothing_was_validated(self, monkeypatch):
+        f = Flow(name="test")
+        validate = MagicMock()
+        monkeypatch.setattr(f, "validate", validate)
+
+        with f.batch():
+            f.add_edge(Task(), Task(), validate=False)
+
+        assert validate.call_count == 0
+
+    def test_batch_respects_eager_edge_validation(self):
+        t1, t2 = Task(), Task()
+        f = Flow(name="test")
+        with set_temporary_config({"flows.eager_edge_validation": True}):
+            with pytest.raises(ValueError, match="Cycle found"):
+                with f.batch():
+                    f.add_edge(t1, t2)
+                    f.add_edge(t2, t1)
+
+    def test_batch_detects_cycles_on_exit(self):
+        t1, t2, t3 = Task("1"), Task("2"), Task("3")
+        f = Flow(name="test")
+        with pytest.raises(ValueError, match="<Task: 1> -> <Task: 2> -> <Task: 1>"):
+            with f.batch():
+                f.add_edge(t1, t2, validate=True)
+                f.add_edge(t2, t1, validate=True)
+                f.add_edge(t2, t3, validate=True)
+
+    def test_batch_detects_duplicate_keys_on_exit(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), AddTask()
+        with pytest.raises(ValueError, match='Argument "x" for task'):
+            with f.batch():
+                f.add_edge(t1, t3, key="x", validate=True)
+                f.add_edge(t2, t3, key="x", validate=True)
+
+    def test_batch_detects_invalid_keys_on_exit(self):
+        f = Flow(name="test")
+        with pytest.raises(TypeError):
+            with f.batch():
+                f.add_edge(Task(), Task(), key="x", validate=True)
+
+    def test_nested_batches_validate_on_outermost_exit(self, monkeypatch):
+        f = Flow(name="test")
+        validate = MagicMock()
+        monkeypatch.setattr(f, "validate", validate)
+
+        with f.batch():
+            with f.batch():
+                f.add_edge(Task(), Task(), validate=True)
+            assert validate.call_count == 0
+            f.add_edge(Task(), Task(), validate=True)
+
+        assert validate.call_count == 1
+
+    def test_batch_does_not_validate_after_errors(self, monkeypatch):
+        f = Flow(name="test")
+        validate = MagicMock()
+        monkeypatch.setattr(f, "validate", validate)
+
+        with pytest.raises(ZeroDivisionError):
+            with f.batch():
+                f.add_edge(Task(), Task(), validate=True)
+                1 / 0
+
+        assert validate.call_count == 0
+        f.add_edge(Task(), Task(), validate=True)
+        assert validate.call_count == 1
+
+    def test_flow_init_validates_edges_once(self, monkeypatch):
+        validate = MagicMock()
+        monkeypatch.setattr(Flow, "validate", validate)
+        tasks = [Task() for _ in range(10)]
+        edges = [Edge(t1, t2) for t1, t2 in zip(tasks, tasks[1:])]
+        Flow(name="test", edges=edges, validate=True)
+        assert validate.call_count == 1
+
+
 def test_copy():
     with Flow(name="test") as f:
         t1 = Task()
@@ -820,6 +939,60 @@ def test_sorted_tasks_with_start_task():
     assert set(f.sorted_tasks(root_tasks=[t3])) == set([t3, t4, t5])
 
 
+def test_sorted_tasks_breaks_ties_by_insertion_order():
+    f = Flow(name="test")
+    tasks = [Task(str(i)) for i in range(10)]
+    for t in reversed(tasks):
+        f.add_task(t)
+    bottleneck = Task("bottleneck")
+    for t in tasks:
+        f.add_edge(t, bottleneck)
+
+    assert f.sorted_tasks() == tuple(reversed(tasks)) + (bottleneck,)
+
+
+def test_sorted_tasks_with_start_task_ignores_tasks_outside_subgraph():
+    """
+    t1 -> t2 -> t3
+          t4 -> t3
+    """
+    f = Flow(name="test")
+    t1, t2, t3, t4 = Task("1"), Task("2"), Task("3"), Task("4")
+    f.add_edge(t1, t2)
+    f.add_edge(t2, t3)
+    f.add_edge(t4, t3)
+    assert f.sorted_tasks(root_tasks=[t2]) == (t2, t3)
+
+
+def test_sorted_tasks_handles_long_chains():
+    f = Flow(name="test")
+    tasks = [Task() for _ in range(5000)]
+    f.chain(*tasks, validate=False)
+    assert f.sorted_tasks() == tuple(tasks)
+
+
+def test_critical_path_lengths():
+    """
+    t1 -> t2 -> t3
+    t4 -> t3
+    t5
+    """
+    f = Flow(name="test")
+    t1, t2, t3, t4, t5 = [Task(str(i)) for i in range(1, 6)]
+    f.chain(t1, t2, t3)
+    f.add_edge(t4, t3)
+    f.add_task(t5)
+
+    assert f.critical_path_lengths() == {t1: 3, t2: 2, t3: 1, t4: 2, t5: 1}
+    assert f.critical_path_lengths(durations={t3: 0.5, t4: 10}) == {
+        t1: 2.5,
+        t2: 1.5,
+        t3: 0.5,
+        t4: 10.5,
+        t5: 1,
+    }
+
+
 def test_sorted_tasks_with_invalid_start_task():
     """
     t1 -> t2 -> t3 -> t4
@@ -901,6 +1074,26 @@ def test_validate_cycles():
         f.validate()
 
 
+def test_validate_cycles_reports_the_cycle():
+    f = Flow(name="test")
+    t1, t2, t3, t4 = Task("1"), Task("2"), Task("3"), Task("4")
+    f.add_edge(t1, t2)
+    f.add_edge(t2, t3)
+    f.add_edge(t3, t4)
+    f.add_edge(t4, t2)
+    with pytest.raises(ValueError) as exc:
+        f.validate()
+    assert "<Task: 2> -> <Task: 3> -> <Task: 4> -> <Task: 2>" in str(exc.value)
+
+
+def test_validate_self_cycles():
+    f = Flow(name="test")
+    t1 = Task("1")
+    f.add_edge(t1, t1)
+    with pytest.raises(ValueError, match="<Task: 1> -> <Task: 1>"):
+        f.validate()
+
+
 def test_validate_missing_edge_downstream_tasks():
     f = Flow(name="test")
     t1 = Task()
@@ -1275,6 +1468,131 @@ class TestCache:
         f.set_reference_tasks([t1])
         assert 1 not in f._cache
 
+    def test_cache_is_invalidated_by_direct_changes_that_keep_sizes(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        edge = f.add_edge(t1, t2)
+        f.add_task(t3)
+        f.set_reference_tasks([t2])
+        key = ("all_downstream_edges", ())
+
+        f.all_downstream_edges()
+        f._cache[key] = 1
+        f.edges.remove(edge)
+        f.edges.add(Edge(t1, t3))
+        assert f.all_downstream_edges() != 1
+
+        f._cache[key] = 1
+        f._reference_tasks.remove(t2)
+        f._reference_tasks.add(t3)
+        assert f.all_downstream_edges() != 1
+
+    def test_cache_compares_sets_assigned_directly_by_value(self):
+        f = Flow(name="test")
+        t1, t2 = Task(), Task()
+        f.add_edge(t1, t2)
+        f.edges = set(f.edges)
+        key = ("all_downstream_edges", ())
+
+        f.all_downstream_edges()
+        f._cache[key] = 1
+        assert f.all_downstream_edges() == 1
+        f.edges.pop()
+        assert f.all_downstream_edges() != 1
+
+
+class TestAdjacencyIndex:
+    def test_edges_are_indexed_as_they_are_added(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        e1 = f.add_edge(t1, t2)
+        e2 = f.add_edge(t1, t3)
+
+        assert f.edges_to(t2) == {e1}
+        assert f.edges_to(t3) == {e2}
+        assert f.edges_from(t1) == {e1, e2}
+        assert f.edges_to(t1) == set()
+
+    def test_edges_to_returns_a_copy_of_the_index(self):
+        f = Flow(name="test")
+        t1, t2 = Task(), Task()
+        f.add_edge(t1, t2)
+
+        f.edges_to(t2).clear()
+        f.edges_from(t1).clear()
+        assert f.upstream_tasks(t2) == {t1}
+        assert f.downstream_tasks(t1) == {t2}
+
+    def test_index_is_updated_by_replace(self):
+        f = Flow(name="test")
+        t1, t2, t3, t4 = Task(), Task(), Task(), Task()
+        f.add_edge(t1, t2)
+        f.add_edge(t2, t3)
+        f.replace(t2, t4)
+
+        assert f.downstream_tasks(t1) == {t4}
+        assert f.upstream_tasks(t3) == {t4}
+        assert f.upstream_tasks(t4) == {t1}
+        assert f.downstream_tasks(t4) == {t3}
+        assert t2 not in f._upstream_edges
+        assert t2 not in f._downstream_edges
+
+    def test_index_is_updated_by_update(self):
+        f1 = Flow(name="test")
+        f2 = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        f1.add_edge(t1, t2)
+        f2.add_edge(t2, t3)
+        f1.update(f2)
+
+        assert f1.upstream_tasks(t3) == {t2}
+        assert f1.downstream_tasks(t2) == {t3}
+
+    def test_copied_flows_have_independent_indices(self):
+        f = Flow(name="test")
+        t1, t2, t3 = Task(), Task(), Task()
+        f.add_edge(t1, t2)
+        f2 = f.copy()
+        f2.add_edge(t2, t3)
+
+        assert f.downstream_tasks(t2) == set()
+        assert f2.downstream_tasks(t2) == {t3}
+
+    def test_index_survives_pickling(self):
+        f = Flow(name="test")
+        t1, t2 = Task(), Task()
+        f.add_edge(t1, t2)
+        f2 = cloudpickle.loads(cloudpickle.dumps(f))
+        (new_t1,) = f2.root_tasks()
+        (new_t2,) = f2.terminal_tasks()
+
+        assert f2.downstream_tasks(new_t1) == {new_t2}
+        assert f2.upstream_tasks(new_t2) == {new_t1}
+
+    def test_flows_pickled_without_indices_rebuild_them(self):
+        f = Flow(name="test")
+        t1, t2 = Task(slug="t1"), Task(slug="t2")
+        f.add_edge(t1, t2)
+        f.set_reference_tasks([t2])
+
+        # flows pickled by older versions only have plain sets of tasks and edges
+        state = f.__dict__.copy()
+        for attr in ["_upstream_edges", "_downstream_edges", "_slugs"]:
+            del state[attr]
+        del state["_graph_version"], state["_deferred_edges"]
+        state.update(tasks={t1, t2}, edges=set(f.edges), _reference_tasks={t2})
+        old = Flow.__new__(Flow)
+        old.__setstate__(state)
+
+        f2 = cloudpickle.loads(cloudpickle.dumps(old))
+        new_t1 = f2.get_tasks(slug="t1")[0]
+        new_t2 = f2.get_tasks(slug="t2")[0]
+        assert f2.downstream_tasks(new_t1) == {new_t2}
+        assert f2.upstream_tasks(new_t2) == {new_t1}
+        assert f2.reference_tasks() == {new_t2}
+        with pytest.raises(ValueError, match="already exists"):
+            f2.add_task(Task(slug="t1"))
+
 
 class TestReplace:
     def test_replace_replaces_all_the_things(self):
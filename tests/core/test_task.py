@@ -1,3 +1,4 @@
+import inspect
 import json
 import logging
 import uuid
@@ -8,6 +9,7 @@ import pytest
 
 import prefect
 from prefect.core import Edge, Flow, Parameter, Task
+from prefect.core.task import _get_signature
 from prefect.engine.cache_validators import all_inputs, duration_only, never_use
 from prefect.engine.result_handlers import JSONResultHandler, ResultHandler
 from prefect.utilities.configuration import set_temporary_config
@@ -247,6 +249,16 @@ class TestCreateTask:
             r = Task()
         assert r.checkpoint is True
 
+    def test_create_task_with_and_without_map_chunk_size(self):
+        assert Task().map_chunk_size == 1
+        assert Task(map_chunk_size=100).map_chunk_size == 100
+
+        with set_temporary_config({"tasks.defaults.map_chunk_size": 10}):
+            assert Task().map_chunk_size == 10
+
+        with pytest.raises(ValueError, match="map_chunk_size"):
+            Task(map_chunk_size=0)
+
     @pytest.mark.xfail(reason="UX improvement for Core")
     def test_create_parameter_always_checkpoints(self):
         with set_temporary_config({"tasks.defaults.checkpoint": False}):
@@ -309,6 +321,16 @@ def test_tags():
         assert t5.tags == set(["test1", "test2", "test3"])
 
 
+@pytest.mark.parametrize("tag", ["limit:db", "limit:db=x", "limit:db=0"])
+def test_malformed_limit_tags_raise_when_the_task_is_created(tag):
+    with pytest.raises(ValueError, match="limit:NAME=N"):
+        Task(tags=[tag])
+
+    with prefect.context(tags=[tag]):
+        with pytest.raises(ValueError, match="limit:NAME=N"):
+            Task()
+
+
 class TestInputsOutputs:
     class add(Task):
         def run(self, x, y: int = 1) -> int:
@@ -339,6 +361,49 @@ class TestInputsOutputs:
             assert self.mult(x=1).outputs() == int
 
 
+class TestSignatureCache:
+    def test_copies_share_a_signature(self):
+        t1 = AddTask()
+        t2 = t1.copy()
+        sig = _get_signature(t1.run)
+
+        assert sig == inspect.signature(t1.run)
+        assert _get_signature(t2.run) is sig
+        assert _get_signature(AddTask.run) is not sig
+        assert list(_get_signature(AddTask.run).parameters) == ["self", "x", "y"]
+
+    def test_signature_is_only_computed_once(self, monkeypatch):
+        calls = []
+        signature = inspect.signature
+        monkeypatch.setattr(
+            inspect, "signature", lambda fn: calls.append(fn) or signature(fn)
+        )
+
+        class MyTask(Task):
+            def run(self, x):
+                pass
+
+        with Flow("test"):
+            for i in range(5):
+                MyTask()(x=i)
+
+        assert len(calls) == 1
+
+    def test_replaced_run_methods_are_inspected(self):
+        t = AddTask()
+        assert t.inputs().keys() == {"x", "y"}
+
+        t.run = lambda a, b, c: None
+        assert t.inputs().keys() == {"a", "b", "c"}
+        with Flow("test"):
+            t.bind(a=1, b=2, c=3)
+            with pytest.raises(TypeError):
+                t.copy().bind(x=1)
+
+    def test_callables_that_cant_be_weakly_referenced_are_inspected(self):
+        assert _get_signature(len) == inspect.signature(len)
+
+
 class TestTaskCopy:
     def test_copy_copies(self):
         class CopyTask(Task):
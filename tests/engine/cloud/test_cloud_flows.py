@@ -10,7 +10,7 @@ import pytest
 import prefect
 from prefect.client.client import Client, FlowRunInfoResult, TaskRunInfoResult
 from prefect.engine.cloud import CloudFlowRunner, CloudTaskRunner
-from prefect.engine.executors import LocalExecutor
+from prefect.engine.executors import LocalExecutor, ThreadPoolExecutor
 from prefect.engine.result_handlers import JSONResultHandler, ResultHandler
 from prefect.engine.state import (
     Failed,
@@ -493,6 +493,47 @@ def test_deep_map(monkeypatch, executor):
         )
 
 
+def test_depth_first_map_children_have_their_own_task_runners(monkeypatch):
+    flow_run_id = str(uuid.uuid4())
+
+    with prefect.Flow(name="test") as flow:
+        t1 = plus_one.map([0, 1, 2, 3])
+        t2 = plus_one.map(t1)
+
+    client = MockedCloudClient(
+        flow_runs=[FlowRun(id=flow_run_id)],
+        task_runs=[
+            TaskRun(id=str(uuid.uuid4()), task_slug=t.slug, flow_run_id=flow_run_id)
+            for t in flow.tasks
+        ],
+        monkeypatch=monkeypatch,
+    )
+
+    # records each child's task run id along with the runner that runs it
+    runs = []
+    initialize_run = CloudTaskRunner.initialize_run
+
+    def record_initialize_run(self, state, context):
+        result = initialize_run(self, state, context)
+        if context.get("map_index") is not None:
+            runs.append((self, self.task_run_id))
+        return result
+
+    monkeypatch.setattr(CloudTaskRunner, "initialize_run", record_initialize_run)
+
+    with set_temporary_config({"engine.flow_runner.depth_first_mapping": True}):
+        with prefect.context(flow_run_id=flow_run_id):
+            state = CloudFlowRunner(flow=flow).run(
+                return_tasks=flow.tasks, executor=ThreadPoolExecutor(max_workers=4)
+            )
+
+    assert state.is_successful()
+    assert state.result[t2].result == [2, 3, 4, 5]
+    assert len(runs) == 8
+    assert len({id(runner) for runner, _ in runs}) == 8
+    assert all(runner.task_run_id == task_run_id for runner, task_run_id in runs)
+
+
 @pytest.mark.parametrize("executor", ["local", "sync"], indirect=True)
 def test_deep_map_with_a_failure(monkeypatch, executor):
 
@@ -376,6 +376,31 @@ class TestHeartBeats:
         w = warning.pop()
         assert "Heartbeat failed for Task 'Task'" in repr(w.message)
 
+    def test_heartbeat_many_sends_one_request(self, monkeypatch):
+        client = MagicMock()
+        monkeypatch.setattr(
+            "prefect.engine.cloud.task_runner.Client", MagicMock(return_value=client)
+        )
+        runners = [CloudTaskRunner(task=Task()) for _ in range(3)]
+        runners[0].task_run_id = "id-0"
+        runners[1].task_run_id = "id-1"
+        runners[2].task_run_id = None
+        CloudTaskRunner._heartbeat_many(runners)
+        client.update_task_run_heartbeats.assert_called_once_with(["id-0", "id-1"])
+        assert not client.update_task_run_heartbeat.called
+
+    def test_heartbeat_many_traps_errors_caused_by_client(self, monkeypatch):
+        client = MagicMock(
+            update_task_run_heartbeats=MagicMock(side_effect=SyntaxError)
+        )
+        monkeypatch.setattr(
+            "prefect.engine.cloud.task_runner.Client", MagicMock(return_value=client)
+        )
+        runner = CloudTaskRunner(task=Task())
+        runner.task_run_id = "id"
+        with pytest.warns(UserWarning, match="Heartbeat failed for 1 task run"):
+            CloudTaskRunner._heartbeat_many([runner])
+
     @pytest.mark.parametrize(
         "executor", ["local", "sync", "mproc", "mthread"], indirect=True
     )
@@ -392,15 +417,17 @@ class TestHeartBeats:
                 time.sleep(2)
 
             def multiprocessing_helper(executor):
-                client = MagicMock()
+                client = MagicMock(
+                    update_task_run_heartbeat=MagicMock(side_effect=update),
+                    update_task_run_heartbeats=MagicMock(side_effect=update),
+                )
                 monkeypatch.setattr(
                     "prefect.engine.cloud.task_runner.Client",
                     MagicMock(return_value=client),
                 )
                 runner = CloudTaskRunner(task=sleeper)
-                runner._heartbeat = update
                 with set_temporary_config({"cloud.heartbeat_interval": 0.025}):
-                    return runner.run(executor=executor)
+                    return runner.run(executor=executor, context={"task_run_id": "id"})
 
             with executor.start():
                 fut = executor.submit(multiprocessing_helper, executor=executor)
@@ -426,15 +453,17 @@ class TestHeartBeats:
                 time.sleep(2)
 
             def multiprocessing_helper(executor):
-                client = MagicMock()
+                client = MagicMock(
+                    update_task_run_heartbeat=MagicMock(side_effect=update),
+                    update_task_run_heartbeats=MagicMock(side_effect=update),
+                )
                 monkeypatch.setattr(
                     "prefect.engine.cloud.task_runner.Client",
                     MagicMock(return_value=client),
                 )
                 runner = CloudTaskRunner(task=sleeper)
-                runner._heartbeat = update
                 with set_temporary_config({"cloud.heartbeat_interval": 0.025}):
-                    return runner.run(executor=executor)
+                    return runner.run(executor=executor, context={"task_run_id": "id"})
 
             with executor.start():
                 fut = executor.submit(multiprocessing_helper, executor=executor)
@@ -460,16 +489,18 @@ class TestHeartBeats:
                     f.write("called\n")
 
             def multiprocessing_helper(executor):
-                client = MagicMock()
+                client = MagicMock(
+                    update_task_run_heartbeat=MagicMock(side_effect=update),
+                    update_task_run_heartbeats=MagicMock(side_effect=update),
+                )
                 monkeypatch.setattr(
                     "prefect.engine.cloud.task_runner.Client",
                     MagicMock(return_value=client),
                 )
                 runner = CloudTaskRunner(task=Task())
                 runner.cache_result = lambda *args, **kwargs: time.sleep(0.2)
-                runner._heartbeat = update
                 with set_temporary_config({"cloud.heartbeat_interval": 0.05}):
-                    return runner.run(executor=executor)
+                    return runner.run(executor=executor, context={"task_run_id": "id"})
 
             with executor.start():
                 fut = executor.submit(multiprocessing_helper, executor=executor)
@@ -642,6 +673,73 @@ def test_task_runner_performs_retries_for_short_delays(client):
     assert versions == [1, 2, 3, 4, 5]
 
 
+def test_task_runner_sleeps_with_the_executor_for_short_retries(client):
+    global_list = []
+
+    @prefect.task(max_retries=2, retry_delay=datetime.timedelta(seconds=0))
+    def noop():
+        if len(global_list) < 2:
+            global_list.append(0)
+            raise ValueError("oops")
+
+    class SleepRecorder(prefect.engine.executors.LocalExecutor):
+        naps = []
+
+        def sleep(self, seconds):
+            self.naps.append(seconds)
+
+    client.get_task_run_info.side_effect = [MagicMock(version=i) for i in (4, 7)]
+    executor = SleepRecorder()
+    res = CloudTaskRunner(task=noop).run(
+        context={"task_run_version": 1},
+        state=None,
+        upstream_states={},
+        executor=executor,
+    )
+
+    assert res.is_successful()
+    assert len(executor.naps) == 2
+    assert client.get_task_run_info.call_count == 2
+    versions = [call[1]["version"] for call in client.set_task_run_state.call_args_list]
+    assert versions == [1, 2, 3, 4, 5, 6, 7, 8]
+
+
+def test_task_runner_returns_short_retries_to_be_resubmitted(client):
+    @prefect.task(max_retries=1, retry_delay=datetime.timedelta(seconds=0))
+    def noop():
+        raise ValueError("oops")
+
+    res = CloudTaskRunner(task=noop).run(
+        context={"task_run_version": 1, "resubmit_retries": True},
+        state=None,
+        upstream_states={},
+        executor=prefect.engine.executors.LocalExecutor(),
+    )
+
+    assert res.is_retrying()
+    assert client.get_task_run_info.call_count == 0
+    assert client.set_task_run_state.call_count == 3  # Running -> Failed -> Retrying
+
+
+def test_task_runner_updates_the_version_of_resubmitted_retries(client):
+    @prefect.task(max_retries=1, retry_delay=datetime.timedelta(seconds=0))
+    def noop():
+        pass
+
+    client.get_task_run_info.return_value = MagicMock(version=4)
+    res = CloudTaskRunner(task=noop).run(
+        context={"task_run_version": 1, "resubmit_retries": True},
+        state=Retrying(run_count=1),
+        upstream_states={},
+        executor=prefect.engine.executors.LocalExecutor(),
+    )
+
+    assert res.is_successful()
+    assert client.get_task_run_info.call_count == 1
+    versions = [call[1]["version"] for call in client.set_task_run_state.call_args_list]
+    assert versions == [4, 5]
+
+
 def test_task_runner_handles_looping(client):
     @prefect.task
     def looper():
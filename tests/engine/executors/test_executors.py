@@ -1,23 +1,33 @@
+import asyncio
 import datetime
 import logging
+import os
 import random
 import sys
 import tempfile
 import time
+import uuid
 from unittest.mock import MagicMock
 
 import cloudpickle
 import dask
 import pytest
+from distributed import Variable
 
 import prefect
 from prefect.engine.executors import (
+    AsyncioExecutor,
     DaskExecutor,
     Executor,
     LocalExecutor,
     LocalDaskExecutor,
+    ProcessPoolExecutor,
     SynchronousExecutor,
+    ThreadPoolExecutor,
 )
+from prefect.engine.executors.dask import FutureResult, _detach_result
+from prefect.engine.result import NoResult, Result
+from prefect.engine.state import Failed, Success
 
 
 class TestBaseExecutor:
@@ -37,6 +47,23 @@ class TestBaseExecutor:
         with Executor().start():
             assert True
 
+    def test_wait_any_treats_all_futures_as_complete(self):
+        assert Executor().wait_any({"a": 1, "b": 2}) == {"a", "b"}
+
+    def test_broadcast_returns_the_object(self):
+        obj = object()
+        assert Executor().broadcast(obj) is obj
+
+    def test_sleep_sleeps(self, monkeypatch):
+        sleep = MagicMock()
+        monkeypatch.setattr("prefect.engine.executors.base.time.sleep", sleep)
+        Executor().sleep(3)
+        sleep.assert_called_once_with(3)
+
+    def test_wait_for_states_defaults_to_wait(self):
+        states = {"a": Success(result=1)}
+        assert LocalExecutor().wait_for_states(states) == states
+
     def test_is_pickleable(self):
         e = Executor()
         post = cloudpickle.loads(cloudpickle.dumps(e))
@@ -160,6 +187,378 @@ class TestLocalExecutor:
         assert res == []
 
 
+class TestAsyncioExecutor:
+    def test_map_concurrency_defaults_to_config(self):
+        assert AsyncioExecutor().map_concurrency == 0
+        with prefect.utilities.configuration.set_temporary_config(
+            {"engine.executor.asyncio.map_concurrency": 5}
+        ):
+            assert AsyncioExecutor().map_concurrency == 5
+        assert AsyncioExecutor(map_concurrency=3).map_concurrency == 3
+
+    def test_awaits_coroutines(self):
+        assert AsyncioExecutor.awaits_coroutines
+        assert not LocalExecutor.awaits_coroutines
+
+    def test_submit_and_wait(self):
+        async def add(x, y):
+            await asyncio.sleep(0)
+            return x + y
+
+        e = AsyncioExecutor()
+        with e.start():
+            assert e.wait(e.submit(lambda: 1)) == 1
+            assert e.wait(e.submit(lambda x: x, x=1)) == 1
+            assert e.wait(e.submit(add, 1, y=2)) == 3
+            assert e.wait(1) == 1
+            assert e.wait(prefect) is prefect
+
+    def test_submit_resolves_futures_in_arguments(self):
+        async def one():
+            return 1
+
+        e = AsyncioExecutor()
+        with e.start():
+            f = e.submit(one)
+            g = e.submit(lambda x, ys, d: (x, ys, d), f, [f, 2], d=dict(a=f))
+            assert e.wait(g) == (1, [1, 2], dict(a=1))
+            assert e.wait(dict(f=f, g=2)) == dict(f=1, g=2)
+
+    def test_submitted_functions_run_concurrently(self):
+        async def nap():
+            await asyncio.sleep(0.5)
+
+        e = AsyncioExecutor()
+        with e.start():
+            start = time.time()
+            e.wait([e.submit(nap) for _ in range(20)])
+        assert time.time() - start < 2
+
+    def test_wait_reraises(self):
+        async def fail():
+            raise ValueError("bad")
+
+        e = AsyncioExecutor()
+        with e.start():
+            with pytest.raises(ValueError, match="bad"):
+                e.wait(e.submit(fail))
+
+    def test_wait_any_returns_completed_futures(self):
+        async def nap(t):
+            await asyncio.sleep(t)
+
+        e = AsyncioExecutor()
+        with e.start():
+            futures = dict(fast=e.submit(nap, 0), slow=e.submit(nap, 1))
+            assert e.wait_any(futures) == {"fast"}
+            assert e.wait_any(dict(futures, done=1)) == {"fast", "done"}
+
+    def test_wait_any_respects_timeout(self):
+        async def nap(t):
+            await asyncio.sleep(t)
+
+        e = AsyncioExecutor()
+        with e.start():
+            start = time.time()
+            assert e.wait_any(dict(slow=e.submit(nap, 1)), timeout=0.1) == set()
+            assert time.time() - start < 0.5
+
+    def test_map_iterates_over_multiple_args(self):
+        def map_fn(x, y):
+            return x + y
+
+        e = AsyncioExecutor()
+        with e.start():
+            res = e.wait(e.map(map_fn, [1, 2], [1, 3]))
+        assert res == [2, 5]
+
+    def test_map_doesnt_do_anything_for_empty_list_input(self):
+        def map_fn(*args):
+            raise ValueError("map_fn was called")
+
+        e = AsyncioExecutor()
+        with e.start():
+            res = e.wait(e.map(map_fn))
+        assert res == []
+
+    def test_map_respects_map_concurrency(self):
+        running = []
+        peak = []
+
+        async def map_fn(x):
+            running.append(x)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(x)
+            return x
+
+        e = AsyncioExecutor(map_concurrency=3)
+        with e.start():
+            res = e.wait(e.map(map_fn, list(range(10))))
+        assert res == list(range(10))
+        assert max(peak) == 3
+
+    def test_functions_submitted_from_the_loop_run_immediately(self):
+        e = AsyncioExecutor()
+
+        async def submit():
+            assert e.submit(lambda x: x + 1, 1) == 2
+            future = e.submit(asyncio.sleep, 0.01, 5)
+            with pytest.raises(RuntimeError, match="must be done"):
+                e.wait(future)
+            await future
+            return e.wait(future)
+
+        with e.start():
+            assert e.wait(e.submit(submit)) == 5
+
+    def test_synchronous_slots_are_shared_with_coroutines(self):
+        e = AsyncioExecutor()
+        events = []
+
+        async def hold():
+            with await e.acquire_concurrency_slots({"db": 1}):
+                events.append("async")
+                await asyncio.sleep(0.05)
+
+        with e.start():
+            future = e.submit(hold)
+            e.loop.run_until_complete(asyncio.sleep(0))
+            # runs the loop until the coroutine releases its slot
+            with e.concurrency_slots({"db": 1}):
+                events.append("sync")
+            e.wait(future)
+        assert events == ["async", "sync"]
+
+    def test_synchronous_slots_never_block_the_loop(self):
+        e = AsyncioExecutor()
+
+        async def nested():
+            with e.concurrency_slots({"db": 1}):
+                with pytest.raises(RuntimeError, match="running event loop"):
+                    with e.concurrency_slots({"db": 1}):
+                        pass
+            with e.concurrency_slots({"db": 1}):
+                return e._slots_in_use["db"]
+
+        with e.start():
+            assert e.wait(e.submit(nested)) == 1
+
+    def test_start_cancels_pending_tasks_and_closes_loop(self):
+        e = AsyncioExecutor()
+        with e.start():
+            loop = e.loop
+            future = e.submit(asyncio.sleep, 10)
+        assert future.cancelled()
+        assert loop.is_closed()
+
+    def test_is_pickleable(self):
+        e = AsyncioExecutor()
+        post = cloudpickle.loads(cloudpickle.dumps(e))
+        assert isinstance(post, AsyncioExecutor)
+
+    def test_is_pickleable_after_start(self):
+        e = AsyncioExecutor()
+        with e.start():
+            post = cloudpickle.loads(cloudpickle.dumps(e))
+            assert isinstance(post, AsyncioExecutor)
+
+    def test_has_compatible_timeout_handler(self):
+        async def slow_fn():
+            await asyncio.sleep(3)
+
+        e = AsyncioExecutor()
+        with e.start():
+            with pytest.raises(TimeoutError):
+                e.wait(e.submit(e.timeout_handler, slow_fn, timeout=1))
+
+
+def add(x, y):
+    return x + y
+
+
+def sleep_and_return(t):
+    time.sleep(t)
+    return t
+
+
+def sleep_and_touch(path):
+    time.sleep(2)
+    open(path, "w").close()
+
+
+class TestThreadPoolExecutor:
+    def test_responds_to_max_workers(self):
+        assert ThreadPoolExecutor().max_workers is None
+        assert ThreadPoolExecutor(max_workers=3).max_workers == 3
+
+    def test_submit_and_wait(self):
+        e = ThreadPoolExecutor()
+        with e.start():
+            assert e.wait(e.submit(lambda: 1)) == 1
+            assert e.wait(e.submit(lambda x: x, x=1)) == 1
+            assert e.wait(e.submit(add, 1, y=2)) == 3
+            assert e.wait(1) == 1
+            assert e.wait(prefect) is prefect
+
+    def test_submit_raises_if_not_started(self):
+        with pytest.raises(ValueError, match="not been started"):
+            ThreadPoolExecutor().submit(lambda: 1)
+
+    def test_submit_resolves_futures_in_arguments(self):
+        e = ThreadPoolExecutor()
+        with e.start():
+            f = e.submit(sleep_and_return, 0.1)
+            g = e.submit(lambda x, ys, d: (x, ys, d), f, [f, 2], d=dict(a=f))
+            assert e.wait(g) == (0.1, [0.1, 2], dict(a=0.1))
+            assert e.wait(dict(f=f, g=2)) == dict(f=0.1, g=2)
+
+    def test_functions_waiting_on_futures_dont_occupy_threads(self):
+        e = ThreadPoolExecutor(max_workers=1)
+        with e.start():
+            slow = e.submit(sleep_and_return, 0.5)
+            after_slow = e.submit(lambda x: time.time(), slow)
+            fast = e.submit(lambda: time.time())
+            assert e.wait(fast) < e.wait(after_slow)
+
+    def test_submitted_functions_run_in_parallel(self):
+        e = ThreadPoolExecutor(max_workers=10)
+        with e.start():
+            start = time.time()
+            e.wait(e.map(sleep_and_return, [0.5] * 10))
+        assert time.time() - start < 2
+
+    def test_wait_reraises(self):
+        def fail():
+            raise ValueError("bad")
+
+        e = ThreadPoolExecutor()
+        with e.start():
+            failed = e.submit(fail)
+            with pytest.raises(ValueError, match="bad"):
+                e.wait(failed)
+            with pytest.raises(ValueError, match="bad"):
+                e.wait(e.submit(add, failed, 1))
+
+    def test_nested_waits_dont_exhaust_the_pool(self):
+        calls = []
+        e = ThreadPoolExecutor(max_workers=2)
+
+        def child(i):
+            calls.append(i)
+            return i
+
+        def parent(n):
+            return sum(e.wait(e.map(child, range(n))))
+
+        with e.start():
+            assert e.wait(e.map(parent, [10] * 10)) == [45] * 10
+        assert sorted(calls) == sorted(list(range(10)) * 10)
+
+    def test_wait_any_returns_completed_futures(self):
+        e = ThreadPoolExecutor()
+        with e.start():
+            futures = dict(
+                fast=e.submit(sleep_and_return, 0), slow=e.submit(sleep_and_return, 1)
+            )
+            assert e.wait_any(futures) == {"fast"}
+            assert e.wait_any(dict(futures, done=1)) == {"fast", "done"}
+
+    def test_wait_any_respects_timeout(self):
+        e = ThreadPoolExecutor()
+        with e.start():
+            start = time.time()
+            slow = e.submit(sleep_and_return, 1)
+            assert e.wait_any(dict(slow=slow), timeout=0.1) == set()
+            assert time.time() - start < 0.5
+
+    def test_map_iterates_over_multiple_args(self):
+        e = ThreadPoolExecutor()
+        with e.start():
+            res = e.wait(e.map(add, [1, 2], [1, 3]))
+        assert res == [2, 5]
+
+    def test_map_doesnt_do_anything_for_empty_list_input(self):
+        def map_fn(*args):
+            raise ValueError("map_fn was called")
+
+        e = ThreadPoolExecutor()
+        with e.start():
+            res = e.wait(e.map(map_fn))
+        assert res == []
+
+    def test_is_pickleable(self):
+        e = ThreadPoolExecutor()
+        post = cloudpickle.loads(cloudpickle.dumps(e))
+        assert isinstance(post, ThreadPoolExecutor)
+
+    def test_is_pickleable_after_start(self):
+        e = ThreadPoolExecutor()
+        with e.start():
+            post = cloudpickle.loads(cloudpickle.dumps(e))
+            assert isinstance(post, ThreadPoolExecutor)
+
+    def test_has_compatible_timeout_handler(self):
+        e = ThreadPoolExecutor()
+        with e.start():
+            with pytest.raises(TimeoutError):
+                e.wait(e.submit(e.timeout_handler, sleep_and_return, 3, timeout=1))
+
+
+class TestProcessPoolExecutor:
+    def test_responds_to_max_workers_and_threads(self):
+        e = ProcessPoolExecutor(max_workers=3)
+        assert e.processes == 3
+        assert e.max_workers == 6
+        assert ProcessPoolExecutor(max_workers=3, threads=4).max_workers == 4
+
+    def test_timeout_handler_runs_functions_in_other_processes(self):
+        e = ProcessPoolExecutor(max_workers=2)
+        with e.start():
+            pids = e.wait(e.map(e.timeout_handler, [os.getpid] * 4))
+        assert os.getpid() not in pids
+
+    def test_timeout_handler_passes_args_and_kwargs(self):
+        e = ProcessPoolExecutor(max_workers=1)
+        with e.start():
+            assert e.wait(e.submit(e.timeout_handler, add, 1, y=2)) == 3
+
+    def test_timeout_handler_reraises(self):
+        e = ProcessPoolExecutor(max_workers=1)
+        with e.start():
+            with pytest.raises(ZeroDivisionError):
+                e.wait(e.submit(e.timeout_handler, divmod, 1, 0))
+
+    def test_timeout_handler_times_out(self):
+        e = ProcessPoolExecutor(max_workers=1)
+        with e.start():
+            with pytest.raises(TimeoutError, match="Execution timed out"):
+                e.wait(e.submit(e.timeout_handler, sleep_and_return, 2, timeout=1))
+
+    def test_timeout_handler_kills_timed_out_functions(self, tmpdir):
+        path = tmpdir.join("done")
+        e = ProcessPoolExecutor(max_workers=1)
+        with e.start():
+            with pytest.raises(TimeoutError, match="Execution timed out"):
+                e.wait(
+                    e.submit(e.timeout_handler, sleep_and_touch, str(path), timeout=1)
+                )
+            # the pool's only process is still free
+            assert e.wait(e.submit(e.timeout_handler, add, 1, 2)) == 3
+            time.sleep(1.5)
+        assert not path.exists()
+
+    def test_timeout_handler_raises_if_not_started(self):
+        with pytest.raises(ValueError, match="not been started"):
+            ProcessPoolExecutor().timeout_handler(add, 1, 2)
+
+    def test_is_pickleable_after_start(self):
+        e = ProcessPoolExecutor(max_workers=1)
+        with e.start():
+            post = cloudpickle.loads(cloudpickle.dumps(e))
+            assert isinstance(post, ProcessPoolExecutor)
+
+
 @pytest.mark.parametrize("executor", ["mproc", "mthread", "sync"], indirect=True)
 def test_submit_does_not_assume_pure_functions(executor):
     def random_fun():
@@ -187,6 +586,58 @@ def test_dask_processes_executor_handles_timeouts(mproc):
             mproc.wait(mproc.submit(mproc.timeout_handler, slow_fn, timeout=1))
 
 
+class StateFuture:
+    """A stand-in for a `distributed.Future` of a task run's state"""
+
+    def __init__(self, state):
+        self.state = state
+        self.calls = 0
+
+    def result(self):
+        self.calls += 1
+        return self.state
+
+
+class TestFutureResult:
+    def test_value_is_gathered_once_on_access(self):
+        future = StateFuture(Success(result=5))
+        result = FutureResult(future)
+        assert not result.is_gathered
+        assert future.calls == 0
+        assert Success(result=result).result == 5
+        assert result.value == 5
+        assert result.is_gathered
+        assert future.calls == 1
+
+    def test_repr_doesnt_gather(self):
+        future = StateFuture(Success(result=5))
+        assert repr(FutureResult(future)) == "<FutureResult: not gathered>"
+        assert future.calls == 0
+
+    def test_pickling_keeps_only_the_handle(self):
+        result = FutureResult(StateFuture(Success(result=5)))
+        result.value
+        new = cloudpickle.loads(cloudpickle.dumps(result))
+        assert not new.is_gathered
+        assert new.value == 5
+
+    def test_detach_result_drops_the_value(self):
+        result = Result(list(range(100)))
+        result.safe_value = "safe"
+        state = Success(result=result, message="done")
+        detached, stub = _detach_result(state)
+        assert detached.message == "done"
+        assert detached._result is NoResult
+        assert stub.value is None
+        assert stub.safe_value == "safe"
+        assert state.result == list(range(100))
+
+    def test_detach_result_leaves_states_without_values(self):
+        state = Failed(result=NoResult)
+        assert _detach_result(state) == (state, None)
+        assert _detach_result(1) == (1, None)
+
+
 class TestDaskExecutor:
     @pytest.fixture(scope="class")
     def executors(self):
@@ -206,6 +657,109 @@ class TestDaskExecutor:
         assert x == 3
         assert y == 4
 
+    @pytest.mark.parametrize("executor", ["mproc", "mthread"], indirect=True)
+    def test_wait_any_returns_completed_futures(self, executor):
+        # the slow task blocks until the test releases it, rather than relying on
+        # timing, so that this passes on machines with a single core
+        with executor.start():
+            release = Variable("release-{}".format(uuid.uuid4()))
+            fast = executor.submit(lambda: 1)
+            executor.wait(fast)
+            slow = executor.submit(lambda: release.get())
+            assert executor.wait_any({"fast": fast, "slow": slow}) == {"fast"}
+            release.set(True)
+            assert executor.wait_any({"slow": slow}) == {"slow"}
+
+    @pytest.mark.parametrize("executor", ["mproc", "mthread"], indirect=True)
+    def test_wait_any_respects_timeout(self, executor):
+        with executor.start():
+            slow = executor.submit(time.sleep, 2)
+            assert executor.wait_any({"slow": slow}, timeout=0.1) == set()
+
+    def test_wait_any_raises_if_not_started(self):
+        with pytest.raises(ValueError, match="not been started"):
+            DaskExecutor().wait_any({})
+
+    def test_sleep_secedes_on_workers(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            "prefect.engine.executors.dask.secede", lambda: calls.append("secede")
+        )
+        monkeypatch.setattr(
+            "prefect.engine.executors.dask.rejoin", lambda: calls.append("rejoin")
+        )
+        monkeypatch.setattr(
+            "prefect.engine.executors.dask.time.sleep", lambda t: calls.append(t)
+        )
+        DaskExecutor().sleep(3)
+        assert calls == ["secede", 3, "rejoin"]
+
+    def test_sleep_outside_of_workers(self, monkeypatch):
+        sleep = MagicMock()
+        monkeypatch.setattr("prefect.engine.executors.dask.time.sleep", sleep)
+        DaskExecutor().sleep(0.1)
+        sleep.assert_called_once_with(0.1)
+
+    def test_concurrency_slots_cache_semaphores_and_secede(self, monkeypatch):
+        calls = []
+        semaphores = []
+
+        class Semaphore:
+            def __init__(self, max_leases, name):
+                semaphores.append((name, max_leases))
+
+            def acquire(self):
+                calls.append("acquire")
+
+            def release(self):
+                calls.append("release")
+
+        monkeypatch.setattr("prefect.engine.executors.dask.Semaphore", Semaphore)
+        monkeypatch.setattr(
+            "prefect.engine.executors.dask.secede", lambda: calls.append("secede")
+        )
+        monkeypatch.setattr(
+            "prefect.engine.executors.dask.rejoin", lambda: calls.append("rejoin")
+        )
+        executor = DaskExecutor()
+        for _ in range(2):
+            with executor.concurrency_slots({"db": 2}):
+                calls.append("run")
+        assert semaphores == [("prefect-limit:db", 2)]
+        assert calls == ["secede", "acquire", "rejoin", "run", "release"] * 2
+        assert cloudpickle.loads(cloudpickle.dumps(executor))._semaphores == {}
+
+    def test_keep_results_on_workers_defaults_to_config(self):
+        assert DaskExecutor().keep_results_on_workers is False
+        with prefect.utilities.configuration.set_temporary_config(
+            {"engine.executor.dask.keep_results_on_workers": True}
+        ):
+            assert DaskExecutor().keep_results_on_workers is True
+        assert DaskExecutor(keep_results_on_workers=True).keep_results_on_workers
+
+    @pytest.mark.parametrize("executor", ["mproc", "mthread"], indirect=True)
+    def test_wait_for_states_leaves_results_on_workers(self, executor, monkeypatch):
+        # the executor is shared by the whole session
+        monkeypatch.setattr(executor, "keep_results_on_workers", True)
+        with executor.start():
+            futures = executor.map(Success, ["a", "b"], [Result(1), Result(2)])
+            states = executor.wait_for_states(futures + [Success(result=3)])
+            assert all(isinstance(s._result, FutureResult) for s in states[:2])
+            assert not any(s._result.is_gathered for s in states[:2])
+            assert [s.result for s in states] == [1, 2, 3]
+            assert executor.wait_for_states({"x": futures[0]})["x"].message == "a"
+
+    @pytest.mark.parametrize("executor", ["mproc", "mthread"], indirect=True)
+    def test_handles_are_gathered_when_the_executor_stops(self, executor, monkeypatch):
+        monkeypatch.setattr(executor, "keep_results_on_workers", True)
+        with executor.start():
+            futures = executor.map(Success, ["a"], [Result(1)])
+            (state,) = executor.wait_for_states(futures)
+            assert not state._result.is_gathered
+        assert state._result.is_gathered
+        assert state.result == 1
+        assert executor._handles == []
+
     @pytest.mark.skipif(
         sys.platform == "win32", reason="Nondeterministically fails on Windows machines"
     )
@@ -287,6 +841,38 @@ class TestDaskExecutor:
         kwargs = client.return_value.__enter__.return_value.map.call_args[1]
         assert kwargs["resources"] == {"GPU": 1.0}
 
+    def test_context_priority_is_passed_to_submit(self, monkeypatch):
+        client = MagicMock()
+        monkeypatch.setattr(prefect.engine.executors.dask, "Client", client)
+        executor = DaskExecutor()
+        with executor.start():
+            with prefect.context(task_priority=7):
+                executor.submit(lambda: None)
+            executor.submit(lambda: None)
+        submit = client.return_value.__enter__.return_value.submit
+        assert submit.call_args_list[0][1]["priority"] == 7
+        assert "priority" not in submit.call_args_list[1][1]
+
+    def test_broadcast_scatters_each_object_once(self, monkeypatch):
+        client = MagicMock()
+        monkeypatch.setattr(prefect.engine.executors.dask, "Client", client)
+        scatter = client.return_value.__enter__.return_value.scatter
+        executor = DaskExecutor()
+        a, b = object(), object()
+        with executor.start():
+            assert executor.broadcast(a) is executor.broadcast(a)
+            executor.broadcast(b)
+            assert scatter.call_count == 2
+            assert scatter.call_args[1] == dict(broadcast=True, hash=False)
+            assert cloudpickle.loads(cloudpickle.dumps(executor))._broadcasts == {}
+        with executor.start():
+            executor.broadcast(a)
+        assert scatter.call_count == 3
+
+    def test_broadcast_raises_if_not_started(self):
+        with pytest.raises(ValueError, match="not been started"):
+            DaskExecutor().broadcast(object())
+
     def test_debug_is_converted_to_silence_logs(self, monkeypatch):
         client = MagicMock()
         monkeypatch.setattr(prefect.engine.executors.dask, "Client", client)
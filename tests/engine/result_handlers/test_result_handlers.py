@@ -1,3 +1,4 @@
+import base64
 import json
 import os
 import tempfile
@@ -82,6 +83,23 @@ class TestLocalHandler:
         new = cloudpickle.loads(cloudpickle.dumps(handler))
         assert isinstance(new, LocalResultHandler)
 
+    def test_local_handler_writes_and_finds_checkpoints(self, tmp_dir):
+        handler = LocalResultHandler(dir=tmp_dir)
+        assert handler.find_checkpoint("abc") is None
+
+        fpath = handler.write_checkpoint("abc", 42)
+        assert handler.find_checkpoint("abc") == fpath
+        assert handler.read(fpath) == 42
+
+        assert handler.write_checkpoint("abc", 43) == fpath
+        assert handler.read(handler.find_checkpoint("abc")) == 43
+
+
+def test_result_handlers_dont_support_checkpoints_by_default():
+    handler = JSONResultHandler()
+    assert handler.write_checkpoint("abc", 42) is None
+    assert handler.find_checkpoint("abc") is None
+
 
 def test_result_handlers_must_implement_read_and_write_to_work():
     class MyHandler(ResultHandler):
@@ -172,6 +190,20 @@ class TestGCSResultHandler:
         assert blob.upload_from_string.called
         assert isinstance(blob.upload_from_string.call_args[0][0], str)
 
+    def test_gcs_writes_and_finds_checkpoints(self, google_client):
+        bucket = MagicMock()
+        google_client.return_value.bucket = MagicMock(return_value=bucket)
+        handler = GCSResultHandler(bucket="foo")
+
+        uri = handler.write_checkpoint("abc", "so-much-data")
+        assert uri == "checkpoints/abc.prefect_result"
+        assert bucket.blob.call_args[0][0] == uri
+
+        bucket.blob.return_value.exists.return_value = True
+        assert handler.find_checkpoint("abc") == uri
+        bucket.blob.return_value.exists.return_value = False
+        assert handler.find_checkpoint("abc") is None
+
     def test_gcs_handler_is_pickleable(self, google_client, monkeypatch):
         class gcs_bucket:
             def __init__(self, *args, **kwargs):
@@ -241,6 +273,24 @@ class TestS3ResultHandler:
         assert used_uri.startswith(pendulum.now("utc").format("Y/M/D"))
         assert used_uri.endswith("prefect_result")
 
+    def test_s3_writes_and_finds_checkpoints(self, s3_client):
+        handler = S3ResultHandler(bucket="foo")
+
+        with prefect.context(
+            secrets=dict(AWS_CREDENTIALS=dict(ACCESS_KEY=1, SECRET_ACCESS_KEY=42))
+        ):
+            with set_temporary_config({"cloud.use_local_secrets": True}):
+                uri = handler.write_checkpoint("abc", "so-much-data")
+
+                list_objects = s3_client.return_value.list_objects_v2
+                list_objects.return_value = {"Contents": [{"Key": uri}]}
+                assert handler.find_checkpoint("abc") == uri
+                list_objects.return_value = {}
+                assert handler.find_checkpoint("abc") is None
+
+        assert uri == "checkpoints/abc.prefect_result"
+        assert s3_client.return_value.upload_fileobj.call_args[1]["Key"] == uri
+
     def test_s3_handler_is_pickleable(self, monkeypatch):
         class client:
             def __init__(self, *args, **kwargs):
@@ -318,6 +368,27 @@ class TestAzureResultHandler:
         assert used_uri.startswith(pendulum.now("utc").format("Y/M/D"))
         assert used_uri.endswith("prefect_result")
 
+    def test_azure_service_writes_and_finds_checkpoints(self):
+        handler = AzureResultHandler(container="foo")
+        handler.service = MagicMock()
+
+        uri = handler.write_checkpoint("abc", "so-much-data")
+        assert uri == "checkpoints/abc.prefect_result"
+        assert handler.service.create_blob_from_text.call_args[1] == {
+            "container_name": "foo",
+            "blob_name": uri,
+            "text": base64.b64encode(cloudpickle.dumps("so-much-data")).decode(),
+        }
+
+        handler.service.exists.return_value = True
+        assert handler.find_checkpoint("abc") == uri
+        assert handler.service.exists.call_args[1] == {
+            "container_name": "foo",
+            "blob_name": uri,
+        }
+        handler.service.exists.return_value = False
+        assert handler.find_checkpoint("abc") is None
+
     def test_azure_service_handler_is_pickleable(self, monkeypatch):
         class service:
             def __init__(self, *args, **kwargs):
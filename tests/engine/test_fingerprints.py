@@ -0,0 +1,189 @@
+import collections
+import threading
+
+from prefect.core import Flow, Parameter, Task
+from prefect.engine.fingerprints import flow_fingerprints, task_fingerprint
+from prefect.engine.result_handlers import LocalResultHandler
+from prefect.tasks.core.constants import Constant
+from prefect.tasks.core.function import FunctionTask
+from prefect.utilities.configuration import set_temporary_config
+
+
+class AddTask(Task):
+    def run(self, x, y):
+        return x + y
+
+
+class MulTask(Task):
+    def run(self, x, y):
+        return x * y
+
+
+class CountTask(Task):
+    # counted outside of the task, since its attributes are part of its fingerprint
+    calls = collections.Counter()
+
+    def run(self, x, y):
+        CountTask.calls[self] += 1
+        return x + y
+
+
+def build_flow(x=1):
+    flow = Flow(name="test")
+    a = Parameter("a")
+    b = Constant(x)
+    c = AddTask(checkpoint=True)
+    flow.add_edge(a, c, key="x")
+    flow.add_edge(b, c, key="y")
+    return flow, c
+
+
+class TestTaskFingerprint:
+    def test_fingerprints_are_stable(self):
+        flow, c = build_flow()
+        new_flow, new_c = build_flow()
+        params = dict(a=1)
+        assert (
+            flow_fingerprints(flow, params)[c]
+            == flow_fingerprints(new_flow, params)[new_c]
+        )
+
+    def test_fingerprints_ignore_task_configuration(self):
+        assert task_fingerprint(AddTask(), {}) == task_fingerprint(
+            AddTask(name="x", tags=["y"], max_retries=0, checkpoint=True), {}
+        )
+
+    def test_fingerprints_depend_on_code(self):
+        assert task_fingerprint(AddTask(), {}) != task_fingerprint(MulTask(), {})
+        assert task_fingerprint(FunctionTask(lambda x: x + 1), {}) != task_fingerprint(
+            FunctionTask(lambda x: x * 2), {}
+        )
+
+    def test_fingerprints_of_functions_defined_in_one_statement_differ(self):
+        add, mul = (lambda x: x + 1), (lambda x: x * 2)
+        assert task_fingerprint(FunctionTask(add), {}) != task_fingerprint(
+            FunctionTask(mul), {}
+        )
+        assert task_fingerprint(FunctionTask(add), {}) == task_fingerprint(
+            FunctionTask(add), {}
+        )
+
+    def test_fingerprints_depend_on_closures_and_defaults(self):
+        def make(y):
+            return lambda x: x + y
+
+        def add(x, y=1):
+            return x + y
+
+        def add_two(x, y=2):
+            return x + y
+
+        assert task_fingerprint(FunctionTask(make(1)), {}) != task_fingerprint(
+            FunctionTask(make(2)), {}
+        )
+        assert task_fingerprint(FunctionTask(make(1)), {}) == task_fingerprint(
+            FunctionTask(make(1)), {}
+        )
+        assert task_fingerprint(FunctionTask(add), {}) != task_fingerprint(
+            FunctionTask(add_two), {}
+        )
+
+    def test_fingerprints_depend_on_nested_code(self):
+        def outer_a(x):
+            return [i + 1 for i in x]
+
+        def outer_b(x):
+            return [i + 2 for i in x]
+
+        assert task_fingerprint(FunctionTask(outer_a), {}) is not None
+        assert task_fingerprint(FunctionTask(outer_a), {}) != task_fingerprint(
+            FunctionTask(outer_b), {}
+        )
+
+    def test_fingerprints_depend_on_attributes(self):
+        assert task_fingerprint(Constant(1), {}) != task_fingerprint(Constant(2), {})
+        assert task_fingerprint(Constant({1, 2, 3}), {}) == task_fingerprint(
+            Constant({3, 2, 1}), {}
+        )
+
+    def test_fingerprints_depend_on_parameters(self):
+        flow, c = build_flow()
+        assert (
+            flow_fingerprints(flow, dict(a=1))[c]
+            != flow_fingerprints(flow, dict(a=2))[c]
+        )
+
+    def test_fingerprints_depend_on_upstream_tasks(self):
+        flow, c = build_flow(x=1)
+        new_flow, new_c = build_flow(x=2)
+        params = dict(a=1)
+        assert (
+            flow_fingerprints(flow, params)[c]
+            != flow_fingerprints(new_flow, params)[new_c]
+        )
+
+    def test_mapped_tasks_are_not_fingerprinted(self):
+        flow = Flow(name="test")
+        a, b, c = Constant([1, 2]), AddTask(), AddTask()
+        flow.add_edge(a, b, key="x", mapped=True)
+        flow.add_edge(a, b, key="y", mapped=True)
+        flow.add_edge(b, c, key="x")
+        flow.add_edge(a, c, key="y")
+        assert set(flow_fingerprints(flow)) == {a}
+
+    def test_tasks_with_unpicklable_attributes_are_not_fingerprinted(self):
+        assert task_fingerprint(Constant(threading.Lock()), {}) is None
+
+
+class TestIncrementalRuns:
+    def test_only_invalidated_tasks_run(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        flow = Flow(name="test", result_handler=handler)
+        a, b = Parameter("a"), Parameter("b")
+        add_a, add_b, total = [CountTask(checkpoint=True) for _ in range(3)]
+        flow.add_edge(a, add_a, key="x")
+        flow.add_edge(a, add_a, key="y")
+        flow.add_edge(b, add_b, key="x")
+        flow.add_edge(b, add_b, key="y")
+        flow.add_edge(add_a, total, key="x")
+        flow.add_edge(add_b, total, key="y")
+
+        with set_temporary_config({"flows.incremental": True}):
+            state = flow.run(a=1, b=2)
+            assert state.result[total].result == 6
+            state = flow.run(a=1, b=3)
+            assert state.result[total].result == 8
+
+        assert CountTask.calls[add_a] == 1
+        assert CountTask.calls[add_b] == 2
+        assert CountTask.calls[total] == 2
+
+    def test_results_are_reused(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        flow, c = build_flow()
+        flow.result_handler = handler
+
+        with set_temporary_config({"flows.incremental": True}):
+            flow.run(a=1)
+            new_flow, new_c = build_flow()
+            new_flow.result_handler = handler
+            state = new_flow.run(a=1)
+
+        assert state.result[new_c].result == 2
+        assert state.result[new_c].message == "Reused checkpointed result."
+
+    def test_incremental_runs_are_off_by_default(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        flow, c = build_flow()
+        flow.result_handler = handler
+        flow.run(a=1)
+        assert not tmpdir.listdir()
+
+    def test_only_checkpointed_tasks_write_checkpoints(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        flow, c = build_flow()
+        c.checkpoint = False
+        flow.result_handler = handler
+        with set_temporary_config({"flows.incremental": True}):
+            flow.run(a=1)
+        assert not tmpdir.listdir()
@@ -1,9 +1,13 @@
+import asyncio
 import cloudpickle
 import collections
 import datetime
+import logging
 import queue
 import random
+import re
 import sys
+import threading
 import time
 from distutils.version import LooseVersion
 from unittest.mock import MagicMock
@@ -15,14 +19,24 @@ import prefect
 from prefect.core import Flow, Parameter, Task
 from prefect.engine import signals
 from prefect.engine.cache_validators import duration_only
-from prefect.engine.executors import Executor, LocalExecutor
+from prefect.engine.executors import (
+    AsyncioExecutor,
+    Executor,
+    LocalDaskExecutor,
+    LocalExecutor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from prefect.engine.executors.dask import FutureResult
 from prefect.engine.flow_runner import ENDRUN, FlowRunner, FlowRunnerInitializeResult
 from prefect.engine.task_runner import TaskRunner
-from prefect.engine.result import NoResult, Result
+from prefect.engine.result import NoResult, Result, SafeResult
+from prefect.engine.result_handlers import LocalResultHandler
 from prefect.engine.state import (
     Cached,
     Failed,
     Finished,
+    MapResults,
     Mapped,
     Paused,
     Pending,
@@ -37,7 +51,9 @@ from prefect.engine.state import (
     TriggerFailed,
 )
 from prefect.triggers import any_failed, manual_only
+from prefect.utilities.configuration import set_temporary_config
 from prefect.utilities.debug import raise_on_exception
+from prefect.utilities.tasks import unmapped
 
 
 class SuccessTask(Task):
@@ -509,7 +525,7 @@ class TestRunFlowStep:
         assert new_state.message == "Very specific error message"
 
     def test_determine_final_state_preserves_running_states_when_tasks_still_running(
-        self
+        self,
     ):
         task = Task()
         flow = Flow(name="test", tasks=[task])
@@ -525,6 +541,1077 @@ class TestRunFlowStep:
         assert new_state is old_state
 
 
+class OneAtATimeExecutor(LocalExecutor):
+    """
+    Reports submitted tasks as complete one at a time, and records the largest number
+    of tasks that were in flight at once.
+    """
+
+    max_in_flight = 0
+
+    def wait_any(self, futures):
+        self.max_in_flight = max(self.max_in_flight, len(futures))
+        return {next(iter(futures))}
+
+
+class TestReadyScheduling:
+    def test_ready_scheduling_runs_flow(self):
+        with Flow(name="test") as flow:
+            a = AddTask()(1, 2)
+            b = AddTask()(a, 3)
+            c = AddTask()(a, b)
+
+        with set_temporary_config({"engine.flow_runner.scheduling": "ready"}):
+            flow_state = FlowRunner(flow=flow).run(
+                return_tasks=[c], executor=OneAtATimeExecutor()
+            )
+        assert flow_state.is_successful()
+        assert flow_state.result[c].result == 9
+
+    def test_ready_scheduling_respects_trigger_failures(self):
+        flow = Flow(name="test")
+        e, s = ErrorTask(), SuccessTask()
+        flow.add_edge(e, s)
+
+        with set_temporary_config({"engine.flow_runner.scheduling": "ready"}):
+            flow_state = FlowRunner(flow=flow).run(return_tasks=[e, s])
+        assert flow_state.is_failed()
+        assert isinstance(flow_state.result[s], TriggerFailed)
+
+    def test_ready_scheduling_submits_tasks_after_their_upstream_tasks(self):
+        executor = OneAtATimeExecutor()
+        submitted = []
+        submit = executor.submit
+
+        def record_submit(fn, *args, task_slug, **kwargs):
+            submitted.append(task_slug)
+            return submit(fn, *args, task_slug=task_slug, **kwargs)
+
+        executor.submit = record_submit
+        flow = Flow(name="test")
+        tasks = [Task(name=str(i)) for i in range(4)]
+        flow.chain(tasks[0], tasks[2])
+        flow.chain(tasks[1], tasks[3])
+
+        with set_temporary_config({"engine.flow_runner.scheduling": "ready"}):
+            FlowRunner(flow=flow).run(executor=executor)
+        assert submitted == [t.slug for t in tasks]
+
+    @pytest.mark.parametrize("max_in_flight", [1, 3])
+    def test_ready_scheduling_caps_tasks_in_flight(self, max_in_flight):
+        executor = OneAtATimeExecutor()
+        flow = Flow(name="test", tasks=[SuccessTask() for _ in range(10)])
+
+        with set_temporary_config(
+            {
+                "engine.flow_runner.scheduling": "ready",
+                "engine.flow_runner.max_in_flight": max_in_flight,
+            }
+        ):
+            flow_state = FlowRunner(flow=flow).run(executor=executor)
+        assert flow_state.is_successful()
+        assert executor.max_in_flight == max_in_flight
+
+    def test_ready_scheduling_skips_finished_tasks(self):
+        flow = Flow(name="test")
+        task1, task2 = CountTask(), CountTask()
+        flow.add_edge(task1, task2)
+
+        with set_temporary_config({"engine.flow_runner.scheduling": "ready"}):
+            flow_state = FlowRunner(flow=flow).run(
+                task_states={task1: Success(result=5)},
+                return_tasks=[task1, task2],
+                executor=OneAtATimeExecutor(),
+            )
+        assert flow_state.result[task1].result == 5
+        assert flow_state.result[task2].result == 1
+        assert task1.call_count == 0
+
+    @pytest.mark.parametrize("executor", [LocalExecutor, ThreadPoolExecutor])
+    def test_ready_scheduling_resubmits_short_retries(self, executor):
+        calls = []
+
+        @prefect.task(max_retries=2, retry_delay=datetime.timedelta(seconds=0.2))
+        def flaky():
+            calls.append(prefect.context.get("resubmit_retries"))
+            if len(calls) < 3:
+                raise ValueError("oops")
+            return len(calls)
+
+        with Flow(name="test") as flow:
+            a = flaky()
+            b = AddTask()(a, 1)
+            c = SlowTask()(0.3)
+
+        with set_temporary_config({"engine.flow_runner.scheduling": "ready"}):
+            flow_state = FlowRunner(flow=flow).run(
+                return_tasks=[a, b, c], executor=executor()
+            )
+        assert flow_state.is_successful()
+        assert flow_state.result[a].result == 3
+        assert flow_state.result[b].result == 4
+        assert calls == [None, None, None]
+
+    def test_ready_scheduling_tells_waiting_task_runners_to_resubmit_retries(self):
+        class WaitingTaskRunner(TaskRunner):
+            waits_for_retries = True
+
+        calls = []
+
+        @prefect.task(max_retries=1, retry_delay=datetime.timedelta(seconds=0))
+        def flaky():
+            calls.append(prefect.context.get("resubmit_retries"))
+            if len(calls) < 2:
+                raise ValueError("oops")
+
+        flow = Flow(name="test", tasks=[flaky])
+        with set_temporary_config({"engine.flow_runner.scheduling": "ready"}):
+            flow_state = FlowRunner(flow=flow, task_runner_cls=WaitingTaskRunner).run()
+        assert flow_state.is_successful()
+        assert calls == [True, True]
+
+    def test_ready_scheduling_doesnt_resubmit_long_retries(self):
+        calls = []
+
+        @prefect.task(max_retries=1, retry_delay=datetime.timedelta(minutes=5))
+        def flaky():
+            calls.append(1)
+            raise ValueError("oops")
+
+        with Flow(name="test") as flow:
+            a = flaky()
+            b = AddTask()(a, 1)
+
+        with set_temporary_config({"engine.flow_runner.scheduling": "ready"}):
+            flow_state = FlowRunner(flow=flow).run(return_tasks=[a, b])
+        assert flow_state.is_running()
+        assert flow_state.result[a].is_retrying()
+        assert calls == [1]
+
+    def test_mapped_children_arent_resubmitted(self):
+        @prefect.task(max_retries=1, retry_delay=datetime.timedelta(seconds=0))
+        def resubmit_retries(x):
+            return prefect.context.get("resubmit_retries")
+
+        with Flow(name="test") as flow:
+            a = resubmit_retries.map([1, 2])
+
+        with set_temporary_config({"engine.flow_runner.scheduling": "ready"}):
+            flow_state = FlowRunner(flow=flow).run(return_tasks=[a])
+        assert flow_state.result[a].result == [False, False]
+
+    def test_ready_scheduling_doesnt_wait_for_slow_branches(self):
+        released = threading.Event()
+
+        @prefect.task
+        def slow():
+            return released.wait(timeout=5)
+
+        @prefect.task
+        def release(x):
+            released.set()
+
+        with Flow(name="test") as flow:
+            a = slow()
+            b = release(AddTask()(1, 2))
+
+        with set_temporary_config({"engine.flow_runner.scheduling": "ready"}):
+            flow_state = FlowRunner(flow=flow).run(
+                return_tasks=[a], executor=ThreadPoolExecutor(max_workers=2)
+            )
+        assert flow_state.is_successful()
+        assert flow_state.result[a].result is True
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            {"engine.flow_runner.scheduling": "ready"},
+            {
+                "engine.flow_runner.release_results": True,
+                "engine.flow_runner.max_in_flight": 2,
+            },
+        ],
+    )
+    def test_ready_scheduling_is_rejected_for_lazy_executors(self, config):
+        flow = Flow(name="test", tasks=[Task()])
+        with set_temporary_config(config):
+            flow_state = FlowRunner(flow=flow).run(executor=LocalDaskExecutor())
+        assert flow_state.is_failed()
+        assert 'cannot be used with "ready" scheduling' in flow_state.message
+
+    def test_unknown_scheduling_mode_fails(self):
+        flow = Flow(name="test", tasks=[Task()])
+        with set_temporary_config({"engine.flow_runner.scheduling": "lazy"}):
+            flow_state = FlowRunner(flow=flow).run()
+        assert flow_state.is_failed()
+        assert "Unknown scheduling mode" in flow_state.message
+
+
+class TestFuseChains:
+    def build_flow(self):
+        flow = Flow(name="test")
+        a, b, c, d, e = [AddTask(name=n) for n in "abcde"]
+        x = Parameter("x")
+        flow.add_edge(x, a, key="x")
+        flow.add_edge(x, a, key="y")
+        flow.add_edge(a, b, key="x")
+        flow.add_edge(a, b, key="y")
+        flow.add_edge(b, c, key="x")
+        flow.add_edge(b, c, key="y")
+        flow.add_edge(c, d, key="x")
+        flow.add_edge(x, d, key="y")
+        flow.add_edge(d, e, key="x")
+        flow.add_edge(d, e, key="y")
+        return flow, (x, a, b, c, d, e)
+
+    def test_find_chains(self):
+        flow, (x, a, b, c, d, e) = self.build_flow()
+        assert FlowRunner(flow=flow).find_chains() == [[a, b, c], [d, e]]
+
+    def test_tasks_with_retries_arent_fused(self):
+        flow, (x, a, b, c, d, e) = self.build_flow()
+        b.max_retries = 1
+        assert FlowRunner(flow=flow).find_chains() == [[d, e]]
+
+    def test_tasks_with_mapped_edges_arent_fused(self):
+        flow, (x, a, b, c, d, e) = self.build_flow()
+        flow.add_edge(Task(), e, key="y", mapped=True)
+        assert FlowRunner(flow=flow).find_chains() == [[a, b, c]]
+
+    @pytest.mark.parametrize("scheduling", ["eager", "ready"])
+    def test_chains_are_submitted_once(self, scheduling):
+        flow, (x, a, b, c, d, e) = self.build_flow()
+        executor = OneAtATimeExecutor()
+        submitted = []
+        submit = executor.submit
+
+        def record_submit(fn, *args, **kwargs):
+            submitted.append(getattr(fn, "__name__", None))
+            return submit(fn, *args, **kwargs)
+
+        executor.submit = record_submit
+
+        with set_temporary_config(
+            {
+                "engine.flow_runner.fuse_chains": True,
+                "engine.flow_runner.scheduling": scheduling,
+            }
+        ):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(x=1), return_tasks=flow.tasks, executor=executor
+            )
+        assert flow_state.is_successful()
+        assert [flow_state.result[t].result for t in (a, b, c, d, e)] == [
+            2,
+            4,
+            8,
+            9,
+            18,
+        ]
+        assert submitted.count("_run_task") == 1
+        assert submitted.count("_run_chain") == 2
+
+    def test_fused_tasks_call_state_handlers(self):
+        flow, tasks = self.build_flow()
+        handler = MagicMock(side_effect=lambda t, old, new: new)
+        for t in tasks:
+            t.state_handlers = [handler]
+
+        with set_temporary_config({"engine.flow_runner.fuse_chains": True}):
+            FlowRunner(flow=flow).run(parameters=dict(x=1))
+        assert {c[0][0] for c in handler.call_args_list} == set(tasks)
+
+    def test_fused_tasks_with_finished_states_dont_run(self):
+        flow, (x, a, b, c, d, e) = self.build_flow()
+
+        with set_temporary_config({"engine.flow_runner.fuse_chains": True}):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(x=1),
+                task_states={a: Success(result=Result(5))},
+                return_tasks=[a, b],
+            )
+        assert flow_state.result[a].result == 5
+        assert flow_state.result[b].result == 10
+
+    def test_failures_propagate_through_chains(self):
+        flow = Flow(name="test")
+        e, s1, s2 = ErrorTask(), SuccessTask(), SuccessTask()
+        flow.chain(e, s1, s2)
+
+        with set_temporary_config({"engine.flow_runner.fuse_chains": True}):
+            flow_state = FlowRunner(flow=flow).run(return_tasks=[e, s1, s2])
+        assert flow_state.is_failed()
+        assert isinstance(flow_state.result[e], Failed)
+        assert isinstance(flow_state.result[s1], TriggerFailed)
+        assert isinstance(flow_state.result[s2], TriggerFailed)
+
+
+class RecordTask(Task):
+    def __init__(self, log, **kwargs):
+        self.log = log
+        super().__init__(**kwargs)
+
+    def run(self, x):
+        self.log.append((self.name, x))
+        return x + 1
+
+
+class TestCriticalPathPriority:
+    def build_flow(self, log):
+        """
+        a1 -> a2 -> a3
+        b1, b2, b3, b4 (added to the flow first)
+        """
+        flow = Flow(name="test")
+        x = Parameter("x")
+        wide = [RecordTask(log, name="b{}".format(i)) for i in range(1, 5)]
+        for t in wide:
+            flow.add_edge(x, t, key="x")
+        chain = [RecordTask(log, name="a{}".format(i)) for i in range(1, 4)]
+        flow.add_edge(x, chain[0], key="x")
+        flow.add_edge(chain[0], chain[1], key="x")
+        flow.add_edge(chain[1], chain[2], key="x")
+        return flow, chain, wide
+
+    def test_task_priorities_are_critical_path_lengths(self):
+        flow, chain, wide = self.build_flow([])
+        priorities = FlowRunner(flow=flow).task_priorities()
+        assert [priorities[t] for t in chain] == [3, 2, 1]
+        assert {priorities[t] for t in wide} == {1}
+
+    def test_task_priorities_use_context_durations(self):
+        flow, chain, wide = self.build_flow([])
+        with prefect.context(task_durations={wide[0].slug: 10, chain[2].slug: 5}):
+            priorities = FlowRunner(flow=flow).task_priorities()
+        assert [priorities[t] for t in chain] == [7, 6, 5]
+        assert priorities[wide[0]] == 10
+
+    def test_prioritized_tasks(self):
+        flow, chain, wide = self.build_flow([])
+        runner = FlowRunner(flow=flow)
+        assert runner.prioritized_tasks() == list(flow.sorted_tasks())
+        # a3 ties with the wide tasks, which were added to the flow first
+        assert runner.prioritized_tasks(runner.task_priorities())[1:] == (
+            chain[:2] + wide + chain[2:]
+        )
+
+    @pytest.mark.parametrize("scheduling", ["eager", "ready"])
+    def test_critical_path_runs_first(self, scheduling):
+        log = []
+        flow, chain, wide = self.build_flow(log)
+        with set_temporary_config(
+            {
+                "engine.flow_runner.scheduling": scheduling,
+                "engine.flow_runner.max_in_flight": 1,
+                "engine.flow_runner.critical_path_priority": True,
+            }
+        ):
+            flow_state = FlowRunner(flow=flow).run(parameters=dict(x=0))
+        assert flow_state.is_successful()
+        assert [name for name, _ in log] == ["a1", "a2", "b1", "b2", "b3", "b4", "a3"]
+
+    def test_priorities_are_provided_in_context(self):
+        class PriorityTask(Task):
+            def run(self):
+                return prefect.context.get("task_priority")
+
+        flow = Flow(name="test")
+        a, b = PriorityTask(), PriorityTask()
+        flow.add_edge(a, b)
+        with set_temporary_config({"engine.flow_runner.critical_path_priority": True}):
+            flow_state = FlowRunner(flow=flow).run(return_tasks=[a, b])
+        assert flow_state.result[a].result == 2
+        assert flow_state.result[b].result == 1
+
+
+class TestDepthFirstMapping:
+    def build_flow(self, log):
+        flow = Flow(name="test")
+        a, b, c = [RecordTask(log, name=n) for n in "abc"]
+        flow.add_edge(Parameter("x"), a, key="x", mapped=True)
+        flow.add_edge(a, b, key="x", mapped=True)
+        flow.add_edge(b, c, key="x", mapped=True)
+        return flow, (a, b, c)
+
+    def test_find_mapped_chains(self):
+        flow, (a, b, c) = self.build_flow([])
+        assert FlowRunner(flow=flow).find_mapped_chains() == [[a, b, c]]
+
+    def test_chains_stop_at_fan_out_and_reductions(self):
+        flow, (a, b, c) = self.build_flow([])
+        flow.add_edge(a, SuccessTask(), key="x")
+        assert FlowRunner(flow=flow).find_mapped_chains() == [[b, c]]
+
+        flow, (a, b, c) = self.build_flow([])
+        flow.edges.remove(flow.edges_to(c).pop())
+        flow.add_edge(b, c, key="x")
+        assert FlowRunner(flow=flow).find_mapped_chains() == [[a, b]]
+
+    def test_tasks_with_retries_arent_chained(self):
+        flow, (a, b, c) = self.build_flow([])
+        b.max_retries = 1
+        assert FlowRunner(flow=flow).find_mapped_chains() == []
+
+    @pytest.mark.parametrize("scheduling", ["eager", "ready"])
+    def test_children_run_depth_first(self, scheduling):
+        log = []
+        flow, (a, b, c) = self.build_flow(log)
+
+        with set_temporary_config(
+            {
+                "engine.flow_runner.depth_first_mapping": True,
+                "engine.flow_runner.scheduling": scheduling,
+            }
+        ):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(x=[1, 10]), return_tasks=[a, b, c]
+            )
+        assert flow_state.is_successful()
+        assert flow_state.result[a].result == [2, 11]
+        assert flow_state.result[c].result == [4, 13]
+        assert all(len(flow_state.result[t].map_states) == 2 for t in (a, b, c))
+        assert log == [
+            ("a", 1),
+            ("b", 2),
+            ("c", 3),
+            ("a", 10),
+            ("b", 11),
+            ("c", 12),
+        ]
+
+    def test_intermediate_results_are_released(self):
+        flow, (a, b, c) = self.build_flow([])
+
+        with set_temporary_config(
+            {
+                "engine.flow_runner.depth_first_mapping": True,
+                "engine.flow_runner.release_results": True,
+            }
+        ):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(x=[1, 10]), return_tasks=[a, b, c]
+            )
+        assert flow_state.is_successful()
+        assert flow_state.result[c].result == [4, 13]
+        for task in (a, b):
+            assert flow_state.result[task].is_mapped()
+            assert all(
+                s._result is NoResult for s in flow_state.result[task].map_states
+            )
+
+    def test_intermediate_results_are_released_unless_kept(self):
+        flow, (a, b, c) = self.build_flow([])
+        (edge,) = flow.edges_to(a)
+
+        states = FlowRunner(flow=flow).run_mapped_chain(
+            tasks=[a, b, c],
+            states=[None] * 3,
+            upstream_states={edge: Success(result=[1, 10])},
+            upstream_edges=[flow.edges_to(b), flow.edges_to(c)],
+            contexts=[{}] * 3,
+            task_runner_state_handlers=[],
+            executor=LocalExecutor(),
+            keep_results={b, c},
+        )
+        assert all(s.is_mapped() for s in states)
+        assert all(s._result is NoResult for s in states[0].map_states)
+        assert [s.result for s in states[1].map_states] == [3, 12]
+        assert [s.result for s in states[2].map_states] == [4, 13]
+
+    def test_children_are_submitted_with_a_single_dask_map(self, mthread, monkeypatch):
+        flow, (a, b, c) = self.build_flow([])
+        (edge,) = flow.edges_to(a)
+
+        with mthread.start() as client:
+            client_map = MagicMock(wraps=client.map)
+            monkeypatch.setattr(client, "map", client_map)
+            states = FlowRunner(flow=flow).run_mapped_chain(
+                tasks=[a, b, c],
+                states=[None] * 3,
+                upstream_states={edge: Success(result=[1, 10])},
+                upstream_edges=[flow.edges_to(b), flow.edges_to(c)],
+                contexts=[{}] * 3,
+                task_runner_state_handlers=[],
+                executor=mthread,
+            )
+        # the chain's children, followed by the already finished children of each task
+        assert [len(args[1]) for args, _ in client_map.call_args_list] == [2, 0, 0, 0]
+        assert [s.result for s in states[2].map_states] == [4, 13]
+
+    def test_children_are_submitted_separately(self):
+        flow, (a, b, c) = self.build_flow([])
+        submitted = []
+
+        class RecordingExecutor(LocalExecutor):
+            def map(self, fn, *args):
+                results = super().map(fn, *args)
+                submitted.append(len(results))
+                return results
+
+        with set_temporary_config({"engine.flow_runner.depth_first_mapping": True}):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(x=[1, 10]),
+                return_tasks=[c],
+                executor=RecordingExecutor(),
+            )
+        assert flow_state.result[c].result == [4, 13]
+        # the chain's children, followed by the already finished children of each task
+        assert submitted == [2, 0, 0, 0]
+
+    def test_parent_states_go_through_task_runners(self):
+        mapped = []
+
+        def handler(task, old_state, new_state):
+            if new_state.is_mapped():
+                mapped.append(task)
+
+        flow, (a, b, c) = self.build_flow([])
+        for task in (a, b, c):
+            task.state_handlers = [handler]
+
+        with set_temporary_config({"engine.flow_runner.depth_first_mapping": True}):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(x=[1, 10]), return_tasks=[a, b, c]
+            )
+        assert flow_state.is_successful()
+        assert set(mapped) == {a, b, c}
+        assert all(s.is_mapped() for s in flow_state.result.values())
+
+    def test_started_chains_run_breadth_first(self):
+        log = []
+        flow, (a, b, c) = self.build_flow(log)
+        a_state = Mapped(map_states=[Success(result=Result(2))])
+
+        with set_temporary_config({"engine.flow_runner.depth_first_mapping": True}):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(x=[1]), task_states={a: a_state}, return_tasks=[c],
+            )
+        assert flow_state.result[c].result == [4]
+        assert log == [("b", 2), ("c", 3)]
+
+    @pytest.mark.parametrize("scheduling", ["eager", "ready"])
+    def test_chains_with_failed_upstream_tasks_run_breadth_first(
+        self, scheduling, caplog
+    ):
+        caplog.set_level(logging.DEBUG, logger="prefect.FlowRunner")
+        log = []
+        flow = Flow(name="test")
+        a, b = [RecordTask(log, name=n) for n in "ab"]
+        flow.add_edge(ErrorTask(), a, key="x", mapped=True)
+        flow.add_edge(a, b, key="x", mapped=True)
+
+        with set_temporary_config(
+            {
+                "engine.flow_runner.depth_first_mapping": True,
+                "engine.flow_runner.scheduling": scheduling,
+            }
+        ):
+            flow_state = FlowRunner(flow=flow).run(return_tasks=[a, b])
+        assert flow_state.is_failed()
+        assert flow_state.result[a].is_failed()
+        assert flow_state.result[b].is_failed()
+        assert log == []
+        assert "running its chain breadth-first" in caplog.text
+
+    def test_unexpected_errors_fail_the_child(self):
+        class ErrorTaskRunner(TaskRunner):
+            def run(self, *args, context=None, **kwargs):
+                if self.task.name == "b" and context.get("map_index") == 0:
+                    raise ValueError("unexpected")
+                return super().run(*args, context=context, **kwargs)
+
+        flow, (a, b, c) = self.build_flow([])
+
+        with set_temporary_config({"engine.flow_runner.depth_first_mapping": True}):
+            flow_state = FlowRunner(flow=flow, task_runner_cls=ErrorTaskRunner).run(
+                parameters=dict(x=[1, 10]), return_tasks=[a, b, c]
+            )
+        assert flow_state.result[a].result == [2, 11]
+        child_state = flow_state.result[b].map_states[0]
+        assert isinstance(child_state, Failed)
+        assert isinstance(child_state.result, ValueError)
+        assert isinstance(flow_state.result[c].map_states[0], TriggerFailed)
+        assert flow_state.result[c].map_states[1].result == 13
+
+
+class TestReleaseResults:
+    def test_release_results_keeps_reference_and_terminal_task_results(self):
+        with Flow(name="test") as flow:
+            a = AddTask()(1, 2)
+            b = AddTask()(a, 3)
+            c = AddTask()(a, b)
+            d = AddTask()(c, 1)
+        flow.set_reference_tasks([b])
+
+        with set_temporary_config({"engine.flow_runner.release_results": True}):
+            flow_state = FlowRunner(flow=flow).run(
+                return_tasks=flow.tasks, executor=OneAtATimeExecutor()
+            )
+        assert flow_state.is_successful()
+        assert all(s.is_successful() for s in flow_state.result.values())
+        assert flow_state.result[a]._result is NoResult
+        assert flow_state.result[b].result == 6
+        assert flow_state.result[c]._result is NoResult
+        assert flow_state.result[d].result == 10
+
+    def test_release_results_spills_results_with_result_handlers(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        flow = Flow(name="test")
+        a = AddTask(result_handler=handler)
+        b = AddTask()
+        flow.add_edge(a, b, key="x")
+        flow.add_edge(Parameter("y"), b, key="y")
+
+        with set_temporary_config({"engine.flow_runner.release_results": True}):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(y=2),
+                task_states={a: Success(result=Result(1, result_handler=handler))},
+                return_tasks=[a, b],
+            )
+        assert flow_state.result[b].result == 3
+        released = flow_state.result[a]._result
+        assert isinstance(released, SafeResult)
+        assert released.to_result().value == 1
+
+    def test_release_result_releases_mapped_children_that_are_futures(self):
+        flow = Flow(name="test")
+        a, b = AddTask(), AddTask()
+        flow.add_edge(Parameter("x"), a, key="x", mapped=True)
+        flow.add_edge(a, b, key="x")
+
+        executor = ThreadPoolExecutor()
+        with executor.start():
+            children = executor.map(lambda x: Success(result=x), [1, 2])
+            task_states = {a: Mapped(map_states=children), b: Success(result=3)}
+            FlowRunner(flow=flow).release_result(
+                a, task_states=task_states, executor=executor
+            )
+            state = executor.wait(task_states[a])
+        assert state.is_mapped()
+        assert [s._result for s in state.map_states] == [NoResult, NoResult]
+
+    def test_release_results_keeps_results_of_unfinished_consumers(self):
+        flow = Flow(name="test")
+        a, b = SuccessTask(), SuccessTask(trigger=manual_only)
+        flow.add_edge(a, b)
+
+        with set_temporary_config({"engine.flow_runner.release_results": True}):
+            flow_state = FlowRunner(flow=flow).run(return_tasks=[a, b])
+        assert isinstance(flow_state.result[b], Paused)
+        assert flow_state.result[a].result == 1
+
+    def test_flow_run_keeps_terminal_task_results(self):
+        with Flow(name="test") as flow:
+            a = AddTask()(1, 2)
+            b = AddTask()(a, 3)
+
+        with set_temporary_config({"engine.flow_runner.release_results": True}):
+            flow_state = flow.run()
+        assert flow_state.is_successful()
+        assert flow_state.result[a]._result is NoResult
+        assert flow_state.result[b].result == 6
+
+
+class AsyncAddTask(Task):
+    # counts the runs of `AsyncAddTask`s in progress, along with their peak
+    running = collections.Counter()
+
+    async def run(self, x, y):  # type: ignore
+        running = AsyncAddTask.running
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.5)
+        running["now"] -= 1
+        return x + y
+
+
+class TestAsyncioExecutor:
+    @pytest.mark.parametrize("scheduling", ["eager", "ready"])
+    def test_coroutine_tasks_run_concurrently(self, scheduling):
+        with Flow(name="test") as flow:
+            tasks = [AsyncAddTask()(i, 1) for i in range(20)]
+            total = AddTask()(tasks[0], AsyncAddTask()(tasks[1], 1))
+
+        AsyncAddTask.running.clear()
+        with set_temporary_config({"engine.flow_runner.scheduling": scheduling}):
+            flow_state = FlowRunner(flow=flow).run(
+                return_tasks=flow.tasks, executor=AsyncioExecutor()
+            )
+        assert AsyncAddTask.running["peak"] >= 10
+        assert flow_state.is_successful()
+        assert [flow_state.result[t].result for t in tasks] == list(range(1, 21))
+        assert flow_state.result[total].result == 4
+
+    def test_mapped_coroutine_tasks_run_concurrently(self):
+        with Flow(name="test") as flow:
+            mapped = AsyncAddTask().map(Parameter("xs"), unmapped(1))
+            total = AsyncAddTask().map(mapped, unmapped(1))
+
+        AsyncAddTask.running.clear()
+        flow_state = FlowRunner(flow=flow).run(
+            parameters=dict(xs=list(range(20))),
+            return_tasks=[mapped, total],
+            executor=AsyncioExecutor(),
+        )
+        assert AsyncAddTask.running["peak"] >= 10
+        assert flow_state.is_successful()
+        assert flow_state.result[mapped].result == list(range(1, 21))
+        assert flow_state.result[total].result == list(range(2, 22))
+
+    def test_mapped_coroutine_tasks_respect_map_concurrency(self):
+        with Flow(name="test") as flow:
+            mapped = AsyncAddTask().map(list(range(4)), unmapped(1))
+
+        AsyncAddTask.running.clear()
+        flow_state = FlowRunner(flow=flow).run(
+            return_tasks=[mapped], executor=AsyncioExecutor(map_concurrency=2)
+        )
+        assert AsyncAddTask.running["peak"] == 2
+        assert flow_state.result[mapped].result == [1, 2, 3, 4]
+
+    def test_coroutine_tasks_are_given_their_own_context(self):
+        @prefect.task
+        async def get_name(x):
+            await asyncio.sleep(0.1)
+            return prefect.context.task_full_name
+
+        with Flow(name="test") as flow:
+            names = get_name.map(list(range(5)))
+
+        flow_state = FlowRunner(flow=flow).run(
+            return_tasks=[names], executor=AsyncioExecutor()
+        )
+        assert flow_state.result[names].result == [
+            "get_name[{}]".format(i) for i in range(5)
+        ]
+
+    def test_coroutine_tasks_time_out(self):
+        @prefect.task(timeout=1)
+        async def slow():
+            await asyncio.sleep(3)
+
+        with Flow(name="test") as flow:
+            result = slow()
+
+        flow_state = FlowRunner(flow=flow).run(
+            return_tasks=[result], executor=AsyncioExecutor()
+        )
+        assert isinstance(flow_state.result[result], TimedOut)
+
+
+class TestPoolExecutors:
+    @pytest.mark.parametrize("scheduling", ["eager", "ready"])
+    def test_nested_mapping_runs_each_child_once(self, scheduling):
+        log = []
+        flow = Flow(name="test")
+        a, b = RecordTask(log, name="a"), RecordTask(log, name="b")
+        flow.add_edge(Parameter("x"), a, key="x", mapped=True)
+        flow.add_edge(a, b, key="x", mapped=True)
+        total = AddTask()
+        flow.add_edge(b, total, key="x")
+        flow.add_edge(a, total, key="y")
+
+        with set_temporary_config({"engine.flow_runner.scheduling": scheduling}):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(x=list(range(20))),
+                return_tasks=[b, total],
+                executor=ThreadPoolExecutor(max_workers=2),
+            )
+        assert flow_state.is_successful()
+        assert flow_state.result[b].result == list(range(2, 22))
+        assert flow_state.result[total].result == list(range(2, 22)) + list(
+            range(1, 21)
+        )
+        assert sorted(log) == sorted(
+            [("a", i) for i in range(20)] + [("b", i) for i in range(1, 21)]
+        )
+
+    def test_thread_pool_runs_tasks_in_parallel(self):
+        flow = Flow(name="test")
+        flow.add_edge(Parameter("t"), SlowTask(), key="secs", mapped=True)
+
+        start = time.time()
+        flow_state = FlowRunner(flow=flow).run(
+            parameters=dict(t=[0.5] * 10), executor=ThreadPoolExecutor(max_workers=10)
+        )
+        assert flow_state.is_successful()
+        assert time.time() - start < 3
+
+    def test_thread_pool_handles_timeouts(self):
+        flow = Flow(name="test")
+        slow = SlowTask(timeout=1)
+        flow.add_edge(Parameter("t"), slow, key="secs")
+
+        flow_state = FlowRunner(flow=flow).run(
+            parameters=dict(t=3), return_tasks=[slow], executor=ThreadPoolExecutor()
+        )
+        assert isinstance(flow_state.result[slow], TimedOut)
+
+    def test_process_pool_runs_tasks(self):
+        with Flow(name="test") as flow:
+            a = AddTask()(1, 2)
+            b = AddTask().map([a, a], [1, 2])
+            c = ErrorTask()()
+
+        flow_state = FlowRunner(flow=flow).run(
+            return_tasks=[b, c], executor=ProcessPoolExecutor(max_workers=2)
+        )
+        assert flow_state.result[b].result == [4, 5]
+        assert isinstance(flow_state.result[c], Failed)
+        assert isinstance(flow_state.result[c].result, ValueError)
+
+
+class BroadcastRef:
+    def __init__(self, key):
+        self.key = key
+
+
+class BroadcastExecutor(LocalExecutor):
+    """
+    Records the size of each submission once serialized, with broadcast objects replaced
+    by references
+    """
+
+    def __init__(self):
+        self.shared, self.sizes, self.broadcasts = {}, [], []
+        super().__init__()
+
+    def __getstate__(self):
+        return {}
+
+    def broadcast(self, obj):
+        self.broadcasts.append(obj)
+        self.shared[id(obj)] = obj
+        return BroadcastRef(id(obj))
+
+    def submit(self, fn, *args, **kwargs):
+        self.sizes.append(len(cloudpickle.dumps((fn, args, kwargs))))
+        resolve = lambda a: self.shared[a.key] if isinstance(a, BroadcastRef) else a
+        args = [resolve(a) for a in args]
+        kwargs = {k: resolve(a) for k, a in kwargs.items()}
+        return super().submit(fn, *args, **kwargs)
+
+
+class ParametersTask(Task):
+    def run(self):  # type: ignore
+        return prefect.context.parameters
+
+
+class TestBroadcastFlowRunner:
+    def run_chain_flow(self, n):
+        flow = Flow(name="test")
+        tasks = [Parameter("x")] + [AddTask() for _ in range(n)]
+        for upstream, t in zip(tasks, tasks[1:]):
+            flow.add_edge(upstream, t, key="x")
+            flow.add_edge(tasks[0], t, key="y")
+        executor = BroadcastExecutor()
+        flow_state = FlowRunner(flow=flow).run(
+            parameters=dict(x=1), return_tasks=[tasks[-1]], executor=executor
+        )
+        assert flow_state.result[tasks[-1]].result == n + 1
+        return executor
+
+    def test_submissions_dont_serialize_the_flow(self):
+        small, large = self.run_chain_flow(5), self.run_chain_flow(200)
+        # the flow runner and the run's context
+        assert len(small.shared) == len(large.shared) == 2
+        assert max(large.sizes) < 1.5 * max(small.sizes)
+
+    def test_run_context_is_broadcast_once_per_flow_run(self):
+        executor = self.run_chain_flow(5)
+        run_contexts = [obj for obj in executor.broadcasts if isinstance(obj, dict)]
+        assert len(run_contexts) == 1
+
+    def run_with_parameter(self, value):
+        flow = Flow(name="test")
+        flow.add_task(Parameter("p"))
+        task = ParametersTask()
+        flow.add_task(task)
+        executor = BroadcastExecutor()
+        flow_state = FlowRunner(flow=flow).run(
+            parameters=dict(p=value), return_tasks=[task], executor=executor
+        )
+        return executor, flow_state.result[task].result
+
+    def test_submissions_dont_serialize_the_run_context(self):
+        small, _ = self.run_with_parameter(list(range(10)))
+        large, parameters = self.run_with_parameter(list(range(100000)))
+        assert parameters == dict(p=list(range(100000)))
+        assert max(large.sizes) < 1.5 * max(small.sizes)
+
+    def test_submitted_context_sizes_are_logged(self, caplog):
+        with caplog.at_level(logging.DEBUG, logger="prefect.FlowRunner"):
+            self.run_with_parameter(1)
+        messages = [r.getMessage() for r in caplog.records]
+        assert any(re.match(r"Sharing \d+ bytes of context", m) for m in messages)
+        assert any(
+            re.match(r"Task 'p': submitting \d+ bytes of context", m) for m in messages
+        )
+
+    def test_task_runs_are_submitted_by_slug(self):
+        flow = Flow(name="test")
+        task = SuccessTask()
+        flow.add_task(task)
+        runner = FlowRunner(flow=flow)
+        state = prefect.engine.flow_runner._run_task(
+            runner,
+            task_slug=task.slug,
+            state=None,
+            upstream_states={},
+            context={},
+            task_runner_state_handlers=[],
+            executor=LocalExecutor(),
+        )
+        assert state.result == 1
+
+
+class SumTask(Task):
+    def run(self, x):  # type: ignore
+        return sum(x)
+
+
+class TestKeepResultsOnWorkers:
+    def test_final_states_hold_handles(self, mthread, monkeypatch):
+        # the executor is shared by the whole session
+        monkeypatch.setattr(mthread, "keep_results_on_workers", True)
+        with Flow(name="test") as flow:
+            xs = Parameter("xs")
+            ys = AddTask().map(xs, unmapped(1))
+            total = SumTask()(ys)
+
+        flow_state = FlowRunner(flow=flow).run(
+            parameters=dict(xs=list(range(5))),
+            return_tasks=[ys, total],
+            executor=mthread,
+        )
+        assert flow_state.is_successful()
+        children = flow_state.result[ys].map_states
+        assert all(isinstance(s._result, FutureResult) for s in children)
+        # handles that weren't gathered during the run are gathered before the
+        # executor's client closes
+        assert all(s._result.is_gathered for s in children)
+        assert flow_state.result[ys].result == [1, 2, 3, 4, 5]
+        assert flow_state.result[total].result == 15
+
+
+class PeakTask(Task):
+    """Sleeps, recording the peak number of runs of any `PeakTask`s sharing `running`"""
+
+    def __init__(self, running, peak, **kwargs):
+        self.running, self.peak = running, peak
+        self.lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def run(self, x):  # type: ignore
+        with self.lock:
+            self.running.append(x)
+            self.peak.append(len(self.running))
+        time.sleep(0.05)
+        with self.lock:
+            self.running.remove(x)
+        return x
+
+
+class AsyncPeakTask(Task):
+    def __init__(self, running, peak, **kwargs):
+        self.running, self.peak = running, peak
+        super().__init__(**kwargs)
+
+    async def run(self, x):  # type: ignore
+        self.running.append(x)
+        self.peak.append(len(self.running))
+        await asyncio.sleep(0.05)
+        self.running.remove(x)
+        return x
+
+
+class TestConcurrencyLimits:
+    def test_thread_pool_limits_mapped_children(self):
+        running, peak = [], []
+        flow = Flow(name="test")
+        limited = PeakTask(running, peak, tags=["limit:test-threads=3"])
+        flow.add_edge(Parameter("xs"), limited, key="x", mapped=True)
+
+        flow_state = FlowRunner(flow=flow).run(
+            parameters=dict(xs=list(range(12))),
+            return_tasks=[limited],
+            executor=ThreadPoolExecutor(max_workers=8),
+        )
+        assert flow_state.result[limited].result == list(range(12))
+        assert max(peak) == 3
+
+    def test_limits_are_shared_by_tasks_with_the_same_name(self):
+        running, peak = [], []
+        flow = Flow(name="test")
+        xs = Parameter("xs")
+        tasks = [
+            PeakTask(running, peak, tags=["limit:test-shared=2"]) for _ in range(2)
+        ]
+        for t in tasks:
+            flow.add_edge(xs, t, key="x", mapped=True)
+
+        flow_state = FlowRunner(flow=flow).run(
+            parameters=dict(xs=list(range(6))),
+            executor=ThreadPoolExecutor(max_workers=8),
+        )
+        assert flow_state.is_successful()
+        assert max(peak) == 2
+
+    @pytest.mark.parametrize("scheduling", ["eager", "ready"])
+    def test_asyncio_limits_mapped_children(self, scheduling):
+        running, peak = [], []
+        flow = Flow(name="test")
+        limited = AsyncPeakTask(running, peak, tags=["limit:test-asyncio=4"])
+        flow.add_edge(Parameter("xs"), limited, key="x", mapped=True)
+
+        with set_temporary_config({"engine.flow_runner.scheduling": scheduling}):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(xs=list(range(20))),
+                return_tasks=[limited],
+                executor=AsyncioExecutor(),
+            )
+        assert flow_state.result[limited].result == list(range(20))
+        assert max(peak) == 4
+
+    def test_asyncio_limits_are_shared_by_chained_and_coroutine_tasks(self):
+        running, peak = [], []
+        tags = ["limit:test-asyncio-chain=1"]
+
+        @prefect.task
+        async def delay():
+            await asyncio.sleep(0.075)
+
+        with Flow(name="test") as flow:
+            mapped = AsyncPeakTask(running, peak, tags=tags).map(Parameter("ys"))
+            # the chain becomes ready while the mapped children hold the slot
+            head = PeakTask(running, peak, tags=tags)(
+                Parameter("x"), upstream_tasks=[delay()]
+            )
+            chained = PeakTask(running, peak, tags=tags)(head)
+
+        with set_temporary_config({"engine.flow_runner.fuse_chains": True}):
+            flow_state = FlowRunner(flow=flow).run(
+                parameters=dict(x=-1, ys=list(range(4))),
+                return_tasks=[chained, mapped],
+                executor=AsyncioExecutor(),
+            )
+        assert flow_state.result[chained].result == -1
+        assert flow_state.result[mapped].result == list(range(4))
+        assert max(peak) == 1
+
+    def test_malformed_limit_tags_fail_the_task(self):
+        flow = Flow(name="test")
+        bad = AddTask()
+        # tags are validated when the task is created, but can be changed afterwards
+        bad.tags.add("limit:test=x")
+        flow.add_task(bad)
+        bad.bind(x=1, y=2, flow=flow)
+
+        flow_state = FlowRunner(flow=flow).run(return_tasks=[bad])
+        assert isinstance(flow_state.result[bad], Failed)
+        assert isinstance(flow_state.result[bad].result, ValueError)
+
+
 class TestInputCaching:
     @pytest.mark.parametrize(
         "executor", ["local", "sync", "mproc", "mthread"], indirect=True
@@ -541,8 +1628,8 @@ class TestInputCaching:
 
         a_state = first_state.result[a_res]
         a_state.result = (
-            NoResult
-        )  # remove the result to see if the cached results are picked up
+            NoResult  # remove the result to see if the cached results are picked up
+        )
         b_state = first_state.result[b_res]
         b_state.cached_inputs = dict(x=Result(2))  # artificially alter state
 
@@ -570,8 +1657,8 @@ class TestInputCaching:
 
         a_state = first_state.result[a_res]
         a_state.result = (
-            NoResult
-        )  # remove the result to see if the cached results are picked up
+            NoResult  # remove the result to see if the cached results are picked up
+        )
         b_state = first_state.result[b_res]
         b_state.cached_inputs = dict(x=Result(2))  # artificially alter state
 
@@ -1188,6 +2275,30 @@ def test_parameters_overwrite_context_only_if_key_matches():
 
 
 class TestMapping:
+    def test_reducers_receive_a_view_of_the_mapped_results(self):
+        received = []
+
+        class ReduceTask(Task):
+            def run(self, x):
+                received.append(x)
+                return sum(x)
+
+        waited = []
+
+        class Executor(LocalExecutor):
+            def wait(self, futures):
+                waited.append(futures)
+                return super().wait(futures)
+
+        with Flow(name="test") as flow:
+            res = ReduceTask()(AddTask().map([1, 2], [3, 4]))
+        state = FlowRunner(flow=flow).run(return_tasks=[res], executor=Executor())
+        assert state.result[res].result == 10
+        assert isinstance(received[0], MapResults)
+        assert received[0] == [4, 6]
+        # the children are states already, so they aren't waited for
+        assert not any(isinstance(futures, list) for futures in waited)
+
     @pytest.mark.parametrize(
         "executor", ["local", "mthread", "mproc", "sync"], indirect=True
     )
@@ -1352,7 +2463,7 @@ class TestContext:
         assert flow_state.result[grab_key].result == 42
 
     def test_flow_runner_passes_along_its_init_context_to_tasks_after_serialization(
-        self
+        self,
     ):
         @prefect.task
         def grab_key():
@@ -1382,7 +2493,7 @@ class TestContext:
         )
 
     def test_flow_runner_does_override_scheduled_start_time_when_running_off_schedule(
-        self
+        self,
     ):
         @prefect.task
         def return_scheduled_start_time():
@@ -1396,7 +2507,7 @@ class TestContext:
         assert res.result[return_scheduled_start_time].result == 42
 
     def test_flow_runner_doesnt_override_scheduled_start_time_when_running_on_schedule(
-        self
+        self,
     ):
         @prefect.task
         def return_scheduled_start_time():
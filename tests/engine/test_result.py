@@ -101,6 +101,27 @@ def test_no_results_are_all_the_same():
     assert n == q
 
 
+@pytest.mark.parametrize(
+    "obj", [Result(3), SafeResult("3", result_handler=JSONResultHandler())]
+)
+def test_results_use_slots(obj):
+    assert not hasattr(obj, "__dict__")
+
+
+def test_result_subclasses_forward_class_keywords():
+    class Registered:
+        def __init_subclass__(cls, key=None, **kwargs):
+            super().__init_subclass__(**kwargs)
+            cls.key = key
+
+    class MyResult(Result, Registered, key="mine"):
+        __slots__ = ()
+
+    assert MyResult.key == "mine"
+    assert MyResult(1) == MyResult(1)
+    assert MyResult(1) != MyResult(2)
+
+
 def test_no_results_are_not_the_same_as_result():
     n = NoResult
     r = Result(None)
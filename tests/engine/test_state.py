@@ -1,3 +1,4 @@
+import copy
 import datetime
 import tempfile
 import uuid
@@ -17,6 +18,7 @@ from prefect.engine.state import (
     Failed,
     Finished,
     Looped,
+    MapStates,
     Mapped,
     Paused,
     Pending,
@@ -267,6 +269,185 @@ def test_states_with_mutable_attrs_are_hashable():
     assert {State(result=[1]), Pending(cached_inputs=dict(a=1))}
 
 
+@pytest.mark.parametrize("cls", all_states)
+def test_states_use_slots(cls):
+    assert not hasattr(cls(), "__dict__")
+
+
+def test_state_subclasses_without_slots_compare_their_attributes():
+    class MyState(Success):
+        def __init__(self, x=None, **kwargs):
+            self.x = x
+            super().__init__(**kwargs)
+
+    assert MyState(x=1, result=2) == MyState(x=1, result=2)
+    assert MyState(x=1, result=2) != MyState(x=2, result=2)
+    assert Mapped(map_states=[MyState(x=1)]).map_states[0].x == 1
+
+
+def test_state_subclasses_forward_class_keywords():
+    class Registered:
+        def __init_subclass__(cls, key=None, **kwargs):
+            super().__init_subclass__(**kwargs)
+            cls.key = key
+
+    class MyState(Success, Registered, key="mine"):
+        __slots__ = ()
+
+    assert MyState.key == "mine"
+    assert MyState(result=1) == MyState(result=1)
+    assert MyState(result=1) != MyState(result=2)
+
+
+def resolved(states):
+    # a container whose children are packed, as if they were resolved from futures
+    map_states = MapStates([None] * len(states))
+    map_states.resolve(lambda futures: states)
+    return map_states
+
+
+class TestMapStates:
+    def test_mapped_states_store_map_states_in_a_list(self):
+        child = Success(result=1)
+        state = Mapped(map_states=[child, Failed(message="x")])
+        assert isinstance(state.map_states, MapStates)
+        assert isinstance(state.map_states, list)
+        assert state.n_map_states == 2
+        assert state.map_states == [Success(result=1), Failed()]
+        assert state.map_states[0] is child
+        assert state.map_states[-1].message == "x"
+
+    def test_map_states_behave_like_lists(self):
+        state = Mapped(map_states=[Success(result=1)])
+        child = Failed()
+        state.map_states.append(child)
+        assert state.map_states[1] is child
+        assert child in state.map_states
+        assert state.map_states.index(child) == 1
+        assert list(reversed(state.map_states)) == [child, Success(result=1)]
+        assert state.map_states + [None] == [Success(result=1), child, None]
+        assert [None] + state.map_states == [None, Success(result=1), child]
+        assert [Success(result=1), child] == state.map_states
+        assert state.map_states.pop() is child
+        assert len(state.map_states) == 1
+        state.map_states.clear()
+        assert not state.map_states
+
+    def test_copies_are_independent(self):
+        map_states = resolved([Success(result=1), Success(result=2)])
+        copied = map_states.copy()
+        assert isinstance(copied, MapStates)
+        copied[0] = Failed()
+        copied.append(None)
+        assert map_states == [Success(result=1), Success(result=2)]
+        assert copied == [Failed(), Success(result=2), None]
+        assert copy.copy(map_states) == map_states
+
+    def test_children_are_created_on_access(self):
+        handler = JSONResultHandler()
+        child = Success(message="ok", result=Result(1, result_handler=handler))
+        map_states = resolved([child])
+        view = map_states[0]
+        assert view is not child
+        assert type(view) is Success
+        assert view.message == "ok"
+        assert view._result == child._result
+        assert view._result.result_handler is handler
+
+    def test_children_are_created_once(self):
+        map_states = resolved([Success(result=1), Success(result=2)])
+        child = map_states[1]
+        assert map_states[1] is child
+        assert map_states[:][1] is child
+        child.message = "modified"
+        assert map_states[1].message == "modified"
+        assert map_states.results == [1, 2]
+
+    def test_children_are_kept_when_the_container_is_modified(self):
+        map_states = resolved([Success(result=1), Success(result=2)])
+        child = map_states[1]
+        map_states.insert(0, Pending())
+        assert map_states[2] is child
+        del map_states[0]
+        assert map_states[1] is child
+        map_states[:1] = [Failed(), Failed()]
+        assert map_states[2] is child
+        assert map_states == [Failed(), Failed(), Success(result=2)]
+
+    def test_states_with_other_attributes_are_stored_as_is(self):
+        states = [Retrying(run_count=2), SafeResult(1, JSONResultHandler()), None]
+        map_states = resolved(states)
+        assert all(a is b for a, b in zip(map_states, states))
+
+    def test_results_that_arent_plain_are_stored_as_is(self):
+        safe = SafeResult("1", JSONResultHandler())
+        map_states = resolved([Success(result=safe), TriggerFailed()])
+        assert map_states[0]._result is safe
+        assert map_states[1]._result is NoResult
+
+    def test_map_states_are_mutable(self):
+        map_states = MapStates([Success(result=1), Success(result=2)])
+        map_states[0] = Failed(result=3)
+        map_states.append(Success(result=4))
+        map_states.insert(0, Pending())
+        del map_states[1]
+        assert map_states == [Pending(), Success(result=2), Success(result=4)]
+        assert map_states[1:] == [Success(result=2), Success(result=4)]
+        map_states[::2] = [Failed(), Failed()]
+        del map_states[:1]
+        map_states.insert(-10, Pending())
+        assert map_states == [Pending(), Success(result=2), Failed()]
+        with pytest.raises(ValueError):
+            map_states[::2] = [Failed()]
+
+    def test_results_are_read_from_the_container(self):
+        map_states = resolved(
+            [Success(result=1), Success(result=SafeResult("2", JSONResultHandler()))]
+        )
+        results = map_states.results
+        assert results == [1, "2"]
+        map_states[0] = Success(result=5)
+        assert results[0] == 5
+        assert cloudpickle.loads(cloudpickle.dumps(results)) == [5, "2"]
+
+    def test_resolve_only_waits_for_children_that_arent_states(self):
+        map_states = MapStates([Success(result=1), "future", None])
+        waited = []
+
+        def wait(futures):
+            waited.append(futures)
+            return [Success(result=2), Failed()]
+
+        map_states.resolve(wait)
+        assert waited == [["future", None]]
+        assert map_states == [Success(result=1), Success(result=2), Failed()]
+        map_states.resolve(wait)
+        assert len(waited) == 1
+
+    def test_results_concatenate_like_lists(self):
+        results = MapStates([Success(result=1)]).results
+        assert results + [2] == [1, 2]
+        assert [0] + results == [0, 1]
+        assert type(results + results) is list
+
+    def test_map_states_can_be_pickled(self):
+        state = Mapped(map_states=["future", Retrying(run_count=2)])
+        state.map_states.resolve(lambda futures: [Success(result=1)])
+        state.map_states.append(None)
+        new_state = cloudpickle.loads(cloudpickle.dumps(state))
+        assert new_state == state
+        assert new_state.map_states[1].run_count == 2
+        assert new_state.map_states[2] is None
+
+    def test_mapped_state_equality_depends_on_map_states(self):
+        assert Mapped(map_states=[Success(result=1)]) == Mapped(
+            map_states=[Success(result=1)]
+        )
+        assert Mapped(map_states=[Success(result=1)]) != Mapped(
+            map_states=[Success(result=2)]
+        )
+
+
 @pytest.mark.parametrize("cls", [s for s in all_states if s is not State])
 def test_serialize_method(cls):
     serialized = cls().serialize()
@@ -1,3 +1,4 @@
+import asyncio
 import collections
 from datetime import datetime, timedelta
 from time import sleep
@@ -20,7 +21,11 @@ from prefect.engine.cache_validators import (
     partial_parameters_only,
 )
 from prefect.engine.result import NoResult, Result, SafeResult
-from prefect.engine.result_handlers import JSONResultHandler, ResultHandler
+from prefect.engine.result_handlers import (
+    JSONResultHandler,
+    LocalResultHandler,
+    ResultHandler,
+)
 from prefect.engine.state import (
     Cached,
     Failed,
@@ -971,6 +976,85 @@ class TestCheckTaskCached:
         assert ctxt["logger"] is task.logger
 
 
+class TestCheckTaskCheckpointed:
+    def test_not_checkpointed_without_fingerprint(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        handler.write_checkpoint("abc", 1)
+        state = Pending()
+        new_state = TaskRunner(
+            task=Task(result_handler=handler, checkpoint=True)
+        ).check_task_is_checkpointed(state=state, upstream_states={})
+        assert new_state is state
+
+    def test_not_checkpointed_without_checkpoint(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        state = Pending()
+        with prefect.context(task_fingerprint="abc"), set_temporary_config(
+            {"flows.incremental": True}
+        ):
+            new_state = TaskRunner(
+                task=Task(result_handler=handler, checkpoint=True)
+            ).check_task_is_checkpointed(state=state, upstream_states={})
+        assert new_state is state
+
+    def test_checkpointed(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        handler.write_checkpoint("abc", 1)
+        with prefect.context(task_fingerprint="abc"), set_temporary_config(
+            {"flows.incremental": True}
+        ):
+            with pytest.raises(ENDRUN) as exc:
+                TaskRunner(
+                    task=Task(result_handler=handler, checkpoint=True)
+                ).check_task_is_checkpointed(
+                    state=Pending(), upstream_states={Edge(Task(), Task()): Success()}
+                )
+        assert exc.value.state.is_successful()
+        assert exc.value.state.result == 1
+
+    def test_not_checkpointed_if_upstream_tasks_failed(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        handler.write_checkpoint("abc", 1)
+        state = Pending()
+        with prefect.context(task_fingerprint="abc"), set_temporary_config(
+            {"flows.incremental": True}
+        ):
+            new_state = TaskRunner(
+                task=Task(result_handler=handler, checkpoint=True)
+            ).check_task_is_checkpointed(
+                state=state, upstream_states={Edge(Task(), Task()): Failed()}
+            )
+        assert new_state is state
+
+    def test_successful_runs_write_checkpoints(self, tmpdir):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        with prefect.context(task_fingerprint="abc"), set_temporary_config(
+            {"flows.incremental": True}
+        ):
+            state = TaskRunner(
+                task=SuccessTask(result_handler=handler, checkpoint=True)
+            ).run()
+        assert state.is_successful()
+        assert state._result.safe_value.value == handler.find_checkpoint("abc")
+        assert handler.read(handler.find_checkpoint("abc")) == 1
+
+    @pytest.mark.parametrize("incremental,checkpoint", [(False, True), (True, False)])
+    def test_checkpoints_are_only_used_by_incremental_runs_of_checkpointed_tasks(
+        self, tmpdir, incremental, checkpoint
+    ):
+        handler = LocalResultHandler(dir=str(tmpdir))
+        handler.write_checkpoint("abc", 2)
+        with prefect.context(task_fingerprint="abc"), set_temporary_config(
+            {"flows.incremental": incremental}
+        ):
+            state = TaskRunner(
+                task=SuccessTask(result_handler=handler, checkpoint=checkpoint)
+            ).run()
+        assert state.message == "Task run succeeded."
+        assert state.result == 1
+        assert handler.read(handler.find_checkpoint("abc")) == 2
+
+
 class TestSetTaskRunning:
     @pytest.mark.parametrize("state", [Pending()])
     def test_pending(self, state):
@@ -1505,6 +1589,21 @@ class TestTaskRunnerStateHandlers:
         assert isinstance(state, Mapped)
         assert task_runner_handler.call_count == 4
 
+    def test_task_runner_handlers_are_called_when_waiting_for_children_fails(self):
+        task_runner_handler = MagicMock(side_effect=lambda t, o, n: n)
+
+        class ErrorExecutor(prefect.engine.executors.LocalExecutor):
+            def wait_for_states(self, futures):
+                raise ValueError("lost the children")
+
+        runner = TaskRunner(task=Task(), state_handlers=[task_runner_handler])
+        state = runner.wait_for_mapped_task(
+            state=Mapped(map_states=["future"]), executor=ErrorExecutor()
+        )
+        # the parent task changed state one time: Mapped -> Failed
+        assert isinstance(state, Failed)
+        assert task_runner_handler.call_count == 1
+
     def test_multiple_task_runner_handlers_are_called(self):
         task_runner_handler = MagicMock(side_effect=lambda t, o, n: n)
         TaskRunner(
@@ -1612,6 +1711,160 @@ class TestRunMappedStep:
         assert state.is_mapped()
         assert [s.result for s in state.map_states] == ["FOOBARRR"] * 2
 
+    def test_run_mapped_doesnt_resubmit_finished_children(self):
+        finished = Success(result=5)
+        edge = Edge(Task(), AddTask(), key="x", mapped=True)
+        y_edge = Edge(Task(), edge.downstream_task, key="y")
+        executor = prefect.engine.executors.LocalExecutor()
+        submitted = []
+        map_fn = executor.map
+
+        def record_map(fn, *args):
+            children = list(args[0])
+            submitted.extend(map_index for _, map_index, _ in children)
+            return map_fn(fn, children)
+
+        executor.map = record_map
+        state = TaskRunner(task=edge.downstream_task).run_mapped_task(
+            state=Mapped(map_states=[finished, None]),
+            upstream_states={edge: Success(result=[1, 2]), y_edge: Success(result=1)},
+            context={},
+            executor=executor,
+        )
+        assert submitted == [1]
+        assert state.map_states[0] == finished
+        assert state.map_states[1].result == 3
+
+    def test_count_map_children(self):
+        edge = Edge(Task(), Task(), mapped=True)
+        mapped_edge = Edge(Task(), Task(), mapped=True)
+        runner = TaskRunner(task=Task())
+        upstream_states = {
+            edge: Success(result=[1, 2, 3]),
+            mapped_edge: Mapped(map_states=[Success(), Success()]),
+            Edge(Task(), Task()): Success(result=[1]),
+        }
+        assert runner.count_map_children(Pending(), upstream_states) == 2
+        assert runner.count_map_children(Pending(), upstream_states) == len(
+            list(runner.get_map_upstream_states(Pending(), upstream_states))
+        )
+
+
+class TestRunAsync:
+    def run_async(self, runner, **kwargs):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(runner.run_async(**kwargs))
+        finally:
+            loop.close()
+
+    def test_run_async_awaits_coroutine_run(self):
+        @prefect.task
+        async def add(x, y):
+            await asyncio.sleep(0)
+            return x + y
+
+        state = self.run_async(
+            TaskRunner(add),
+            upstream_states={
+                Edge(Task(), add, key="x"): Success(result=1),
+                Edge(Task(), add, key="y"): Success(result=2),
+            },
+        )
+        assert state.is_successful()
+        assert state.result == 3
+
+    def test_run_async_runs_regular_tasks(self):
+        state = self.run_async(TaskRunner(SuccessTask()))
+        assert state.is_successful()
+        assert state.result == 1
+
+    def test_run_async_traps_errors(self):
+        @prefect.task
+        async def fail():
+            raise ValueError("bad")
+
+        state = self.run_async(TaskRunner(fail))
+        assert state.is_failed()
+        assert isinstance(state.result, ValueError)
+
+    def test_run_async_times_out(self):
+        @prefect.task(timeout=1)
+        async def slow():
+            await asyncio.sleep(3)
+
+        state = self.run_async(TaskRunner(slow))
+        assert isinstance(state, TimedOut)
+        assert isinstance(state.result, TimeoutError)
+
+    def test_run_async_heartbeats_while_awaiting_coroutine_run(self):
+        heartbeats = []
+
+        class HeartbeatRunner(TaskRunner):
+            @classmethod
+            def _heartbeat_many(cls, runners):
+                heartbeats.append(len(runners))
+
+        @prefect.task
+        async def slow():
+            await asyncio.sleep(0.3)
+            return len(heartbeats)
+
+        with set_temporary_config({"cloud.heartbeat_interval": 0.025}):
+            state = self.run_async(HeartbeatRunner(slow))
+        assert state.is_successful()
+        assert state.result > 1
+
+    def test_run_async_loops(self):
+        @prefect.task
+        async def my_task():
+            curr = prefect.context.get("task_loop_result", 0)
+            if prefect.context.get("task_loop_count", 1) < 3:
+                raise signals.LOOP(result=curr + 1)
+            return curr + 1
+
+        state = self.run_async(TaskRunner(my_task))
+        assert state.is_successful()
+        assert state.result == 3
+
+    def test_run_async_maps_children_as_coroutines(self):
+        @prefect.task
+        async def add(x, y):
+            await asyncio.sleep(0.5)
+            return x + y
+
+        executor = prefect.engine.executors.AsyncioExecutor()
+        with executor.start():
+            state = executor.wait(
+                executor.submit(
+                    TaskRunner(add).run_async,
+                    upstream_states={
+                        Edge(Task(), add, key="x"): Success(result=1),
+                        Edge(Task(), add, key="y", mapped=True): Success(
+                            result=list(range(20))
+                        ),
+                    },
+                    executor=executor,
+                )
+            )
+        assert isinstance(state, Mapped)
+        assert [s.result for s in state.map_states] == list(range(1, 21))
+
+    def test_run_runs_coroutine_tasks(self):
+        @prefect.task
+        async def add(x, y):
+            await asyncio.sleep(0)
+            return x + y
+
+        state = TaskRunner(add).run(
+            upstream_states={
+                Edge(Task(), add, key="x"): Success(result=1),
+                Edge(Task(), add, key="y"): Success(result=2),
+            }
+        )
+        assert state.is_successful()
+        assert state.result == 3
+
 
 @pytest.mark.parametrize(
     "executor", ["local", "sync", "mproc", "mthread"], indirect=True
@@ -1631,11 +1884,98 @@ def test_task_runner_performs_mapping(executor):
     assert [s.result for s in res.map_states] == [2, 3, 4]
 
 
+@pytest.mark.parametrize(
+    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+)
+def test_task_runner_performs_mapping_in_chunks(executor, monkeypatch):
+    add = AddTask(map_chunk_size=2)
+    ex = Edge(SuccessTask(), add, key="x")
+    ey = Edge(ListTask(), add, key="y", mapped=True)
+    runner = TaskRunner(add)
+    submitted = []
+    map_fn = executor.map
+
+    def record_map(fn, *args):
+        chunks = list(args[0])
+        submitted.append(len(chunks))
+        return map_fn(fn, chunks)
+
+    # the Dask executors are shared by the whole session
+    monkeypatch.setattr(executor, "map", record_map)
+    with executor.start():
+        res = runner.run(
+            upstream_states={ex: Success(result=1), ey: Success(result=[1, 2, 3])},
+            executor=executor,
+        )
+    assert submitted == [2]
+    assert isinstance(res, Mapped)
+    assert [s.result for s in res.map_states] == [2, 3, 4]
+    assert all(isinstance(s, Success) for s in res.map_states)
+
+
+@pytest.mark.parametrize(
+    "executor", ["local", "sync", "mproc", "mthread"], indirect=True
+)
+def test_chunked_mapping_doesnt_wait_for_the_chunks(executor, monkeypatch):
+    add = AddTask(map_chunk_size=2)
+    ex = Edge(SuccessTask(), add, key="x")
+    ey = Edge(ListTask(), add, key="y", mapped=True)
+    runner = TaskRunner(add)
+    wait = MagicMock(wraps=executor.wait)
+    # the Dask executors are shared by the whole session
+    monkeypatch.setattr(executor, "wait", wait)
+    with executor.start():
+        res = runner.run_mapped_task(
+            state=Pending(),
+            upstream_states={ex: Success(result=1), ey: Success(result=[1, 2, 3])},
+            context={},
+            executor=executor,
+        )
+        assert wait.call_count == 0
+        res = runner.wait_for_mapped_task(state=res, executor=executor)
+    assert wait.call_count == 1
+    assert isinstance(res, Mapped)
+    assert [s.result for s in res.map_states] == [2, 3, 4]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2])
+def test_task_runner_submits_children_with_a_single_dask_map(
+    mthread, monkeypatch, chunk_size
+):
+    add = AddTask(map_chunk_size=chunk_size)
+    ex = Edge(SuccessTask(), add, key="x")
+    ey = Edge(ListTask(), add, key="y", mapped=True)
+    with mthread.start() as client:
+        client_map = MagicMock(wraps=client.map)
+        monkeypatch.setattr(client, "map", client_map)
+        res = TaskRunner(add).run(
+            upstream_states={ex: Success(result=1), ey: Success(result=[1, 2, 3])},
+            executor=mthread,
+        )
+    assert client_map.call_count == 1
+    assert isinstance(res, Mapped)
+    assert [s.result for s in res.map_states] == [2, 3, 4]
+
+
+def test_task_runner_maps_tasks_without_map_chunk_size():
+    # tasks unpickled from flows stored by older versions don't have the attribute
+    add = AddTask()
+    del add.map_chunk_size
+    ex = Edge(SuccessTask(), add, key="x")
+    ey = Edge(ListTask(), add, key="y", mapped=True)
+    res = TaskRunner(add).run(
+        upstream_states={ex: Success(result=1), ey: Success(result=[1, 2, 3])},
+        executor=prefect.engine.executors.LocalExecutor(),
+    )
+    assert isinstance(res, Mapped)
+    assert [s.result for s in res.map_states] == [2, 3, 4]
+
+
 @pytest.mark.parametrize(
     "executor", ["local", "sync", "mproc", "mthread"], indirect=True
 )
 def test_task_runner_skips_upstream_check_for_parent_mapped_task_but_not_children(
-    executor
+    executor,
 ):
     add = AddTask(trigger=prefect.triggers.all_failed)
     ex = Edge(SuccessTask(), add, key="x")
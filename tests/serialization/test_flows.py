@@ -53,6 +53,14 @@ def test_deserialize_tasks():
     assert len(deserialized.tasks) == len(f.tasks)
 
 
+def test_deserialize_tasks_enforces_slug_uniqueness():
+    tasks = [Task(n) for n in ["a", "b", "c"]]
+    f = Flow(name="test", tasks=tasks)
+    deserialized = FlowSchema().load(FlowSchema().dump(f))
+    with pytest.raises(ValueError, match="already exists"):
+        deserialized.add_task(Task(slug=tasks[0].slug))
+
+
 def test_deserialize_edges():
     """
     Tests that edges are appropriately deserialized, even in they involve keys.
@@ -1,3 +1,4 @@
+import asyncio
 import queue
 import time
 import threading
@@ -181,3 +182,80 @@ def test_contexts_are_thread_safe():
         results.add(result_queue.get(block=False))
 
     assert results == set(range(len(threads)))
+
+
+def test_deleting_keys_inside_contextmanager_is_undone_on_exit():
+    with context(a=1):
+        with context(b=2):
+            del context.a
+            assert "a" not in context
+            assert dict(context)["b"] == 2
+        assert context.a == 1
+    assert "a" not in context
+
+
+def test_deleting_missing_keys_raises():
+    with pytest.raises(KeyError):
+        del context["a"]
+    with pytest.raises(AttributeError):
+        del context.a
+
+
+def test_context_to_dict_includes_all_layers():
+    with context(a=1):
+        with context(b=DotDict(c=2)):
+            d = context.to_dict()
+    assert d["a"] == 1
+    assert d["b"] == {"c": 2}
+    assert isinstance(d["b"], dict)
+    assert "config" in d
+
+
+def test_new_threads_start_with_the_initial_context():
+    result_queue = queue.Queue()
+
+    def get_context_in_thread(q):
+        q.put(("a" in prefect.context, "config" in prefect.context))
+
+    with prefect.context(a=1):
+        thread = threading.Thread(target=get_context_in_thread, args=(result_queue,))
+        thread.start()
+        thread.join()
+
+    assert result_queue.get(block=False) == (False, True)
+
+
+def test_asyncio_tasks_inherit_and_isolate_the_context():
+    async def set_and_get(x):
+        with prefect.context(x=x):
+            await asyncio.sleep(0.01)
+            return prefect.context.a, prefect.context.x
+
+    async def main():
+        with prefect.context(a=1):
+            return await asyncio.gather(*(set_and_get(i) for i in range(3)))
+
+    assert asyncio.run(main()) == [(1, 0), (1, 1), (1, 2)]
+    assert "a" not in prefect.context
+
+
+def test_context_views_reflect_changes_after_they_are_cached():
+    with context(a=1):
+        assert dict(context)["a"] == 1
+        context.b = 2
+        del context.a
+        assert "a" not in set(context)
+        assert context.to_dict()["b"] == 2
+        with context(c=3):
+            assert {"b", "c"} <= set(context)
+        assert len(context) == len(set(context))
+        assert "c" not in set(context)
+
+
+def test_entering_with_a_changed_config_uses_its_values():
+    with context(config=dict(a=1)):
+        new_config = context.config.copy()
+        new_config.a = 2
+        with context(config=new_config):
+            assert context.config.a == 2
+        assert context.config.a == 1
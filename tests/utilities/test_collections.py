@@ -5,7 +5,12 @@ import pytest
 
 from prefect.engine.state import Pending
 from prefect.utilities import collections
-from prefect.utilities.collections import DotDict, as_nested_dict, merge_dicts
+from prefect.utilities.collections import (
+    DotDict,
+    LazySequence,
+    as_nested_dict,
+    merge_dicts,
+)
 from prefect.utilities.graphql import GraphQLResult
 
 
@@ -32,6 +37,29 @@ class TestFlattenSeq:
             list(collections.flatten_seq(1))
 
 
+class TestLazySequence:
+    def test_items_are_computed_on_access(self):
+        calls = []
+
+        def square(x):
+            calls.append(x)
+            return x ** 2
+
+        squares = LazySequence(square, range(10))
+        assert len(squares) == 10
+        assert calls == []
+        assert squares[3] == 9
+        assert calls == [3]
+
+    def test_slices_are_lazy_sequences(self):
+        squares = LazySequence(lambda x: x ** 2, range(10))[2:5]
+        assert isinstance(squares, LazySequence)
+        assert list(squares) == [4, 9, 16]
+
+    def test_iteration_stops_at_the_end(self):
+        assert list(LazySequence(str, [1, 2])) == ["1", "2"]
+
+
 @pytest.fixture
 def nested_dict():
     return {1: 2, 2: {1: 2, 3: 4}, 3: {1: 2, 3: {4: 5, 6: {7: 8}}}}
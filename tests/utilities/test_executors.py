@@ -1,4 +1,6 @@
+import asyncio
 import multiprocessing
+import os
 import sys
 import threading
 import time
@@ -8,7 +10,15 @@ from unittest.mock import MagicMock
 import pytest
 
 import prefect
-from prefect.utilities.executors import Heartbeat, timeout_handler
+import prefect.utilities.executors
+from prefect.utilities.executors import (
+    Heartbeat,
+    HeartbeatManager,
+    concurrency_limits,
+    concurrency_slots,
+    timeout_handler,
+)
+from prefect.utilities.configuration import set_temporary_config
 
 
 def test_heartbeat_calls_function_on_interval():
@@ -28,6 +38,69 @@ def test_heartbeat_calls_function_on_interval():
     assert a.called == 2
 
 
+class BatchRunner:
+    batches = []
+
+    @classmethod
+    def _heartbeat_many(cls, runners):
+        cls.batches.append(list(runners))
+
+
+class TestHeartbeatManager:
+    def test_heartbeats_registered_runners_together(self):
+        BatchRunner.batches = []
+        manager = HeartbeatManager()
+        runners = [BatchRunner() for _ in range(3)]
+        keys = [manager.register(r, 0.05) for r in runners]
+        time.sleep(0.3)
+        manager.unregister(keys[0])
+        BatchRunner.batches = []
+        time.sleep(0.2)
+        for key in keys[1:]:
+            manager.unregister(key)
+
+        assert BatchRunner.batches
+        assert all(batch == runners[1:] for batch in BatchRunner.batches)
+
+    def test_uses_one_thread_and_stops_it_once_no_runners_are_registered(self):
+        manager = HeartbeatManager()
+        threads = threading.active_count()
+        keys = [manager.register(BatchRunner(), 0.05) for _ in range(20)]
+        assert threading.active_count() == threads + 1
+        for key in keys:
+            manager.unregister(key)
+        time.sleep(0.1)
+        assert manager._thread is None
+        assert threading.active_count() == threads
+
+    def test_wakes_up_for_shorter_intervals(self):
+        BatchRunner.batches = []
+        manager = HeartbeatManager()
+        slow = manager.register(BatchRunner(), 10)
+        fast = manager.register(BatchRunner(), 0.05)
+        time.sleep(0.3)
+        manager.unregister(fast)
+        manager.unregister(slow)
+        assert len(BatchRunner.batches) >= 3
+
+    def test_traps_errors(self):
+        class BadRunner:
+            @classmethod
+            def _heartbeat_many(cls, runners):
+                raise SyntaxError("message")
+
+        BatchRunner.batches = []
+        manager = HeartbeatManager()
+        keys = [
+            manager.register(BadRunner(), 0.05),
+            manager.register(BatchRunner(), 0.05),
+        ]
+        time.sleep(0.2)
+        for key in keys:
+            manager.unregister(key)
+        assert BatchRunner.batches
+
+
 def test_timeout_handler_times_out():
     slow_fn = lambda: time.sleep(2)
     with pytest.raises(TimeoutError):
@@ -85,7 +158,8 @@ def test_timeout_handler_allows_function_to_spawn_new_thread():
 
 
 def test_timeout_handler_doesnt_do_anything_if_no_timeout(monkeypatch):
-    monkeypatch.delattr(prefect.utilities.executors, "ThreadPoolExecutor")
+    monkeypatch.delattr(prefect.utilities.executors, "_signal_timeout")
+    monkeypatch.delattr(prefect.utilities.executors, "_thread_timeout")
     with pytest.raises(NameError):  # to test the test's usefulness...
         timeout_handler(lambda: 4, timeout=1)
     assert timeout_handler(lambda: 4) == 4
@@ -104,3 +178,250 @@ def test_timeout_handler_preserves_context():
 def test_timeout_handler_preserves_logging(caplog):
     timeout_handler(prefect.Flow("logs").run, timeout=2)
     assert len(caplog.records) >= 2  # 1 INFO to start, 1 INFO to end
+
+
+def test_timeout_handler_runs_coroutine_functions():
+    async def add(x, y=None):
+        await asyncio.sleep(0)
+        return x + y
+
+    assert timeout_handler(add, 1, y=2) == 3
+    assert timeout_handler(add, 1, timeout=1, y=2) == 3
+
+
+def test_timeout_handler_times_out_coroutine_functions():
+    async def slow_fn():
+        await asyncio.sleep(2)
+
+    with pytest.raises(TimeoutError, match="Execution timed out"):
+        timeout_handler(slow_fn, timeout=0.5)
+
+
+def test_timeout_handler_runs_coroutine_functions_from_a_running_loop():
+    async def get_key():
+        await asyncio.sleep(0)
+        return prefect.context.get("test_key")
+
+    async def main():
+        return timeout_handler(get_key)
+
+    loop = asyncio.new_event_loop()
+    try:
+        with prefect.context(test_key=42):
+            assert loop.run_until_complete(main()) == 42
+    finally:
+        loop.close()
+
+
+def run_in_thread(fn, *args, **kwargs):
+    result = []
+
+    def target():
+        try:
+            result.append(fn(*args, **kwargs))
+        except Exception as exc:
+            result.append(exc)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="Signals aren't available on Windows"
+)
+def test_timeout_handler_interrupts_functions_in_the_main_thread():
+    done = []
+
+    def slow_fn():
+        time.sleep(2)
+        done.append(True)
+
+    start = time.time()
+    with pytest.raises(TimeoutError, match="Execution timed out"):
+        timeout_handler(slow_fn, timeout=1)
+    assert time.time() - start < 1.5
+
+    # the function was interrupted rather than left running
+    time.sleep(1.5)
+    assert not done
+    assert prefect.utilities.executors._can_use_signals()
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="Signals aren't available on Windows"
+)
+def test_timeout_handler_supports_nested_timeouts_in_the_main_thread():
+    def inner():
+        return timeout_handler(lambda: 42, timeout=1)
+
+    assert timeout_handler(inner, timeout=2) == 42
+    with pytest.raises(TimeoutError):
+        timeout_handler(timeout_handler, time.sleep, 2, timeout=2)
+    assert prefect.utilities.executors._can_use_signals()
+
+
+def test_timeout_handler_shares_a_pool_of_threads_outside_the_main_thread(monkeypatch,):
+    monkeypatch.setattr(prefect.utilities.executors, "_timeout_pool", None)
+
+    def thread_name():
+        return threading.current_thread().name
+
+    with set_temporary_config({"engine.timeouts.max_threads": 2}):
+        names = set()
+        pools = set()
+        for _ in range(5):
+            names.add(run_in_thread(timeout_handler, thread_name, timeout=1))
+            pools.add(prefect.utilities.executors._timeout_pool)
+    # before Python 3.8, the pool starts a new thread per call until it reaches its bound
+    assert len(pools) == 1
+    assert 1 <= len(names) <= 2
+    assert threading.main_thread().name not in names
+
+
+def test_timeout_handler_reports_timed_out_threads(caplog):
+    event = threading.Event()
+    try:
+        exc = run_in_thread(timeout_handler, event.wait, timeout=1)
+        assert isinstance(exc, TimeoutError)
+        assert "1 timed out function(s) are still running" in caplog.text
+        assert len(prefect.utilities.executors._timed_out) == 1
+    finally:
+        event.set()
+    time.sleep(0.1)
+    assert not prefect.utilities.executors._timed_out
+
+
+def test_timeout_handler_times_out_functions_waiting_for_a_thread(monkeypatch):
+    monkeypatch.setattr(prefect.utilities.executors, "_timeout_pool", None)
+    event = threading.Event()
+    try:
+        with set_temporary_config({"engine.timeouts.max_threads": 1}):
+            run_in_thread(timeout_handler, event.wait, timeout=1)
+            exc = run_in_thread(timeout_handler, lambda: 1, timeout=1)
+        assert isinstance(exc, TimeoutError)
+        assert "no thread was available" in str(exc)
+    finally:
+        event.set()
+
+
+def test_timeout_handler_counts_waiting_for_a_thread_towards_the_timeout(monkeypatch):
+    monkeypatch.setattr(prefect.utilities.executors, "_timeout_pool", None)
+    with set_temporary_config({"engine.timeouts.max_threads": 1}):
+        prefect.utilities.executors._get_timeout_pool().submit(time.sleep, 0.5)
+        start = time.monotonic()
+        exc = run_in_thread(timeout_handler, time.sleep, 0.8, timeout=1)
+    assert isinstance(exc, TimeoutError)
+    assert "no thread was available" not in str(exc)
+    assert time.monotonic() - start < 1.4
+
+
+# functions run with hard timeouts are pickled, so they are defined at the module level
+def add(x, y=None):
+    return x + y
+
+
+def get_context_key(key):
+    return prefect.context.get(key)
+
+
+def raise_value_error():
+    raise ValueError("test")
+
+
+def sleep_and_touch(path):
+    time.sleep(2)
+    open(path, "w").close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Test fails on Windows")
+class TestHardTimeouts:
+    @pytest.fixture(autouse=True)
+    def hard_timeouts(self):
+        with set_temporary_config({"engine.timeouts.hard": True}):
+            yield
+
+    def test_returns_results(self):
+        assert timeout_handler(add, 1, timeout=1, y=2) == 3
+
+    def test_runs_functions_in_another_process(self):
+        assert timeout_handler(os.getpid, timeout=1) != os.getpid()
+
+    def test_preserves_context(self):
+        with prefect.context(test_key=42):
+            assert timeout_handler(get_context_key, "test_key", timeout=1) == 42
+
+    def test_reraises(self):
+        with pytest.raises(ValueError, match="test"):
+            timeout_handler(raise_value_error, timeout=1)
+
+    def test_kills_the_function(self, tmpdir):
+        path = tmpdir.join("done")
+        with pytest.raises(TimeoutError, match="Execution timed out"):
+            timeout_handler(sleep_and_touch, str(path), timeout=1)
+        time.sleep(1.5)
+        assert not path.exists()
+
+    def test_raises_if_the_process_dies(self):
+        with pytest.raises(RuntimeError, match="exited unexpectedly with code 3"):
+            timeout_handler(os._exit, 3, timeout=1)
+
+    def test_daemonic_processes_fall_back_to_soft_timeouts(self, monkeypatch):
+        monkeypatch.setattr(
+            "prefect.utilities.executors.multiprocessing.current_process",
+            lambda: MagicMock(daemon=True),
+        )
+        with pytest.warns(UserWarning, match="daemonic processes"):
+            assert timeout_handler(os.getpid, timeout=1) == os.getpid()
+        with pytest.warns(UserWarning, match="daemonic processes"):
+            exc = run_in_thread(timeout_handler, time.sleep, 2, timeout=1)
+        assert isinstance(exc, TimeoutError)
+
+
+@pytest.mark.parametrize(
+    "tags,limits",
+    [
+        (set(), {}),
+        ({"a", "dask-resource:GPU=1"}, {}),
+        ({"limit:db=3"}, {"db": 3}),
+        ({"limit:db=3", "LIMIT:api=1", "x"}, {"db": 3, "api": 1}),
+    ],
+)
+def test_concurrency_limits_parses_limit_tags(tags, limits):
+    assert concurrency_limits(tags) == limits
+
+
+@pytest.mark.parametrize("tag", ["limit:db", "limit:db=x", "limit:db=0", "limit:=2"])
+def test_concurrency_limits_rejects_malformed_tags(tag):
+    with pytest.raises(ValueError, match="limit:NAME=N"):
+        concurrency_limits({tag})
+
+
+def test_concurrency_slots_limit_threads():
+    running, peak = [], []
+    lock = threading.Lock()
+
+    def work():
+        with concurrency_slots({"test-a": 2, "test-b": 3}):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) == 2
+
+
+def test_concurrency_slots_release_on_error():
+    with pytest.raises(ZeroDivisionError):
+        with concurrency_slots({"test-c": 1}):
+            1 / 0
+    with concurrency_slots({"test-c": 1}):
+        pass
@@ -183,6 +183,12 @@ def test_context_manager_for_setting_tags():
             assert t3.tags == set(["1", "2", "3", "4", "5"])
 
 
+def test_context_manager_for_setting_tags_validates_limit_tags():
+    with pytest.raises(ValueError, match="limit:NAME=N"):
+        with tasks.tags("limit:db"):
+            pass
+
+
 class TestUnmappedContainer:
     def test_unmapped_initializes_with_task(self):
         t1 = Task()